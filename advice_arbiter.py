@@ -0,0 +1,156 @@
+"""
+Арбитр рекомендаций
+Все анализаторы (фарм, стратег, статусные сообщения) предлагают советы
+арбитру, а не выводят их сами. Арбитр оценивает кандидатов по приоритету
+и свежести и выпускает только победителей - не больше заданного числа
+сообщений в минуту. Очередь помощника больше не растёт, а советы, которые
+никто не успеет прочитать, не отрисовываются.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AdviceCandidate:
+    """Совет, ожидающий решения арбитра"""
+    topic: str          # Тема хаба, в которую уйдёт победитель
+    data: Dict          # Сообщение (message, priority, advice_type, ...)
+    source: str         # Кто предложил; новый совет источника замещает старый
+    priority: int
+    offered_at: float   # monotonic
+
+
+class RecommendationArbiter:
+    """
+    Отбор советов с бюджетом сообщений в минуту
+
+    Оценка кандидата - приоритет, уменьшающийся вдвое каждые half_life
+    секунд ожидания. Кандидаты старше max_age отбрасываются. Срочные
+    советы (priority >= urgent_priority) проходят и при исчерпанном
+    бюджете, но тоже расходуют его.
+    """
+
+    WINDOW = 60.0  # Окно бюджета, сек
+
+    def __init__(self, max_per_minute: int = 6, max_age: float = 20.0, half_life: float = 10.0,
+                 urgent_priority: int = 9, clock: Callable[[], float] = time.monotonic, metrics=None):
+        """
+        Args:
+            max_per_minute: Сколько советов можно выпустить за минуту
+            max_age: Через сколько секунд невыпущенный совет устаревает
+            half_life: За сколько секунд ожидания оценка падает вдвое
+            urgent_priority: Приоритет, с которого совет не ждёт бюджета
+            clock: Монотонные часы
+            metrics: MetricsRegistry для счётчиков advice.*
+        """
+        self.max_per_minute = max_per_minute
+        self.max_age = max_age
+        self.half_life = half_life
+        self.urgent_priority = urgent_priority
+        self.clock = clock
+        self.metrics = metrics
+        self._candidates: Dict[str, AdviceCandidate] = {}
+        self._emitted_at: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+        self.offered = 0
+        self.emitted = 0
+        self.replaced = 0
+        self.dropped_stale = 0
+        self.deferred = 0
+
+    def offer(self, topic: str, data: Dict, source: Optional[str] = None):
+        """
+        Предложить совет
+
+        Args:
+            topic: Тема хаба для публикации
+            data: Сообщение; используется data["priority"]
+            source: Источник (по умолчанию - тема)
+        """
+        source = source or topic
+        candidate = AdviceCandidate(topic=topic, data=data, source=source,
+                                    priority=data.get("priority", 5), offered_at=self.clock())
+        with self._lock:
+            if source in self._candidates:
+                self.replaced += 1
+            self._candidates[source] = candidate
+            self.offered += 1
+
+    def score(self, candidate: AdviceCandidate, now: Optional[float] = None) -> float:
+        """Приоритет с поправкой на возраст"""
+        age = (self.clock() if now is None else now) - candidate.offered_at
+        return candidate.priority * 0.5 ** (max(0.0, age) / self.half_life)
+
+    def budget_left(self, now: Optional[float] = None) -> int:
+        """Сколько советов ещё можно выпустить в текущем окне"""
+        with self._lock:
+            self._expire_window(self.clock() if now is None else now)
+            return max(0, self.max_per_minute - len(self._emitted_at))
+
+    def select(self) -> Optional[AdviceCandidate]:
+        """
+        Выбрать победителя (вызывается периодически)
+
+        Returns:
+            Кандидат для публикации или None (нет кандидатов или бюджета)
+        """
+        now = self.clock()
+        with self._lock:
+            stale = [source for source, candidate in self._candidates.items()
+                     if now - candidate.offered_at > self.max_age]
+            for source in stale:
+                del self._candidates[source]
+            self.dropped_stale += len(stale)
+            if stale and self.metrics:
+                self.metrics.increment("advice.dropped_stale", len(stale))
+            if not self._candidates:
+                return None
+
+            self._expire_window(now)
+            candidates = self._candidates.values()
+            if len(self._emitted_at) >= self.max_per_minute:
+                # Бюджет исчерпан - выбираем только среди срочных
+                candidates = [candidate for candidate in candidates
+                              if candidate.priority >= self.urgent_priority]
+                if not candidates:
+                    self.deferred += 1
+                    return None
+            winner = max(candidates, key=lambda candidate: self.score(candidate, now))
+
+            del self._candidates[winner.source]
+            self._emitted_at.append(now)
+            self.emitted += 1
+        if self.metrics:
+            self.metrics.increment("advice.emitted")
+        logger.debug(f"Арбитр выпустил {winner.source} (приоритет {winner.priority})")
+        return winner
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._candidates)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "max_per_minute": self.max_per_minute,
+                "pending": len(self._candidates),
+                "offered": self.offered,
+                "emitted": self.emitted,
+                "replaced": self.replaced,
+                "dropped_stale": self.dropped_stale,
+                "deferred": self.deferred,
+            }
+
+    def _expire_window(self, now: float):
+        while self._emitted_at and now - self._emitted_at[0] >= self.WINDOW:
+            self._emitted_at.popleft()
@@ -0,0 +1,189 @@
+"""
+Фоновый этап стратегического анализа
+Вызывает strategist.analyze_situation в пуле потоков, чтобы долгий ответ
+Qwen не останавливал опрос игры, советы по фарму и обновление UI
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AnalysisResult:
+    """Готовый результат анализа вместе с состоянием, из которого он получен"""
+    analysis: Dict
+    game_state: Dict
+    captured_at: float   # Когда было снято состояние (monotonic)
+    finished_at: float   # Когда закончился анализ (monotonic)
+
+    @property
+    def compute_time(self) -> float:
+        return self.finished_at - self.captured_at
+
+
+class AnalysisStage:
+    """
+    Неблокирующий этап анализа
+
+    В работе не больше одного анализа. Новое состояние, пришедшее во время
+    работы, замещает ожидающее (старое отменяется). Результаты от состояний
+    старше max_age отбрасываются.
+    """
+
+    def __init__(self, analyze: Callable[[Dict], Dict], max_age: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic, inline: bool = False):
+        """
+        Args:
+            analyze: Функция анализа (обычно strategist.analyze_situation)
+            max_age: Максимальный возраст состояния для результата, сек
+            clock: Монотонные часы
+            inline: Выполнять анализ сразу в submit (для виртуального времени,
+                    где фоновый поток не успевает за часами)
+        """
+        self.analyze = analyze
+        self.max_age = max_age
+        self.clock = clock
+        self.inline = inline
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis")
+        self._lock = threading.RLock()  # done-callback может сработать прямо в submit
+        self._in_flight: Optional[Future] = None
+        self._pending: Optional[tuple] = None
+        self._results: List[AnalysisResult] = []
+
+        # Статистика
+        self.submitted = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.dropped_stale = 0
+        self.last_result_age: Optional[float] = None
+
+    def submit(self, game_state: Dict, captured_at: Optional[float] = None):
+        """
+        Отдать состояние на анализ (никогда не блокирует)
+
+        Args:
+            game_state: Состояние игры
+            captured_at: Время снятия состояния; по умолчанию - сейчас
+        """
+        if captured_at is None:
+            captured_at = self.clock()
+
+        with self._lock:
+            self.submitted += 1
+            if self._in_flight is not None:
+                if self._pending is not None:
+                    self.cancelled += 1
+                self._pending = (game_state, captured_at)
+                return
+            self._start(game_state, captured_at)
+
+    def poll(self) -> Optional[AnalysisResult]:
+        """
+        Забрать самый свежий готовый результат (или None)
+
+        Результаты, посчитанные по устаревшему состоянию, отбрасываются.
+        """
+        with self._lock:
+            results, self._results = self._results, []
+
+        now = self.clock()
+        fresh = None
+        for result in results:
+            age = now - result.captured_at
+            if age > self.max_age:
+                self.dropped_stale += 1
+                logger.debug(f"Результат анализа устарел ({age:.1f}с), пропускаю")
+                continue
+            fresh = result
+
+        if fresh is not None:
+            self.last_result_age = now - fresh.captured_at
+        return fresh
+
+    @property
+    def queue_depth(self) -> int:
+        """Сколько состояний в работе и в ожидании"""
+        with self._lock:
+            return int(self._in_flight is not None) + int(self._pending is not None)
+
+    @property
+    def is_busy(self) -> bool:
+        with self._lock:
+            return self._in_flight is not None
+
+    def get_stats(self) -> Dict:
+        """Статистика этапа анализа"""
+        return {
+            "queue_depth": self.queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "dropped_stale": self.dropped_stale,
+            "last_result_age": self.last_result_age,
+        }
+
+    def shutdown(self):
+        """Остановить пул, не дожидаясь текущего анализа"""
+        with self._lock:
+            if self._pending is not None:
+                self.cancelled += 1
+            self._pending = None
+        # В пуле не больше одного вызова: ожидающий анализ хранится в _pending, а не в очереди пула
+        self.executor.shutdown(wait=False)
+
+    def _start(self, game_state: Dict, captured_at: float):
+        """Запустить анализ (вызывается под блокировкой)"""
+        if self.inline:
+            future = Future()
+            try:
+                future.set_result(self._run(game_state, captured_at))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            future = self.executor.submit(self._run, game_state, captured_at)
+        self._in_flight = future
+        future.add_done_callback(self._on_done)
+
+    def _run(self, game_state: Dict, captured_at: float) -> AnalysisResult:
+        analysis = self.analyze(game_state)
+        return AnalysisResult(
+            analysis=analysis,
+            game_state=game_state,
+            captured_at=captured_at,
+            finished_at=self.clock()
+        )
+
+    def _on_done(self, future: Future):
+        """Сохранить результат и запустить ожидающее состояние"""
+        result = None
+        if not future.cancelled():
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Ошибка фонового анализа: {e}")
+
+        with self._lock:
+            self._in_flight = None
+            if result is not None:
+                self.completed += 1
+                self._results.append(result)
+
+            if self._pending is not None:
+                game_state, captured_at = self._pending
+                self._pending = None
+                # Не тратить время на состояние, которое уже устарело
+                if self.clock() - captured_at > self.max_age:
+                    self.dropped_stale += 1
+                else:
+                    try:
+                        self._start(game_state, captured_at)
+                    except RuntimeError:
+                        # Пул уже остановлен
+                        pass
@@ -0,0 +1,237 @@
+"""
+asyncio-ядро тренера (COACH_RUNTIME=asyncio)
+Источники данных, анализ и вывод работают как задачи одного цикла событий.
+Блокирующие библиотеки (чтение состояния, HTTP стратега, pyttsx3) вынесены
+в отдельные ограниченные пулы, поэтому их ожидания перекрываются, а не
+выстраиваются в очередь на одном потоке. При остановке (или ошибке любой
+задачи) все задачи отменяются и дожидаются завершения.
+
+Окно Tk по-прежнему живёт в своём потоке: tkinter требует собственный mainloop.
+"""
+
+import asyncio
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional
+
+from config import (
+    STATE_POLL_INTERVAL, PROCESS_CHECK_INTERVAL, UI_HEARTBEAT_INTERVAL, SCHEDULER_JITTER,
+    ANALYSIS_MAX_AGE, METRICS_DUMP_PATH, METRICS_DUMP_INTERVAL, SNAPSHOT_INTERVAL
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class AsyncCoachRunner:
+    """
+    Запуск задач DotaCoach в цикле asyncio
+
+    Пулы потоков:
+        source   - 1 поток: GameAnalyzer (чтение состояния, проверка процесса)
+        analysis - 1 поток: стратег (LocalStrategist или HTTP-запрос к Qwen)
+        speech   - 1 поток: pyttsx3 (runAndWait блокирует, движок не потокобезопасен)
+    """
+
+    def __init__(self, coach, poll_interval: float = STATE_POLL_INTERVAL,
+                 process_check_interval: float = PROCESS_CHECK_INTERVAL,
+                 ui_interval: float = UI_HEARTBEAT_INTERVAL, jitter: float = SCHEDULER_JITTER):
+        """
+        Args:
+            coach: DotaCoach
+            poll_interval: Период опроса состояния
+            process_check_interval: Период проверки процесса игры
+            ui_interval: Период обновления оверлея
+            jitter: Случайная добавка к периодам
+        """
+        self.coach = coach
+        self.poll_interval = poll_interval
+        self.process_check_interval = process_check_interval
+        self.ui_interval = ui_interval
+        self.jitter = jitter
+
+        self.source_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="coach-source")
+        self.analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="coach-analysis")
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._poll_wakeup: Optional[asyncio.Event] = None
+        self._stop_requested = False
+        self.task_runs: Dict[str, int] = {}
+        self.dropped_stale = 0
+
+    def run(self):
+        """Запустить цикл событий (блокирует до остановки)"""
+        asyncio.run(self.main())
+
+    def stop(self):
+        """Остановить (можно вызывать из любого потока)"""
+        self._stop_requested = True
+        if self.loop and self._stop_event:
+            self.loop.call_soon_threadsafe(self._stop_event.set)
+
+    def wake_poll(self):
+        """Опросить состояние сейчас (например, по push от GSI)"""
+        if self.loop and self._poll_wakeup:
+            self.loop.call_soon_threadsafe(self._poll_wakeup.set)
+
+    async def main(self):
+        coach = self.coach
+        self.loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._poll_wakeup = asyncio.Event()
+        coach.speech_blocking = False  # Озвучивание идёт в потоке тренера, цикл не ждёт
+        if coach.gsi_listener:
+            # Push от клиента сразу будит опрос
+            coach.gsi_listener.on_update(lambda state: self.wake_poll())
+
+        logger.info("⚙️ asyncio-ядро тренера запущено")
+        tasks = [
+            self._periodic("poll_state", self.poll_interval, self._poll_state, wakeup=self._poll_wakeup),
+            self._periodic("process_check", self.process_check_interval, self._check_process,
+                           initial_delay=self.process_check_interval),
+            self._periodic("strategy", coach.recommendation_cooldown, self._strategy),
+            self._periodic("advice_arbiter", self.ui_interval, self._arbiter),
+            self._periodic("ui_heartbeat", self.ui_interval, self._ui_heartbeat),
+        ]
+        if coach.enable_farming_tips:
+            tasks.append(self._periodic("farming", coach.farm_analysis_cooldown, self._farming))
+        if METRICS_DUMP_PATH:
+            tasks.append(self._periodic("metrics_dump", METRICS_DUMP_INTERVAL, self._dump_metrics,
+                                        initial_delay=METRICS_DUMP_INTERVAL))
+        if coach.snapshot:
+            tasks.append(self._periodic("snapshot", SNAPSHOT_INTERVAL, self._save_snapshot,
+                                        initial_delay=SNAPSHOT_INTERVAL))
+        tasks = [asyncio.ensure_future(task) for task in tasks]
+        stopper = asyncio.ensure_future(self._watch_shutdown())
+        try:
+            # Периодические задачи не завершаются сами: первой закончится
+            # остановка или упавшая задача - её ошибка пробрасывается
+            done, _ = await asyncio.wait(tasks + [stopper], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is not stopper and not task.cancelled() and task.exception():
+                    raise task.exception()
+        finally:
+            for task in tasks + [stopper]:
+                task.cancel()
+            # Отмена ожидающих run_in_executor отменяет и их ещё не начатые вызовы в пулах
+            await asyncio.gather(*tasks, stopper, return_exceptions=True)
+            coach.speech_blocking = True
+            # Не ждать зависшие HTTP вызовы: задачи уже отменены
+            for executor in (self.source_executor, self.analysis_executor):
+                executor.shutdown(wait=False)
+            logger.info("⏹️ asyncio-ядро тренера остановлено")
+
+    async def _watch_shutdown(self):
+        if not self._stop_requested and self.coach.is_running:
+            await self._stop_event.wait()
+
+    async def _periodic(self, name: str, interval: float, step: Callable[[], Awaitable[Optional[float]]],
+                        initial_delay: float = 0.0, wakeup: Optional[asyncio.Event] = None):
+        """
+        Выполнять шаг по дедлайнам без накопления дрейфа
+
+        Шаг может вернуть задержку до следующего запуска (например, повторить
+        раньше, если данных ещё нет); None - обычный период.
+        """
+        loop = self.loop
+        deadline = loop.time() + initial_delay
+        self.task_runs.setdefault(name, 0)
+        while True:
+            woken = await self._sleep_until(deadline, wakeup)
+            delay = await step()
+            self.task_runs[name] += 1
+
+            now = loop.time()
+            if delay is not None:
+                deadline = now + delay
+            else:
+                base = now if woken else deadline
+                deadline = base + interval + (random.uniform(0, self.jitter) if self.jitter > 0 else 0)
+                if deadline <= now:
+                    deadline = now + interval
+
+    async def _sleep_until(self, deadline: float, wakeup: Optional[asyncio.Event]) -> bool:
+        """Спать до дедлайна; True если разбудили раньше"""
+        timeout = max(0.0, deadline - self.loop.time())
+        if wakeup is None:
+            await asyncio.sleep(timeout)
+            return False
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        wakeup.clear()
+        return True
+
+    async def _in_executor(self, executor: ThreadPoolExecutor, func, *args):
+        return await self.loop.run_in_executor(executor, func, *args)
+
+    def _tick(self, func, *args):
+        """Синхронная часть шага - один тик с бюджетом времени"""
+        budget = self.coach.tick_budget
+        budget.begin()
+        try:
+            return func(*args)
+        finally:
+            budget.end()
+
+    async def _poll_state(self) -> Optional[float]:
+        coach = self.coach
+        with coach.metrics.time("state_fetch"):
+            game_state = await self._in_executor(self.source_executor,
+                                                 coach.game_analyzer.get_current_game_state)
+        self._tick(coach._apply_game_state, game_state)
+        return None
+
+    async def _check_process(self) -> Optional[float]:
+        running = await self._in_executor(self.source_executor, self.coach.game_analyzer.check_game_running)
+        if not running:
+            self.coach.current_game_state = None
+        return None
+
+    async def _farming(self) -> Optional[float]:
+        game_state = self.coach.current_game_state
+        if game_state is None or not self._tick(self.coach._analyze_and_recommend_farming, game_state):
+            return self.poll_interval
+        return None
+
+    async def _strategy(self) -> Optional[float]:
+        coach = self.coach
+        game_state = coach.current_game_state
+        if game_state is None:
+            return self.poll_interval
+
+        logger.info("📊 Анализирую ситуацию...")
+        captured_at = self.loop.time()
+        analysis = await self._in_executor(self.analysis_executor, coach._timed_analysis, game_state)
+
+        age = self.loop.time() - captured_at
+        if age > ANALYSIS_MAX_AGE:
+            self.dropped_stale += 1
+            coach.metrics.increment("analysis_dropped_stale")
+            logger.debug(f"Результат анализа устарел ({age:.1f}с), пропускаю")
+            return self.poll_interval
+
+        if not self._tick(coach._report_analysis, analysis, game_state):
+            return self.poll_interval
+        return None
+
+    async def _arbiter(self) -> Optional[float]:
+        self._tick(self.coach._arbiter_job)
+        return None
+
+    async def _ui_heartbeat(self) -> Optional[float]:
+        self._tick(self.coach._ui_heartbeat)
+        return None
+
+    async def _save_snapshot(self) -> Optional[float]:
+        # Данные собираются на цикле, запись файла - в пуле
+        data = self.coach._capture_snapshot()
+        await self._in_executor(self.source_executor, self.coach.snapshot.save, data)
+        return None
+
+    async def _dump_metrics(self) -> Optional[float]:
+        await self._in_executor(self.source_executor, self.coach.metrics.dump, METRICS_DUMP_PATH)
+        return None
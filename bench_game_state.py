@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк: память и время на тик для GameState против прежнего словаря
+Оба варианта делают всю работу тика: строят состояние, кладут его в
+историю (прежде - список словарей, теперь - StateHistory) и пишут debug-лог.
+
+Запуск:
+    python bench_game_state.py [количество_тиков]
+"""
+
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from game_integration import GameAnalyzer
+from local_strategist import LocalStrategist
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+def legacy_game_state(history: list, game_time_offset: int) -> dict:
+    """Прежняя реализация GameAnalyzer.get_current_game_state (словарь на тик)"""
+    game_time = game_time_offset + len(history) // 6
+    hp_percent = random.randint(60, 100)
+    max_hp = 500
+    hp = int(max_hp * hp_percent / 100)
+    gold = 2500 + (game_time * random.randint(150, 250))
+    gold += random.randint(-300, 300)
+    last_hits = 40 + (game_time * 3) + random.randint(-5, 5)
+    nearby_enemy_count = random.randint(0, 2)
+    game_state = {
+        "game_time": game_time,
+        "hero_name": "Anti-Mage",
+        "hero_position": (420, 650),
+        "level": min(30, 5 + game_time // 3),
+        "hp": hp,
+        "max_hp": max_hp,
+        "gold": gold,
+        "items": ["Hand of Midas", "Power Treads"] if game_time > 10 else ["Boots"],
+        "last_hits": last_hits,
+        "denies": 3,
+        "kills": 0,
+        "deaths": 0,
+        "assists": 2,
+        "nearby_enemy_count": nearby_enemy_count,
+        "allies": [
+            {"name": "Rubick", "level": max(5, 4 + game_time // 3), "position": "support", "hp_percent": 80},
+            {"name": "Templar Assassin", "level": max(5, 5 + game_time // 3), "position": "midlane", "hp_percent": 100},
+            {"name": "Tidehunter", "level": max(5, 4 + game_time // 3), "position": "offlane", "hp_percent": 70},
+            {"name": "Shadow Shaman", "level": max(4, 3 + game_time // 3), "position": "support", "hp_percent": 60},
+        ],
+        "enemies": [
+            {"name": "Phantom Assassin", "level": max(6, 5 + game_time // 3), "position": "carry", "visible": random.choice([True, False])},
+            {"name": "Shadow Fiend", "level": max(7, 6 + game_time // 3), "position": "midlane", "visible": True},
+            {"name": "Dark Seer", "level": max(5, 4 + game_time // 3), "position": "offlane", "visible": random.choice([True, False])},
+            {"name": "Crystal Maiden", "level": max(4, 3 + game_time // 3), "position": "support", "visible": True},
+            {"name": "Earthshaker", "level": max(5, 4 + game_time // 3), "position": "support", "visible": random.choice([True, False])},
+        ],
+        "team_gold": 12500 + (game_time * 800),
+        "enemy_gold": 11800 + (game_time * 750),
+        "recent_events": [
+            "Ты получил First Blood" if game_time < 5 else "Идет мирный фарм",
+            f"Anti-Mage получил {last_hits} последних удара",
+            "Rubick использовал Telekinesis на Shadow Fiend" if random.random() > 0.5 else "Ганк отбит!",
+            "Твоя команда контролирует карту" if random.random() > 0.5 else "Враги давят на линию",
+        ],
+        "timestamp": datetime.now().isoformat()
+    }
+    history.append(game_state)
+    logger.debug(f"Game State: Time={game_time}m, Gold={gold}, HP={hp_percent}%, Nearby enemies={nearby_enemy_count}")
+    return game_state
+
+
+def measure(build, ticks: int):
+    """
+    Вернуть (мкс на тик, байт выделено за тик, байт на сохранённое состояние)
+
+    Выделено за тик - пик памяти внутри одного тика (временные объекты
+    плюс сохранённое состояние), в среднем по тикам.
+    """
+    # Время - лучший из нескольких прогонов, чтобы фоновая нагрузка не искажала сравнение
+    rounds = 5
+    per_round = max(1, ticks // rounds)
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(per_round):
+            build()
+        best = min(best, (time.perf_counter() - started) / per_round)
+
+    kept = []
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(ticks):
+        tracemalloc.clear_traces()   # сбрасывает и пик
+        kept.append(build())
+        allocated += tracemalloc.get_traced_memory()[1]
+    tracemalloc.clear_traces()
+    for _ in range(ticks):
+        kept.append(build())
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return best * 1e6, allocated / ticks, retained / ticks
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    random.seed(42)
+
+    history = []
+    legacy = measure(lambda: legacy_game_state(history, 15), ticks)
+    analyzer = GameAnalyzer()
+    compact = measure(analyzer._simulate_game_state, ticks)
+
+    # Проверка совместимости: стратег одинаково работает с обоими форматами
+    strategist = LocalStrategist()
+    assert strategist.analyze_situation(analyzer.last_update)["status"] == "success"
+
+    logger.info(f"Тиков: {ticks}")
+    logger.info(f"{'':12}{'мкс/тик':>10}{'байт выделено/тик':>20}{'байт/состояние':>16}")
+    for name, (us, allocated, retained) in (("dict", legacy), ("GameState", compact)):
+        logger.info(f"{name:12}{us:>10.2f}{allocated:>20.0f}{retained:>16.0f}")
+    logger.info(f"Выделяется за тик меньше в {legacy[1] / compact[1]:.1f} раза, "
+                f"хранится меньше в {legacy[2] / compact[2]:.1f} раза")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк: детали N матчей последовательно против пакетной загрузки
+
+Вместо Steam WebAPI - локальный сервер-заглушка с задержкой ответа;
+каждый 25-й матч отвечает ошибкой "Match ID not found". Последняя строка -
+повторная пакетная загрузка тех же матчей из локального хранилища.
+
+Запуск:
+    python bench_match_fetch.py [матчей] [--latency-ms 50] [--workers 8] [--rate 0]
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from catalog_cache import CatalogCache
+from dota2_api import Dota2WebAPI
+from http_client import ApiClient
+from match_store import MatchStore
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+class StandInSteam(BaseHTTPRequestHandler):
+    """GetMatchDetails с искусственной задержкой"""
+    protocol_version = "HTTP/1.1"
+    latency = 0.05
+
+    def do_GET(self):
+        time.sleep(type(self).latency)
+        match_id = int(parse_qs(urlsplit(self.path).query).get("match_id", ["0"])[0])
+        if match_id % 25 == 0:
+            payload = {"result": {"error": "Match ID not found"}}
+        else:
+            payload = {"result": {"match_id": match_id, "radiant_win": match_id % 2 == 0,
+                                  "players": [{"hero_id": hero_id} for hero_id in range(10)]}}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная загрузка деталей матчей")
+    parser.add_argument("matches", nargs="?", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Задержка ответа заглушки")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Лимит хоста, запросов в секунду (0 = без ограничения)")
+    args = parser.parse_args()
+
+    for name in ("dota2_api", "match_fetcher"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    StandInSteam.latency = args.latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInSteam)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_class = type("StandInDota2WebAPI", (Dota2WebAPI,),
+                     {"API_URL": f"http://127.0.0.1:{server.server_address[1]}"})
+    client = ApiClient(retries=0, rate_limit=args.rate, rate_burst=args.workers)
+    catalog_cache = CatalogCache(os.path.join(tempfile.mkdtemp(), "catalog.json"))
+
+    def make_api():
+        return api_class("key", static_data={"heroes": {"-": {}}, "items": {"-": {}}}, http=client,
+                         catalog_cache=catalog_cache, match_store=MatchStore(":memory:"))
+
+    match_ids = list(range(1, args.matches + 1))
+
+    started = time.perf_counter()
+    serial_api = make_api()
+    serial = [serial_api.get_match_details(match_id) for match_id in match_ids]
+    serial_s = time.perf_counter() - started
+
+    api = make_api()
+    bulk_s, first_result_s, results = bulk(api, match_ids, args.workers)
+    stored_s, _, _ = bulk(api, match_ids, args.workers)
+
+    client.close()
+    server.shutdown()
+
+    failed = sum(not result.ok for result in results)
+    logger.info(f"{args.matches} матчей, задержка {args.latency_ms:.0f}мс, "
+                f"{args.workers} потоков, лимит {args.rate or '-'} запр/с")
+    logger.info(f"{'последовательно':18}{serial_s:>8.2f}с  ошибок {sum(d is None for d in serial)}")
+    logger.info(f"{'пакетно':18}{bulk_s:>8.2f}с  ошибок {failed}, первый результат "
+                f"через {first_result_s * 1000:.0f}мс, ускорение {serial_s / bulk_s:.1f}x")
+    logger.info(f"{'из хранилища':18}{stored_s:>8.2f}с  {api.match_store.get_stats()}")
+
+
+def bulk(api, match_ids, workers):
+    """Пакетная загрузка: (общее время, время до первого результата, результаты)"""
+    started = time.perf_counter()
+    first_result_s = None
+    results = []
+    for result in api.get_match_details_bulk(match_ids, workers=workers):
+        if first_result_s is None:
+            first_result_s = time.perf_counter() - started
+        results.append(result)
+    return time.perf_counter() - started, first_result_s, results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк: холодный старт тренера (импорт coach + создание DotaCoach)
+
+Каждый замер - отдельный процесс Python, поэтому кэш модулей не мешает.
+Строка "eager" воспроизводит прежнее поведение: все бэкенды импортируются
+и голосовой помощник создаётся всегда.
+
+Запуск:
+    python bench_startup.py [повторов]
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = ("speech_recognition", "pyttsx3", "requests", "urllib3", "tkinter", "http.server")
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+if {eager}:
+    import voice_assistant, qwen_processor, dota2_api, gsi_listener
+import coach
+imported = time.perf_counter()
+instance = coach.DotaCoach()
+if {eager}:
+    instance.voice_assistant
+created = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "init_ms": (created - imported) * 1000,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(eager: bool, env_overrides: dict, runs: int) -> dict:
+    env = dict(os.environ, **env_overrides)
+    samples = []
+    for _ in range(runs):
+        code = PROBE.format(eager=eager, heavy=HEAVY_MODULES)
+        output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True,
+                                text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    samples.sort(key=lambda s: s["import_ms"] + s["init_ms"])
+    return samples[len(samples) // 2]  # медиана
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cases = [
+        ("eager", True, {"USE_TEXT_UI": "true", "DATA_SOURCE": "local"}),
+        ("text+local", False, {"USE_TEXT_UI": "true", "DATA_SOURCE": "local"}),
+        ("voice+local", False, {"USE_TEXT_UI": "false", "DATA_SOURCE": "local"}),
+    ]
+
+    logger.info(f"Медиана из {runs} запусков")
+    logger.info(f"{'':14}{'импорт, мс':>12}{'init, мс':>10}  загружено")
+    for name, eager, env in cases:
+        result = measure(eager, env, runs)
+        logger.info(f"{name:14}{result['import_ms']:>12.0f}{result['init_ms']:>10.1f}  "
+                    f"{', '.join(result['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Кэш каталогов героев и предметов на диске
+Каталоги Steam WebAPI меняются только с патчами игры, поэтому при запуске
+читается локальная копия (миллисекунды), а не GetHeroes/GetGameItems.
+Копия старше TTL всё равно используется сразу, а обновляется в фоне.
+
+Формат - JSON с номером версии; файл другой версии игнорируется.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from config import CATALOG_CACHE_TTL
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION = 2  # 2: настоящие localized_name и localized_name_ru
+
+
+class CatalogCache:
+    """Файл с каталогами {"heroes", "items"} и временем их загрузки"""
+
+    def __init__(self, path: str, ttl: float = CATALOG_CACHE_TTL, clock=time.time):
+        """
+        Args:
+            path: Путь к файлу кэша
+            ttl: Через сколько секунд (по настенным часам) копия требует обновления
+            clock: Настенные часы (time.time)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self.saved = 0
+        self.last_load_ms: Optional[float] = None
+
+    def load(self) -> Optional[Dict]:
+        """
+        Прочитать каталоги
+
+        Returns:
+            {"heroes", "items", "fetched_at"} или None (нет файла, повреждён,
+            другая версия, пустые каталоги). Устаревшая копия возвращается -
+            проверка через is_fresh().
+        """
+        if not os.path.exists(self.path):
+            return None
+        started = time.perf_counter()
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                catalog = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Кэш каталогов не прочитан: {e}")
+            return None
+
+        if catalog.get("version") != CATALOG_VERSION:
+            logger.info(f"Кэш каталогов версии {catalog.get('version')} не поддерживается")
+            return None
+        if not (catalog.get("heroes") and catalog.get("items")):
+            return None
+        self.last_load_ms = (time.perf_counter() - started) * 1000
+        return catalog
+
+    def is_fresh(self, catalog: Dict) -> bool:
+        """Копия моложе TTL"""
+        return self.clock() - catalog.get("fetched_at", 0) <= self.ttl
+
+    def save(self, heroes: Dict, items: Dict):
+        """Записать каталоги (атомарно, через временный файл)"""
+        catalog = {"version": CATALOG_VERSION, "fetched_at": self.clock(),
+                   "heroes": heroes, "items": items}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(catalog, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.saved += 1
@@ -0,0 +1,127 @@
+"""
+Часы тренера
+Все компоненты берут время, паузы и отложенные вызовы через объект часов.
+RealClock - обычное время; VirtualClock сдвигается мгновенно, поэтому
+целый матч можно прогнать за секунды.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class Timer:
+    """Отложенный вызов (можно отменить)"""
+
+    def __init__(self, deadline: float, callback: Callable[[], None]):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class RealClock:
+    """Реальное время"""
+
+    virtual = False
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def time(self) -> float:
+        """Время по настенным часам (UNIX timestamp)"""
+        return time.time()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        """Ждать события не дольше timeout; True если событие наступило"""
+        return event.wait(timeout)
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Timer:
+        """Вызвать callback через delay секунд (в отдельном потоке)"""
+        timer = Timer(self.monotonic() + delay, callback)
+
+        def fire():
+            if not timer.cancelled:
+                callback()
+
+        thread = threading.Timer(delay, fire)
+        thread.daemon = True
+        thread.start()
+        return timer
+
+
+class VirtualClock(RealClock):
+    """
+    Виртуальное время: sleep и wait не ждут, а сдвигают часы
+
+    Отложенные вызовы выполняются синхронно в момент, когда часы
+    проходят их дедлайн.
+    """
+
+    virtual = True
+
+    def __init__(self, start: float = 0.0, wall_start: Optional[float] = None):
+        """
+        Args:
+            start: Начальное значение monotonic()
+            wall_start: Настенное время в момент start (по умолчанию - сейчас)
+        """
+        self._now = start
+        self._wall_offset = (wall_start if wall_start is not None else time.time()) - start
+        self._timers: List[Tuple[float, int, Timer]] = []
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def time(self) -> float:
+        return self._wall_offset + self._now
+
+    def sleep(self, seconds: float):
+        self.advance(seconds)
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        if event.is_set():
+            return True
+        if timeout is None:
+            # Бесконечное ожидание в виртуальном времени - до ближайшего таймера
+            with self._lock:
+                if not self._timers:
+                    # Событие некому выставить: вызывающий крутился бы вхолостую
+                    raise RuntimeError("VirtualClock.wait: нет таймаута и отложенных вызовов")
+                timeout = self._timers[0][0] - self._now
+        self.advance(timeout)
+        return event.is_set()
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Timer:
+        with self._lock:
+            timer = Timer(self._now + max(0.0, delay), callback)
+            heapq.heappush(self._timers, (timer.deadline, next(self._counter), timer))
+        return timer
+
+    def advance(self, seconds: float):
+        """Сдвинуть часы, выполнив все таймеры по пути"""
+        target = self._now + max(0.0, seconds)
+        while True:
+            with self._lock:
+                if not self._timers or self._timers[0][0] > target:
+                    break
+                deadline, _, timer = heapq.heappop(self._timers)
+                self._now = max(self._now, deadline)
+            if not timer.cancelled:
+                timer.callback()
+        with self._lock:
+            self._now = max(self._now, target)
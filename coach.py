@@ -5,17 +5,33 @@
 import logging
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from datetime import datetime, timedelta
 
-from voice_assistant import VoiceAssistant
-from qwen_processor import QwenStrategist
 from local_strategist import LocalStrategist  # НОВОЕ: локальный анализатор
-from dota2_api import HybridGameAnalyzer  # НОВОЕ: гибридный анализатор
 from game_integration import GameAnalyzer
 from farming_optimizer import FarmingOptimizer
 from dota_advisor import DotaAdvisor, AdvisorType
-from config import QWEN_API_KEY, DATA_SOURCE, STEAM_ID, USE_LIVE_GAME
+from scheduler import TaskScheduler
+from analysis_worker import AnalysisStage
+from state_diff import StateDiffBus
+from session_replay import SessionRecorder
+from metrics import MetricsRegistry, MetricsServer
+from clock import RealClock
+from tick_budget import TickBudget
+from coach_daemon import RecommendationHub
+from startup import ParallelInit
+from warm_start import WarmStartSnapshot, match_key
+from advice_arbiter import RecommendationArbiter
+from config import (
+    QWEN_API_KEY, DATA_SOURCE, STEAM_ID, USE_LIVE_GAME, USE_TEXT_UI,
+    GSI_HOST, GSI_PORT, GSI_AUTH_TOKEN, GSI_RECORD_PATH,
+    STATE_POLL_INTERVAL, PROCESS_CHECK_INTERVAL, UI_HEARTBEAT_INTERVAL, SCHEDULER_JITTER,
+    ANALYSIS_MAX_AGE, STATE_RECORD_PATH,
+    METRICS_HOST, METRICS_PORT, METRICS_DUMP_PATH, METRICS_DUMP_INTERVAL, TICK_BUDGET_MS,
+    COACH_DAEMON_HOST, COACH_DAEMON_PORT, COACH_RUNTIME, INIT_WORKERS,
+    SNAPSHOT_PATH, SNAPSHOT_INTERVAL, SNAPSHOT_MAX_AGE, ADVICE_PER_MINUTE, ADVICE_MAX_AGE
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,58 +40,214 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _import_voice_backend():
+    """Загрузить модули голоса заранее (pyttsx3, speech_recognition), не создавая движок"""
+    import voice_assistant
+    return voice_assistant
+
+
 class DotaCoach:
-    def __init__(self):
-        self.voice_assistant = VoiceAssistant(language="ru_RU")  # Теперь безопасна
+    # Поля game_state, от которых зависят позиция героя и _estimate_danger_level
+    FARM_ROUTE_INPUTS = ("hero_position", "enemies", "level")
+    # Поля, от которых зависит список угроз (analyze_threats)
+    THREAT_INPUTS = ("enemies", "level")
+    
+    def __init__(self, clock=None, show_window: bool = False, shared=None, game_analyzer=None):
+        """
+        Args:
+            clock: Часы (RealClock по умолчанию; VirtualClock - ускоренная симуляция матча)
+            show_window: Открыть окно помощника сразу, в состоянии прогрева
+            shared: SharedCoachData - неизменяемые таблицы, общие для сессий одного процесса
+            game_analyzer: Готовый анализатор состояния (вместо выбора по конфигу)
+        """
+        self.clock = clock or RealClock()
+        self.shared = shared
+        self._created_at = time.perf_counter()  # Для замера времени до первого совета
+        self.time_to_first_advice = None
+        
+        # Бэкенды подключаются по конфигурации: голос, HTTP и GSI
+        # импортируются только в тех режимах, где они нужны
+        self._voice_assistant = None
+        # Движок TTS (SAPI5/COM на Windows) привязан к создавшему его потоку:
+        # создаётся и озвучивает только в этом однопоточном пуле
+        self._speech_executor: Optional[ThreadPoolExecutor] = None
+        self.use_text_ui = USE_TEXT_UI  # Новое: использовать текстовый UI вместо голоса
+        
+        # Задержки этапов тика (p50/p95/p99)
+        self.metrics = MetricsRegistry()
+        self.metrics_server = MetricsServer(self.metrics, METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+        # Бюджет тика: маршрут фарма, второстепенные правила и оверлей отбрасываются под нагрузкой
+        self.tick_budget = TickBudget(TICK_BUDGET_MS / 1000, metrics=self.metrics)
+        
+        self.advisor = DotaAdvisor(position="top-right", clock=self.clock)  # Текстовой помощник
+        self.advisor.set_status("⏳ Прогрев: загрузка данных...")
+        if show_window and self.use_text_ui:
+            # Окно создаётся в своём потоке, параллельно с остальными компонентами
+            self.advisor.start()
+        
+        # Снимок прошлого запуска: кэши API сразу, история и маршрут - после проверки матча
+        self.snapshot = WarmStartSnapshot(SNAPSHOT_PATH, max_age=SNAPSHOT_MAX_AGE,
+                                          clock=self.clock.time) if SNAPSHOT_PATH else None
+        self._pending_snapshot = self.snapshot.load() if self.snapshot else None
+        self.warm_started = False
+        
+        # Независимые компоненты создаются одновременно
+        # (сессии с общими данными собираются быстро - без пула потоков)
+        startup = ParallelInit(max_workers=1 if shared else INIT_WORKERS, metrics=self.metrics)
+        if game_analyzer is None:
+            startup.add("game_analyzer", self._create_game_analyzer)
+        startup.add("strategist", self._create_strategist)
+        if shared:
+            startup.add("farm_map", lambda: FarmingOptimizer(farm_spots=shared.farm_spots))
+        else:
+            startup.add("farm_map", FarmingOptimizer)
+        if not self.use_text_ui:
+            # Параллельно - только импорт; движок создаётся в потоке озвучивания
+            startup.add("tts", _import_voice_backend)
+        components = startup.run()
+        self.startup_time = startup.elapsed
+        
+        self.gsi_listener, self.game_analyzer = components.get("game_analyzer", (None, game_analyzer))
+        self.strategist, self.use_qwen = components["strategist"]
+        self.farming_optimizer = components["farm_map"]
+        
+        # Стратег работает в фоне, чтобы запрос к Qwen не блокировал цикл
+        # (в виртуальном времени - синхронно, иначе фоновый поток отстаёт от часов;
+        # в сессиях хоста - тоже синхронно, в его общем пуле)
+        self.analysis_stage = AnalysisStage(self._timed_analysis, max_age=ANALYSIS_MAX_AGE,
+                                            clock=self.clock.monotonic,
+                                            inline=self.clock.virtual or shared is not None)
+        
+        self.current_farm_route = None  # Последний рассчитанный маршрут
+        self._farm_route_dirty = True   # Входы маршрута изменились с прошлого расчёта
+        self._farm_route_inputs = None  # (позиция, опасность) последнего расчёта
+        
+        # Рассылка изменений состояния: маршрут фарма зависит только от позиции и опасности
+        self.state_bus = StateDiffBus()
+        self.state_bus.subscribe(self.FARM_ROUTE_INPUTS, self._on_farm_inputs_changed)
         
-        # НОВОЕ: выбрать анализатор в зависимости от конфига
-        if DATA_SOURCE == 'api' or DATA_SOURCE == 'hybrid':
+        # Результаты анализа публикуются один раз; помощник/голос - такие же подписчики,
+        # как внешние фронтенды на сокете демона
+        self.hub = RecommendationHub(COACH_DAEMON_HOST, COACH_DAEMON_PORT)
+        self.hub.subscribe(("recommendation", "farm_route"), self._present_advice)
+        self.hub.subscribe(("recommendation", "farm_route"), self._on_first_advice)
+        self.present_locally = True  # False - советы показывают только внешние фронтенды
+        # Анализаторы предлагают советы арбитру; в хаб уходят только победители
+        self.arbiter = RecommendationArbiter(ADVICE_PER_MINUTE, max_age=ADVICE_MAX_AGE,
+                                             clock=self.clock.monotonic, metrics=self.metrics)
+        self._threats_dirty = True
+        self.state_bus.subscribe(self.THREAT_INPUTS, self._on_threat_inputs_changed)
+        self.is_running = False
+        self.recommendation_cooldown = 30  # секунды
+        self.farm_analysis_cooldown = 15  # анализировать фарм каждые 15 сек
+        self.current_game_state = None  # Последнее полученное состояние
+        self.current_danger = None      # Опасность для current_game_state (считается каждый опрос)
+        self.async_runner = None  # AsyncCoachRunner при COACH_RUNTIME=asyncio
+        self.speech_blocking = True  # Ждать конца озвучивания (asyncio-ядро не ждёт)
+        self.scheduler = TaskScheduler(clock=self.clock.monotonic, wait=self.clock.wait,
+                                       before_tick=self.tick_budget.begin,
+                                       after_tick=self.tick_budget.end)
+        self.session_recorder = SessionRecorder(STATE_RECORD_PATH, clock=self.clock.monotonic) if STATE_RECORD_PATH else None
+        
+        # Процесс игры отслеживается по PID; при выходе из игры сбросить состояние
+        process_watcher = getattr(self.game_analyzer, 'process_watcher', None)
+        if process_watcher:
+            process_watcher.on_stopped(self._on_game_stopped)
+        self.monitoring_thread = None
+        self.enable_farming_tips = True  # Включить советы по фарму
+        self.advisor.set_status("🔄 Ожидание советов...")
+
+    def _create_game_analyzer(self):
+        """Выбрать анализатор в зависимости от конфига; возвращает (gsi_listener, analyzer)"""
+        gsi_listener = None
+        if DATA_SOURCE == 'gsi':
+            from gsi_listener import GSIListener, GSIGameAnalyzer
+            logger.info("📊 Режим: GSI")
+            gsi_listener = GSIListener(host=GSI_HOST, port=GSI_PORT, auth_token=GSI_AUTH_TOKEN,
+                                       record_path=GSI_RECORD_PATH)
+            game_analyzer = GSIGameAnalyzer(gsi_listener)
+            logger.info("✓ Используются push-обновления Game State Integration")
+        elif DATA_SOURCE == 'api' or DATA_SOURCE == 'hybrid':
             logger.info(f"📊 Режим: {DATA_SOURCE.upper()}")
             if STEAM_ID:
-                self.game_analyzer = HybridGameAnalyzer(steam_id=STEAM_ID, use_live=USE_LIVE_GAME)
+                from dota2_api import HybridGameAnalyzer  # НОВОЕ: гибридный анализатор
+                static_data = self._pending_snapshot.get("api") if self._pending_snapshot else None
+                if static_data is None and self.shared:
+                    static_data = self.shared.static_data
+                game_analyzer = HybridGameAnalyzer(steam_id=STEAM_ID, use_live=USE_LIVE_GAME,
+                                                   static_data=static_data)
                 logger.info(f"✓ Используется API (Steam ID: {STEAM_ID})")
             else:
                 logger.warning("Steam ID не установлен, использую локальную симуляцию")
-                self.game_analyzer = GameAnalyzer()
+                game_analyzer = GameAnalyzer(clock=self.clock)
         else:
             logger.info("📊 Режим: LOCAL")
-            self.game_analyzer = GameAnalyzer()
+            game_analyzer = GameAnalyzer(clock=self.clock)
             logger.info("✓ Используется локальная симуляция")
-        
-        # Выбрать стратега в зависимости от API ключа
+        return gsi_listener, game_analyzer
+
+    def _create_strategist(self):
+        """Выбрать стратега в зависимости от API ключа; возвращает (strategist, use_qwen)"""
         if QWEN_API_KEY:
-            self.strategist = QwenStrategist()
-            self.use_qwen = True
+            from qwen_processor import QwenStrategist
             logger.info("🤖 Используется Qwen AI (с API ключом)")
-        else:
-            self.strategist = LocalStrategist()
-            self.use_qwen = False
-            logger.info("🧠 Используется локальный анализ (без API ключа)")
-        
-        self.farming_optimizer = FarmingOptimizer()
-        self.advisor = DotaAdvisor(position="top-right")  # Текстовой помощник
-        self.is_running = False
-        self.last_recommendation_time = None
-        self.recommendation_cooldown = 30  # секунды
-        self.last_farm_analysis_time = None
-        self.farm_analysis_cooldown = 15  # анализировать фарм каждые 15 сек
-        self.monitoring_thread = None
-        self.enable_farming_tips = True  # Включить советы по фарму
-        self.use_text_ui = True  # Новое: использовать текстовый UI вместо голоса
+            return QwenStrategist(), True
+        logger.info("🧠 Используется локальный анализ (без API ключа)")
+        return LocalStrategist(hero_roles=self.shared.hero_roles if self.shared else None), False
+
+    def _on_first_advice(self, topic: str, data: dict):
+        """Подписчик хаба: записать время от запуска до первого совета"""
+        if self.time_to_first_advice is not None or data.get("status"):
+            return
+        self.time_to_first_advice = time.perf_counter() - self._created_at
+        self.metrics.record("time_to_first_advice", self.time_to_first_advice)
+        logger.info(f"⏱️ Первый совет через {self.time_to_first_advice:.2f}с после запуска "
+                    f"(инициализация {self.startup_time * 1000:.0f}мс)")
+
+    @property
+    def voice_assistant(self):
+        """
+        Голосовой помощник (создаётся при первом обращении в потоке озвучивания)
+
+        Озвучивать - только через _speak: движок нельзя вызывать из других потоков.
+        """
+        if self._voice_assistant is None:
+            self._speech_pool().submit(self._ensure_voice_assistant).result()
+        return self._voice_assistant
+
+    def _speech_pool(self) -> ThreadPoolExecutor:
+        if self._speech_executor is None:
+            self._speech_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="coach-speech")
+        return self._speech_executor
+
+    def _ensure_voice_assistant(self):
+        """Создать помощника (вызывается только в потоке озвучивания)"""
+        if self._voice_assistant is None:
+            from voice_assistant import VoiceAssistant
+            self._voice_assistant = VoiceAssistant(language="ru_RU")  # Теперь безопасна
+        return self._voice_assistant
+
+    def _say(self, text: str):
+        self._ensure_voice_assistant().speak(text)
 
     def start(self):
         """Запустить тренера"""
         logger.info("🎮 Голосовой тренер Dota 2 запущен")
         
         # Новое: запустить текстовой помощник вместо озвучивания
-        if self.use_text_ui:
+        if not self.present_locally:
+            logger.info("✓ Режим демона: советы показывают подключённые фронтенды")
+        elif self.use_text_ui:
             self.advisor.start()
             logger.info("✓ Текстовой UI помощник активирован")
         else:
-            self.voice_assistant.speak("Виртуальный тренер активирован")
+            self._speak("Виртуальный тренер активирован")
         
         self.is_running = True
         
+        if self.gsi_listener:
+            self.gsi_listener.start()
+        
         # Проверить, запущена ли игра
         if not self.game_analyzer.check_game_running():
             if self.use_text_ui:
@@ -87,8 +259,10 @@ class DotaCoach:
                     duration=5.0
                 )
             else:
-                self.voice_assistant.speak("Пожалуйста, запустите Dota 2")
+                self._speak("Пожалуйста, запустите Dota 2")
             logger.warning("Dota 2 не запущена")
+            if self.gsi_listener:
+                self.gsi_listener.stop()
             return False
         
         return True
@@ -98,39 +272,31 @@ class DotaCoach:
         if not self.start():
             return
         
-        if self.use_text_ui:
-            self.advisor.show_advice(
-                "Игра обнаружена.\nЯ буду следить\nи давать советы",
-                AdvisorType.STRATEGY,
-                priority=8,
-                icon="🎮",
-                duration=4.0
-            )
+        self._offer_advice("recommendation", {
+            "message": "Игра обнаружена.\nЯ буду следить\nи давать советы",
+            "speech": "Игра обнаружена. Я буду следить за ситуацией и давать советы",
+            "advice_type": AdvisorType.STRATEGY.value,
+            "priority": 8,
+            "icon": "🎮",
+            "duration": 4.0,
+            "status": True,  # Служебное сообщение, не совет
+        }, source="status")
+        
+        if COACH_RUNTIME == 'asyncio':
+            from async_coach import AsyncCoachRunner
+            self.async_runner = AsyncCoachRunner(self)
         else:
-            self.voice_assistant.speak("Игра обнаружена. Я буду следить за ситуацией и давать советы")
+            self._setup_scheduler()
+        if self.metrics_server:
+            self.metrics_server.start()
+        self.hub.start()
         
         try:
-            while self.is_running:
-                # Получить состояние игры
-                game_state = self.game_analyzer.get_current_game_state()
-                
-                if game_state is None:
-                    time.sleep(2)
-                    continue
-                
-                # Анализ ФАРМА
-                if self.enable_farming_tips and self._should_analyze_farming():
-                    self._analyze_and_recommend_farming(game_state)
-                
-                # Проверить, можно ли дать рекомендацию
-                if self._should_give_recommendation():
-                    self._analyze_and_recommend(game_state)
-                
-                # Проверить, просит ли игрок помощь
-                self._check_for_user_input()
-                
-                time.sleep(5)
-                
+            if self.async_runner:
+                self.async_runner.run()
+            else:
+                self.scheduler.run_forever(lambda: self.is_running)
+            
         except KeyboardInterrupt:
             logger.info("Тренер остановлен пользователем")
             if self.use_text_ui:
@@ -141,7 +307,7 @@ class DotaCoach:
                     duration=3.0
                 )
             else:
-                self.voice_assistant.speak("До встречи на Доте!")
+                self._speak("До встречи на Доте!")
         except Exception as e:
             logger.error(f"Ошибка в основном цикле: {e}")
             if self.use_text_ui:
@@ -152,30 +318,249 @@ class DotaCoach:
                     duration=4.0
                 )
             else:
-                self.voice_assistant.speak("Произошла ошибка")
+                self._speak("Произошла ошибка")
         finally:
             self.is_running = False
+            self.analysis_stage.shutdown()
+            if self.gsi_listener:
+                self.gsi_listener.stop()
+            if self.session_recorder:
+                self.session_recorder.close()
+            if self.metrics_server:
+                self.metrics_server.stop()
+            self.hub.stop()
+            if self._speech_executor:
+                self._speech_executor.shutdown(wait=False)
+            if METRICS_DUMP_PATH:
+                self.metrics.dump(METRICS_DUMP_PATH)
+            self._save_snapshot()
 
-    def _should_give_recommendation(self) -> bool:
-        """Проверить, можно ли давать рекомендацию (cooldown)"""
-        if self.last_recommendation_time is None:
-            return True
+    def _setup_scheduler(self):
+        """Зарегистрировать все периодические задачи главного цикла"""
+        self.scheduler.add_job("poll_state", self._poll_game_state,
+                               STATE_POLL_INTERVAL, jitter=SCHEDULER_JITTER)
+        self.scheduler.add_job("process_check", self._check_game_process,
+                               PROCESS_CHECK_INTERVAL, jitter=SCHEDULER_JITTER,
+                               initial_delay=PROCESS_CHECK_INTERVAL)
+        if self.enable_farming_tips:
+            self.scheduler.add_job("farming", self._farming_job,
+                                   self.farm_analysis_cooldown, jitter=SCHEDULER_JITTER)
+        self.scheduler.add_job("strategy", self._strategy_job,
+                               self.recommendation_cooldown, jitter=SCHEDULER_JITTER)
+        self.scheduler.add_job("strategy_results", self._collect_analysis_results,
+                               UI_HEARTBEAT_INTERVAL)
+        self.scheduler.add_job("advice_arbiter", self._arbiter_job,
+                               UI_HEARTBEAT_INTERVAL)
+        self.scheduler.add_job("ui_heartbeat", self._ui_heartbeat,
+                               UI_HEARTBEAT_INTERVAL)
+        if METRICS_DUMP_PATH:
+            self.scheduler.add_job("metrics_dump", lambda: self.metrics.dump(METRICS_DUMP_PATH),
+                                   METRICS_DUMP_INTERVAL, initial_delay=METRICS_DUMP_INTERVAL)
+        
+        if self.snapshot:
+            self.scheduler.add_job("snapshot", self._save_snapshot,
+                                   SNAPSHOT_INTERVAL, initial_delay=SNAPSHOT_INTERVAL)
         
-        elapsed = datetime.now() - self.last_recommendation_time
-        return elapsed > timedelta(seconds=self.recommendation_cooldown)
+        if self.gsi_listener:
+            # Push от клиента сразу будит цикл, не дожидаясь интервала опроса
+            self.gsi_listener.on_update(lambda state: self.scheduler.reschedule("poll_state"))
 
-    def _analyze_and_recommend(self, game_state: dict):
-        """Анализировать ситуацию и дать рекомендацию"""
-        logger.info("📊 Анализирую ситуацию...")
+    def _poll_game_state(self):
+        """Задача: получить свежее состояние игры и разослать изменения"""
+        with self.metrics.time("state_fetch"):
+            game_state = self.game_analyzer.get_current_game_state()
+        self._apply_game_state(game_state)
+
+    def _apply_game_state(self, game_state):
+        """Принять новое состояние: разослать изменения, оценить опасность, угрозы"""
+        danger = None
+        if game_state is not None and self._pending_snapshot:
+            self._restore_snapshot(game_state)
+        if game_state is not None:
+            self.state_bus.publish(self.current_game_state, game_state)
+            if self.session_recorder:
+                self.session_recorder.record(game_state)
+            # Обнаружение опасности не зависит от бюджета тика
+            with self.metrics.time("estimate_danger"):
+                danger = self._estimate_danger_level(game_state)
+        self.current_game_state = game_state
+        self.current_danger = danger
+        if game_state is not None and self._threats_dirty:
+            self._threats_dirty = False
+            self._publish_threats(game_state, danger)
+
+    def _capture_snapshot(self) -> dict:
+        """Собрать данные для тёплого старта"""
+        data = {}
+        dota_api = getattr(self.game_analyzer, 'dota_api', None)
+        if dota_api is not None and hasattr(dota_api, 'export_static_data'):
+            data["api"] = dota_api.export_static_data()
+        game_state = self.current_game_state or getattr(self.game_analyzer, 'last_update', None)
+        if game_state is None:
+            return data
+        data["match"] = match_key(game_state)
+        history = getattr(self.game_analyzer, 'game_state_history', None)
+        if history is not None:
+            data["history"] = history.export()
+        route = self.farming_optimizer.last_farm_route
+        if route:
+            data["farm_route"] = [spot.name for spot in route]
+            if self._farm_route_inputs:
+                position, danger = self._farm_route_inputs
+                data["farm_route_inputs"] = {"hero_position": list(position), "danger": danger}
+        return data
+
+    def _save_snapshot(self):
+        """Задача: записать снимок тёплого старта"""
+        if not self.snapshot:
+            return
+        try:
+            with self.metrics.time("snapshot_save"):
+                self.snapshot.save(self._capture_snapshot())
+        except OSError as e:
+            logger.warning(f"⚠️ Снимок тёплого старта не записан: {e}")
+
+    def _restore_snapshot(self, game_state):
+        """Первое состояние после запуска: продолжить с снимка, если это тот же матч"""
+        snapshot, self._pending_snapshot = self._pending_snapshot, None
+        if not self.snapshot.matches(snapshot, game_state):
+            logger.info("Снимок от другого матча - история и маршрут строятся заново")
+            return
         
-        # Получить анализ от стратега
-        analysis = self.strategist.analyze_situation(game_state)
+        history = getattr(self.game_analyzer, 'game_state_history', None)
+        if history is not None and snapshot.get("history"):
+            try:
+                history.restore(snapshot["history"])
+            except (ValueError, KeyError) as e:
+                logger.warning(f"⚠️ История из снимка не восстановлена: {e}")
         
-        if analysis["status"] == "success":
-            self._voice_report_recommendation(analysis, game_state)
-            self.last_recommendation_time = datetime.now()
+        inputs = snapshot.get("farm_route_inputs")
+        if snapshot.get("farm_route") and inputs:
+            position = tuple(inputs["hero_position"])
+            route = self.farming_optimizer.restore_route(snapshot["farm_route"], position)
+            if route:
+                self.current_farm_route = route
+                # Маршрут пересчитается, только если позиция или опасность изменятся
+                self._farm_route_inputs = (position, inputs["danger"])
+        
+        self.warm_started = True
+        logger.info(f"♨️ Тёплый старт: история {len(history) if history is not None else 0} "
+                    f"состояний, маршрут {'восстановлен' if self.current_farm_route else 'нет'}")
+
+    def _on_threat_inputs_changed(self, changes, game_state):
+        """Враги или уровень изменились - список угроз нужно переопубликовать"""
+        self._threats_dirty = True
+
+    def _publish_threats(self, game_state, danger: float):
+        """Опубликовать уровень опасности и список угроз"""
+        analyze_threats = getattr(self.game_analyzer, 'analyze_threats', None)
+        threats = analyze_threats(game_state) if analyze_threats else []
+        self.hub.publish("threats", {"danger_level": danger, "threats": threats})
+
+    def _offer_advice(self, topic: str, data: dict, source: str = None):
+        """Предложить совет арбитру (выпустит _arbiter_job, если совет победит)"""
+        self.arbiter.offer(topic, data, source)
+
+    def _arbiter_job(self):
+        """Задача: опубликовать победителя арбитра, если позволяет бюджет"""
+        winner = self.arbiter.select()
+        if winner is not None:
+            self.hub.publish(winner.topic, winner.data)
+
+    def _present_advice(self, topic: str, data: dict):
+        """Подписчик хаба: показать совет в помощнике или озвучить"""
+        if not self.present_locally:
+            return
+        if self.use_text_ui:
+            with self.metrics.time("advisor_enqueue"):
+                self.advisor.show_advice(
+                    data["message"],
+                    AdvisorType(data["advice_type"]),
+                    priority=data["priority"],
+                    icon=data.get("icon", "💡"),
+                    duration=data["duration"]
+                )
         else:
-            logger.warning(f"Ошибка анализа: {analysis.get('error')}")
+            self._speak(data.get("speech", data["message"]))
+
+    def _speak(self, text: str):
+        """Озвучить в потоке озвучивания (asyncio-ядро не ждёт окончания)"""
+        future = self._speech_pool().submit(self._say, text)
+        if self.speech_blocking:
+            future.result()
+
+    def _on_farm_inputs_changed(self, changes, game_state):
+        """Позиция или опасность изменились - маршрут нужно пересчитать"""
+        self._farm_route_dirty = True
+
+    def _check_game_process(self):
+        """Задача: проверить, что Dota 2 всё ещё запущена"""
+        if not self.game_analyzer.check_game_running():
+            self.current_game_state = None
+
+    def _on_game_stopped(self, pid: int):
+        """Событие: процесс Dota 2 завершился"""
+        self.current_game_state = None
+        self._farm_route_dirty = True
+
+    def _farming_job(self):
+        """Задача: анализ фарма; при неудаче повторить на следующем опросе"""
+        game_state = self.current_game_state
+        if game_state is None or not self._analyze_and_recommend_farming(game_state):
+            self.scheduler.reschedule("farming", STATE_POLL_INTERVAL)
+
+    def _strategy_job(self):
+        """Задача: отдать свежее состояние стратегу (не блокирует цикл)"""
+        game_state = self.current_game_state
+        if game_state is None:
+            self.scheduler.reschedule("strategy", STATE_POLL_INTERVAL)
+            return
+        self._analyze_and_recommend(game_state)
+
+    def _collect_analysis_results(self):
+        """Задача: забрать готовый результат стратега и показать рекомендацию"""
+        result = self.analysis_stage.poll()
+        if result is None:
+            return
+        
+        stats = self.analysis_stage.get_stats()
+        logger.debug(f"Анализ готов: возраст {stats['last_result_age']:.1f}с, "
+                     f"очередь {stats['queue_depth']}, устаревших {stats['dropped_stale']}")
+        
+        if not self._report_analysis(result.analysis, result.game_state):
+            self.scheduler.reschedule("strategy", STATE_POLL_INTERVAL)
+
+    def _analyze_and_recommend(self, game_state: dict):
+        """Отправить ситуацию на фоновый анализ; результат заберёт _collect_analysis_results"""
+        logger.info("📊 Анализирую ситуацию...")
+        self.analysis_stage.submit(game_state)
+
+    def _timed_analysis(self, game_state: dict) -> dict:
+        """Анализ стратега с замером времени (выполняется в фоновом потоке)"""
+        with self.metrics.time("analyze_situation"):
+            if self.use_qwen:
+                return self.strategist.analyze_situation(game_state)
+            
+            # В фоне у стратега свой предел; синхронно - остаток бюджета тика
+            if self.analysis_stage.inline:
+                time_budget = self.tick_budget.remaining("strategist_rules")
+            else:
+                time_budget = self.tick_budget.limit("strategist_rules")
+            over_budget = self.strategist.rules_over_budget
+            analysis = self.strategist.analyze_situation(game_state, time_budget=time_budget)
+            self.tick_budget.record_skip("strategist_rules",
+                                         self.strategist.rules_over_budget - over_budget)
+            return analysis
+
+    def _report_analysis(self, analysis: dict, game_state: dict) -> bool:
+        """Показать рекомендацию из готового анализа"""
+        if analysis["status"] == "success":
+            with self.metrics.time("voice_report"):
+                self._voice_report_recommendation(analysis, game_state)
+            return True
+        
+        logger.warning(f"Ошибка анализа: {analysis.get('error')}")
+        return False
 
     def _voice_report_recommendation(self, analysis: dict, game_state: dict):
         """Озвучить рекомендацию игроку (теперь через UI)"""
@@ -242,49 +627,65 @@ class DotaCoach:
             
             logger.info(f"💬 Рекомендация: {message}")
             
-            if self.use_text_ui:
-                self.advisor.show_advice(
-                    message,
-                    advice_type,
-                    priority=priority,
-                    duration=6.0
-                )
-            else:
-                self.voice_assistant.speak(message)
+            self._offer_advice("recommendation", {
+                "message": message,
+                "advice_type": advice_type.value,
+                "priority": priority,
+                "duration": 6.0,
+            })
             
         except Exception as e:
             logger.error(f"Ошибка при озвучивании рекомендации: {e}")
 
+    def _ui_heartbeat(self):
+        """Задача: обновить оверлей и проверить ввод (отбрасывается при нехватке времени)"""
+        if not self.tick_budget.allows("overlay"):
+            return
+        with self.tick_budget.measure("overlay"):
+            # С окном советы продвигает поток Tk; без окна - этот цикл
+            if not self.advisor.is_running:
+                self.advisor.tick()
+            self._check_for_user_input()
+
     def _check_for_user_input(self):
         """Проверить, просит ли игрок помощь (без блокировки)"""
         # В полной реализации здесь можно слушать горячую клавишу
         # или слова-активаторы вроде "тренер" или "совет"
         pass
 
-    def _should_analyze_farming(self) -> bool:
-        """Проверить, пора ли анализировать фарм (cooldown)"""
-        if self.last_farm_analysis_time is None:
-            return True
-        
-        elapsed = datetime.now() - self.last_farm_analysis_time
-        return elapsed > timedelta(seconds=self.farm_analysis_cooldown)
-
-    def _analyze_and_recommend_farming(self, game_state: dict):
+    def _analyze_and_recommend_farming(self, game_state: dict) -> bool:
         """Анализировать фарм и дать рекомендацию по оптимальному маршруту"""
         logger.info("🌾 Анализирую оптимальный фарм...")
         
         try:
-            # Получить текущую позицию героя
-            hero_pos = game_state.get('hero_position', (500, 500))
-            
-            # Рассчитать опасность на карте
-            danger_level = self._estimate_danger_level(game_state)
+            if self._farm_route_dirty or self.current_farm_route is None:
+                # Получить текущую позицию героя
+                hero_pos = game_state.get('hero_position', (500, 500))
+                
+                # Опасность уже посчитана при опросе состояния
+                danger_level = self.current_danger
+                if danger_level is None or game_state is not self.current_game_state:
+                    with self.metrics.time("estimate_danger"):
+                        danger_level = self._estimate_danger_level(game_state)
+                
+                # Враги могли смениться, а итоговая опасность - остаться прежней
+                if (hero_pos, danger_level) == self._farm_route_inputs and self.current_farm_route is not None:
+                    self._farm_route_dirty = False
+                elif self.tick_budget.allows("farm_route"):
+                    # Рассчитать оптимальный маршрут фарма
+                    with self.tick_budget.measure("farm_route"):
+                        self.current_farm_route = self.farming_optimizer.calculate_farm_route(
+                            hero_position=hero_pos,
+                            team_danger_level=danger_level
+                        )
+                    self._farm_route_inputs = (hero_pos, danger_level)
+                    self._farm_route_dirty = False
+                else:
+                    logger.debug("Тик не укладывается в бюджет - маршрут фарма прежний")
+            else:
+                logger.debug("Позиция и опасность не изменились - маршрут фарма прежний")
             
-            # Рассчитать оптимальный маршрут фарма
-            farm_route = self.farming_optimizer.calculate_farm_route(
-                hero_position=hero_pos,
-                team_danger_level=danger_level
-            )
+            farm_route = self.current_farm_route
             
             if farm_route:
                 # Получить информацию о следующем споте
@@ -294,22 +695,26 @@ class DotaCoach:
                     rec = next_spot_info['recommendation']
                     logger.info(f"💬 Совет фарм: {rec}")
                     
-                    # Новое: показать в UI вместо озвучивания
-                    if self.use_text_ui:
-                        self.advisor.show_advice(
-                            f"🌾 {rec}\n\n💰 {next_spot_info['gold_per_minute']} GPM\n⏱️ {int(next_spot_info['time_to_clear'])}сек",
-                            AdvisorType.FARMING,
-                            priority=7,
-                            icon="🌾",
-                            duration=8.0
-                        )
-                    else:
-                        self.voice_assistant.speak(rec)
+                    # Маршрут публикуется один раз для всех фронтендов (через арбитра)
+                    self._offer_advice("farm_route", {
+                        "message": f"🌾 {rec}\n\n💰 {next_spot_info['gold_per_minute']} GPM\n⏱️ {int(next_spot_info['time_to_clear'])}сек",
+                        "speech": rec,
+                        "advice_type": AdvisorType.FARMING.value,
+                        "priority": 7,
+                        "icon": "🌾",
+                        "duration": 8.0,
+                        "spot": next_spot_info['spot_name'],
+                        "gold_per_minute": next_spot_info['gold_per_minute'],
+                        "route": [spot.name for spot in farm_route],
+                        "hero_position": list(game_state.get('hero_position', (500, 500))),
+                    })
                     
-                    self.last_farm_analysis_time = datetime.now()
+                    return True
             
         except Exception as e:
             logger.error(f"Ошибка анализа фарма: {e}")
+        
+        return False
 
     def _estimate_danger_level(self, game_state: dict) -> float:
         """
@@ -349,7 +754,7 @@ class DotaCoach:
                     duration=3.0
                 )
             else:
-                self.voice_assistant.speak("Игра не обнаружена")
+                self._speak("Игра не обнаружена")
             return
         
         # Дать развёрнутый анализ
@@ -361,7 +766,7 @@ class DotaCoach:
                 duration=3.0
             )
         else:
-            self.voice_assistant.speak("Анализирую ситуацию подробнее...")
+            self._speak("Анализирую ситуацию подробнее...")
         
         analysis = self.strategist.analyze_situation(game_state)
         if analysis["status"] == "success":
@@ -375,9 +780,13 @@ class DotaCoach:
                     duration=3.0
                 )
             else:
-                self.voice_assistant.speak("Не удалось провести анализ")
+                self._speak("Не удалось провести анализ")
 
     def stop(self):
         """Остановить тренера"""
         logger.info("Остановка тренера...")
         self.is_running = False
+        self.scheduler.wake()
+        if self.async_runner:
+            self.async_runner.stop()
+        self.analysis_stage.shutdown()
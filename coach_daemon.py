@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Локальный демон тренера
+Анализ выполняется один раз, а рекомендации, маршруты фарма и угрозы
+публикуются подписчикам: внутри процесса (текстовый помощник, голос) и по
+локальному TCP-сокету строками JSON (оверлей, журнал, другие фронтенды).
+
+Протокол: каждое сообщение - одна строка
+    {"topic": "recommendation", "seq": 12, "t": 1700000000.0, "data": {...}}
+Клиент может прислать строку {"subscribe": ["threats", "farm_route"]},
+чтобы получать только нужные темы (по умолчанию - все). Строки запросов
+длиннее MAX_REQUEST_LINE байт закрывают соединение. Сразу после
+подключения приходит последнее сообщение каждой темы.
+
+Запуск:
+    python coach_daemon.py serve                         # демон без локального UI
+    python coach_daemon.py listen --topics threats       # журнал сообщений
+    python coach_daemon.py listen --advisor              # текстовый помощник как фронтенд
+    python coach_daemon.py listen --overlay              # оверлей маршрута фарма как фронтенд
+"""
+
+import argparse
+import json
+import logging
+import select
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TOPICS = ("recommendation", "farm_route", "threats")
+MAX_REQUEST_LINE = 4096  # байт; запрос подписки - короткая строка JSON
+
+
+class _RemoteSubscriber:
+    """Очередь сообщений одного TCP-клиента (медленный клиент теряет старые)"""
+
+    def __init__(self, address, queue_size: int):
+        self.address = address
+        self.topics: Optional[frozenset] = None   # None = все темы
+        self.queue: deque = deque(maxlen=queue_size)
+        self.cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def push(self, topic: str, line: bytes):
+        with self.cond:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+            self.queue.append((topic, line))
+            self.cond.notify()
+
+
+class RecommendationHub:
+    """
+    Публикация результатов анализа
+
+    Сообщение кодируется в JSON один раз и раздаётся всем подписчикам;
+    публикация не блокируется медленными TCP-клиентами.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: Optional[int] = None, queue_size: int = 256):
+        """
+        Args:
+            host: Адрес сокета (по умолчанию только локальный)
+            port: Порт TCP (None = только подписчики внутри процесса, 0 = свободный порт)
+            queue_size: Сколько сообщений держать для медленного клиента
+        """
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self._local: List[Tuple[Optional[frozenset], Callable[[str, Dict], None]]] = []
+        self._remote: List[_RemoteSubscriber] = []
+        self._retained: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._seq = 0
+        self.server = None
+        self._thread: Optional[threading.Thread] = None
+        self.published = 0
+
+    def subscribe(self, topics: Optional[Iterable[str]], callback: Callable[[str, Dict], None]):
+        """
+        Подписаться внутри процесса
+
+        Args:
+            topics: Темы (None = все)
+            callback: Функция (topic, data), вызывается синхронно в publish
+        """
+        self._local.append((frozenset(topics) if topics is not None else None, callback))
+
+    def publish(self, topic: str, data: Dict) -> int:
+        """
+        Опубликовать сообщение
+
+        Returns:
+            Номер сообщения
+        """
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            remote = list(self._remote)
+            if remote or self.server:
+                line = (json.dumps({"topic": topic, "seq": seq, "t": round(time.time(), 3), "data": data},
+                                   ensure_ascii=False, default=str) + "\n").encode('utf-8')
+                self._retained[topic] = line
+            else:
+                line = None
+        self.published += 1
+
+        for subscriber in remote:
+            if subscriber.wants(topic):
+                subscriber.push(topic, line)
+        for topics, callback in self._local:
+            if topics is None or topic in topics:
+                try:
+                    callback(topic, data)
+                except Exception as e:
+                    logger.error(f"Ошибка подписчика {topic}: {e}")
+        return seq
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._local) + len(self._remote)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "published": self.published,
+                "local_subscribers": len(self._local),
+                "remote_subscribers": len(self._remote),
+                "filtered_subscribers": sum(s.topics is not None for s in self._remote),
+                "dropped": sum(s.dropped for s in self._remote),
+            }
+
+    def start(self):
+        """Запустить TCP-сервер (если задан порт)"""
+        if self.server or self.port is None:
+            return
+        hub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                hub._serve_client(self)
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        self.server = Server((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"📡 Демон тренера публикует на {self.host}:{self.port}")
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        with self._lock:
+            remote, self._remote = self._remote, []
+        for subscriber in remote:
+            with subscriber.cond:
+                subscriber.closed = True
+                subscriber.cond.notify()
+
+    def _serve_client(self, handler: socketserver.StreamRequestHandler):
+        """Цикл одного клиента (в потоке сервера)"""
+        subscriber = _RemoteSubscriber(handler.client_address, self.queue_size)
+        with self._lock:
+            self._remote.append(subscriber)
+            retained = list(self._retained.items())
+        logger.info(f"🔌 Подключён фронтенд {subscriber.address}")
+        for topic, line in retained:
+            subscriber.push(topic, line)
+
+        # Дать клиенту время прислать подписку до отправки сохранённых сообщений
+        request_wait = 0.1
+        # Запросы читаются прямо из сокета: буфер rfile спрятал бы от select
+        # строки, пришедшие в одном пакете с первой
+        pending = b""
+        try:
+            while not subscriber.closed:
+                # Запросы подписки от клиента
+                readable, _, _ = select.select([handler.connection], [], [], request_wait)
+                request_wait = 0
+                if readable:
+                    chunk = handler.connection.recv(4096)
+                    if not chunk:
+                        break
+                    *requests, pending = (pending + chunk).split(b"\n")
+                    if len(pending) > MAX_REQUEST_LINE:
+                        logger.warning(f"⚠️ Фронтенд {subscriber.address}: строка запроса без конца, отключаю")
+                        break
+                    for request in requests:
+                        self._apply_request(subscriber, request)
+
+                with subscriber.cond:
+                    subscriber.cond.wait_for(lambda: subscriber.queue or subscriber.closed, timeout=0.2)
+                    batch = list(subscriber.queue)
+                    subscriber.queue.clear()
+                # Подписка могла смениться, пока сообщения ждали в очереди
+                lines = [line for topic, line in batch if subscriber.wants(topic)]
+                if lines:
+                    handler.wfile.write(b"".join(lines))
+                    handler.wfile.flush()
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                if subscriber in self._remote:
+                    self._remote.remove(subscriber)
+            logger.info(f"🔌 Фронтенд отключился {subscriber.address}")
+
+    @staticmethod
+    def _apply_request(subscriber: _RemoteSubscriber, request: bytes):
+        try:
+            message = json.loads(request)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+        topics = message.get("subscribe")
+        if isinstance(topics, list) and all(isinstance(topic, str) for topic in topics):
+            subscriber.topics = frozenset(topics) if topics else None
+
+
+class CoachClient:
+    """Клиент демона: подписка и чтение сообщений"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765,
+                 topics: Optional[Iterable[str]] = None, timeout: Optional[float] = None):
+        self.sock = socket.create_connection((host, port), timeout=5)
+        self.sock.settimeout(timeout)
+        self._file = self.sock.makefile('rb')
+        if topics is not None:
+            self.sock.sendall((json.dumps({"subscribe": list(topics)}) + "\n").encode('utf-8'))
+
+    def __iter__(self) -> Iterator[Dict]:
+        for line in self._file:
+            yield json.loads(line)
+
+    def receive(self) -> Optional[Dict]:
+        """Следующее сообщение (None если соединение закрыто)"""
+        line = self._file.readline()
+        return json.loads(line) if line else None
+
+    def close(self):
+        self._file.close()
+        self.sock.close()
+
+
+def _serve(port: int):
+    from coach import DotaCoach
+    coach = DotaCoach()
+    coach.hub.port = port
+    coach.present_locally = False  # Показывают подключённые фронтенды
+    coach.run()
+
+
+def _listen(host: str, port: int, topics: Optional[List[str]], use_advisor: bool, use_overlay: bool = False):
+    advisor = None
+    if use_advisor:
+        from dota_advisor import DotaAdvisor, AdvisorType
+        advisor = DotaAdvisor(position="top-right")
+        advisor.start()
+    overlay = None
+    if use_overlay:
+        from overlay_renderer import OverlayRenderer
+        overlay = OverlayRenderer()
+        overlay.start()
+
+    client = CoachClient(host, port, topics)
+    try:
+        for message in client:
+            data = message["data"]
+            logger.info(f"[{message['topic']}#{message['seq']}] {json.dumps(data, ensure_ascii=False)}")
+            if advisor and message["topic"] in ("recommendation", "farm_route"):
+                advisor.show_advice(data["message"], AdvisorType(data["advice_type"]),
+                                    priority=data.get("priority", 5), icon=data.get("icon", "💡"),
+                                    duration=data.get("duration", 6.0))
+            if overlay and message["topic"] == "farm_route":
+                overlay.on_farm_route(message["topic"], data)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+        if overlay:
+            overlay.stop()
+
+
+def main():
+    from config import COACH_DAEMON_HOST, COACH_DAEMON_PORT
+
+    parser = argparse.ArgumentParser(description="Демон тренера и его фронтенды")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Запустить тренера и публиковать анализ")
+    serve.add_argument("--port", type=int, default=COACH_DAEMON_PORT or 8765)
+    listen = sub.add_parser("listen", help="Подписаться на демон")
+    listen.add_argument("--host", default=COACH_DAEMON_HOST)
+    listen.add_argument("--port", type=int, default=COACH_DAEMON_PORT or 8765)
+    listen.add_argument("--topics", default="", help=f"Через запятую: {', '.join(TOPICS)}")
+    listen.add_argument("--advisor", action="store_true", help="Показывать советы в текстовом помощнике")
+    listen.add_argument("--overlay", action="store_true", help="Рисовать маршрут фарма в оверлее")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        _serve(args.port)
+    else:
+        topics = [t for t in args.topics.split(",") if t] or None
+        _listen(args.host, args.port, topics, args.advisor, args.overlay)
+
+
+if __name__ == "__main__":
+    main()
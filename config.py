@@ -1,13 +1,22 @@
 import os
 from dotenv import load_dotenv
 
+from hero_index import get_index
+
 load_dotenv()
 
 # Data Source Configuration
-DATA_SOURCE = os.getenv("DATA_SOURCE", "local")  # local, api, или hybrid
+DATA_SOURCE = os.getenv("DATA_SOURCE", "local")  # local, api, hybrid или gsi
 STEAM_ID = os.getenv("STEAM_ID")  # Для Dota 2 WebAPI
 USE_LIVE_GAME = os.getenv("USE_LIVE_GAME", "false").lower() == "true"
 
+# Game State Integration (push-обновления от клиента Dota 2)
+GSI_HOST = os.getenv("GSI_HOST", "127.0.0.1")
+GSI_PORT = int(os.getenv("GSI_PORT", "3000"))
+GSI_AUTH_TOKEN = os.getenv("GSI_AUTH_TOKEN", "")
+GSI_RECORD_PATH = os.getenv("GSI_RECORD_PATH")  # Записывать push-обновления в файл
+STATE_RECORD_PATH = os.getenv("STATE_RECORD_PATH")  # Записывать состояния тренера (для session_replay.py)
+
 # Qwen Configuration
 QWEN_API_KEY = os.getenv("QWEN_API_KEY")
 QWEN_MODEL = os.getenv("QWEN_MODEL", "qwen-max")
@@ -21,19 +30,87 @@ GAME_DETECTION_ENABLED = os.getenv("GAME_DETECTION_ENABLED", "true").lower() ==
 
 # Voice Configuration
 VOICE_ENGINE = os.getenv("VOICE_ENGINE", "google")
+USE_TEXT_UI = os.getenv("USE_TEXT_UI", "true").lower() == "true"  # false = озвучивать советы голосом
 LANGUAGE = os.getenv("LANGUAGE", "ru_RU")
 
 # Coach Configuration
 ANALYSIS_INTERVAL = 30  # Интервал анализа в секундах
 RECOMMENDATION_THRESHOLD = 0.7  # Минимальная уверенность для рекомендации
 
+# Scheduler Configuration (интервалы задач главного цикла, секунды)
+STATE_POLL_INTERVAL = float(os.getenv("STATE_POLL_INTERVAL", "1.0"))
+PROCESS_CHECK_INTERVAL = float(os.getenv("PROCESS_CHECK_INTERVAL", "10.0"))
+PROCESS_RESCAN_MIN = float(os.getenv("PROCESS_RESCAN_MIN", "1.0"))     # Поиск процесса, пока игры нет:
+PROCESS_RESCAN_MAX = float(os.getenv("PROCESS_RESCAN_MAX", "30.0"))    # задержка растёт от MIN до MAX
+COACH_RUNTIME = os.getenv("COACH_RUNTIME", "threads")  # threads (TaskScheduler) или asyncio
+UI_HEARTBEAT_INTERVAL = float(os.getenv("UI_HEARTBEAT_INTERVAL", "0.5"))
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))
+
+# Метрики задержек по этапам: HTTP-эндпоинт и/или периодическая выгрузка в файл
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0")) or None  # None = эндпоинт выключен
+METRICS_DUMP_PATH = os.getenv("METRICS_DUMP_PATH")
+METRICS_DUMP_INTERVAL = float(os.getenv("METRICS_DUMP_INTERVAL", "10.0"))
+
+# Демон тренера: публикация анализа фронтендам по локальному сокету (строки JSON)
+COACH_DAEMON_HOST = os.getenv("COACH_DAEMON_HOST", "127.0.0.1")
+COACH_DAEMON_PORT = int(os.getenv("COACH_DAEMON_PORT", "0")) or None  # None = только внутри процесса
+
+# Бюджет тика: при риске превышения необязательная работа отбрасывается (мс)
+TICK_BUDGET_MS = float(os.getenv("TICK_BUDGET_MS", "50"))
+
+# Снимок для тёплого старта (история, маршрут фарма, кэши API); пусто = выключен
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH")
+SNAPSHOT_INTERVAL = float(os.getenv("SNAPSHOT_INTERVAL", "30.0"))
+SNAPSHOT_MAX_AGE = float(os.getenv("SNAPSHOT_MAX_AGE", "900.0"))  # Старше - холодный старт
+
+# Хост нескольких сессий (session_host.py): общий пул и история на игрока
+SESSION_WORKERS = int(os.getenv("SESSION_WORKERS", "4"))
+SESSION_HISTORY_CAPACITY = int(os.getenv("SESSION_HISTORY_CAPACITY", "600"))
+
+# Арбитр советов: не больше N сообщений в минуту; невыпущенный совет устаревает (сек)
+ADVICE_PER_MINUTE = int(os.getenv("ADVICE_PER_MINUTE", "6"))
+ADVICE_MAX_AGE = float(os.getenv("ADVICE_MAX_AGE", "20.0"))
+
+# HTTP-клиент внешних API: пул keep-alive соединений, повторы при 429/5xx
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))   # сек, растёт вдвое с каждой попыткой
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "8.0"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10.0"))
+HTTP_RATE_LIMIT = float(os.getenv("HTTP_RATE_LIMIT", "10"))   # Запросов в секунду на хост (0 = без ограничения)
+HTTP_RATE_BURST = int(os.getenv("HTTP_RATE_BURST", "20"))     # Сколько запросов можно сделать пачкой
+
+# Параллельная загрузка деталей матчей: потоков и запросов в секунду
+# (0 = без своего ограничения; общий лимит хоста HTTP_RATE_LIMIT действует всегда)
+BULK_FETCH_WORKERS = int(os.getenv("BULK_FETCH_WORKERS", "8"))
+BULK_FETCH_RATE = float(os.getenv("BULK_FETCH_RATE", "0"))
+
+# Локальное хранилище матчей (SQLite); пусто = без хранилища
+MATCH_STORE_PATH = os.getenv("MATCH_STORE_PATH", "dota_matches.sqlite3")
+MATCH_HISTORY_MAX_AGE = float(os.getenv("MATCH_HISTORY_MAX_AGE", "600"))  # Старше - запрос в сеть
+MATCH_HISTORY_PAGE_SIZE = int(os.getenv("MATCH_HISTORY_PAGE_SIZE", "100"))  # Строк на страницу (максимум Steam - 100)
+
+# Кэш каталогов героев/предметов на диске; пусто = без кэша
+CATALOG_CACHE_PATH = os.getenv("CATALOG_CACHE_PATH", "dota_catalog.json")
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "86400"))  # Старше - обновляется в фоне
+
+# Холодный старт: сколько компонентов создавать одновременно (1 = последовательно)
+INIT_WORKERS = int(os.getenv("INIT_WORKERS", "4"))
+
+# История состояний: сколько последних тиков хранить (кольцевой буфер)
+HISTORY_CAPACITY = int(os.getenv("HISTORY_CAPACITY", "3600"))
+
+# Фоновый анализ: результаты по состояниям старше этого возраста отбрасываются (сек)
+ANALYSIS_MAX_AGE = float(os.getenv("ANALYSIS_MAX_AGE", "10.0"))
+
 # Game State Monitoring
-HERO_ROLES = {
-    "carry": ["Anti-Mage", "Phantom Assassin", "Juggernaut"],
-    "midlaner": ["Shadow Fiend", "Puck", "Templar Assassin"],
-    "support": ["Crystal Maiden", "Lion", "Rubick"],
-    "offlane": ["Tidehunter", "Centaur", "Dark Seer"],
-}
+def __getattr__(name):
+    # HERO_ROLES читается при обращении: индекс каталога меняется после загрузки API
+    if name == "HERO_ROLES":
+        return get_index().role_table
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Recommendation types
 RECOMMENDATION_TYPES = {
@@ -4,11 +4,19 @@ Dota 2 WebAPI Integration
 Получение реальных данных из официального Steam API
 """
 
-import requests
 import logging
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterable, Iterator, List, Union
 from datetime import datetime
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from http_client import ApiClient, get_client
+from catalog_cache import CatalogCache
+from match_fetcher import BulkMatchFetcher, MatchFetchResult
+from match_store import MatchStore
+from hero_index import CatalogEntry, CatalogIndex, get_index, install_index
+from config import CATALOG_CACHE_PATH, MATCH_STORE_PATH, MATCH_HISTORY_PAGE_SIZE
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,44 +31,199 @@ class Dota2WebAPI:
     STATIC_CDN = "http://cdn.dota2.com/apps/dota2/images"
     MATCH_INTERFACE = f"IDOTA2Match_{APP_ID}"
     ECONOMY_INTERFACE = f"IEconDOTA2_{APP_ID}"
+    # Таймауты эндпоинтов (сек): каталоги большие, остальное - быстрые запросы
+    TIMEOUTS = {
+        "GetMatchDetails": 10,
+        "GetMatchHistory": 10,
+        "GetLiveLeagueGames": 15,
+        "GetTeamInfoByTeamID": 10,
+        "GetHeroes": 15,
+        "GetGameItems": 15,
+        "GetPlayerSummaries": 5,
+    }
+    STORE_BATCH = 50  # Матчей на транзакцию хранилища при пакетной загрузке
+    # Языки каталогов: основной (localized_name) и русский (localized_name_ru)
+    LANGUAGE = "en_us"
+    LANGUAGE_RU = "ru_ru"
     
-    def __init__(self, steam_api_key: str):
+    def __init__(self, steam_api_key: str, static_data: Optional[Dict] = None,
+                 http: Optional[ApiClient] = None, catalog_cache: Optional[CatalogCache] = None,
+                 match_store: Optional[MatchStore] = None):
         """
         Args:
             steam_api_key: Steam API ключ с https://steamcommunity.com/dev/apikey
+            static_data: Сохранённые {"heroes", "items"} (тёплый старт без запросов)
+            http: HTTP-клиент (по умолчанию - общий пул процесса)
+            catalog_cache: Кэш каталогов на диске (по умолчанию - CATALOG_CACHE_PATH)
+            match_store: Хранилище матчей (по умолчанию - MATCH_STORE_PATH)
         """
         self.api_key = steam_api_key
-        self.heroes = {}
-        self.items = {}
+        self.http = http or get_client()
+        self.http.set_timeouts(self.TIMEOUTS)
+        if catalog_cache is None and CATALOG_CACHE_PATH:
+            catalog_cache = CatalogCache(CATALOG_CACHE_PATH)
+        self.catalog_cache = catalog_cache
+        if match_store is None and MATCH_STORE_PATH:
+            match_store = MatchStore(MATCH_STORE_PATH)
+        self.match_store = match_store
+        self.catalog_refresh: Optional[threading.Thread] = None
+        self.heroes = dict((static_data or {}).get('heroes') or {})
+        self.items = dict((static_data or {}).get('items') or {})
+        self.index: CatalogIndex = get_index()
         
-        # Загрузить статические данные
-        self._load_heroes()
-        self._load_items()
+        # Статические данные: снимок, затем кэш на диске, затем API (оба запроса одновременно)
+        if self.heroes and self.items:
+            logger.info(f"✓ Статические данные из снимка: героев {len(self.heroes)}, предметов {len(self.items)}")
+            self._build_index()
+        elif not self._load_cached_catalog():
+            self.load_static_data()
+    
+    def export_static_data(self) -> Dict:
+        """Кэш героев и предметов (для снимка тёплого старта)"""
+        return {'heroes': self.heroes, 'items': self.items}
+    
+    def load_static_data(self) -> bool:
+        """
+        Загрузить героев и предметы параллельно
+        
+        Returns:
+            True, если загружены оба каталога. Иначе индекс и кэш на диске не
+            меняются: устаревшая копия не должна получить новое время загрузки.
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="dota-static") as executor:
+            heroes = executor.submit(self._load_heroes)
+            items = executor.submit(self._load_items)
+            loaded = heroes.result() and items.result()
+        if not loaded:
+            return False
+        self._build_index()
+        if self.catalog_cache:
+            try:
+                self.catalog_cache.save(self.heroes, self.items)
+            except OSError as e:
+                logger.warning(f"⚠️ Кэш каталогов не сохранён: {e}")
+        return True
+    
+    def refresh_catalog_async(self) -> threading.Thread:
+        """Обновить каталоги в фоне (текущие остаются доступны до замены)"""
+        if self.catalog_refresh is None or not self.catalog_refresh.is_alive():
+            self.catalog_refresh = threading.Thread(target=self.load_static_data,
+                                                    name="dota-catalog-refresh", daemon=True)
+            self.catalog_refresh.start()
+        return self.catalog_refresh
+    
+    def _load_cached_catalog(self) -> bool:
+        """Взять каталоги из кэша на диске; устаревшие - использовать и обновить в фоне"""
+        catalog = self.catalog_cache.load() if self.catalog_cache else None
+        if not catalog:
+            return False
+        self.heroes = catalog['heroes']
+        self.items = catalog['items']
+        self._build_index()
+        fresh = self.catalog_cache.is_fresh(catalog)
+        logger.info(f"✓ Каталоги из кэша за {self.catalog_cache.last_load_ms:.1f}мс: "
+                    f"героев {len(self.heroes)}, предметов {len(self.items)}"
+                    f"{'' if fresh else ', устарели - обновление в фоне'}")
+        if not fresh:
+            self.refresh_catalog_async()
+        return True
+    
+    def get_hero(self, key) -> Optional[CatalogEntry]:
+        """Герой по ID, внутреннему или локализованному (en/ru) имени"""
+        return self.index.hero(key)
+    
+    def get_item(self, key) -> Optional[CatalogEntry]:
+        """Предмет по ID, внутреннему или локализованному (en/ru) имени"""
+        return self.index.item(key)
+    
+    def _build_index(self):
+        """Перестроить индекс по текущим каталогам и сделать его общим для процесса"""
+        if not (self.heroes or self.items):
+            return
+        self.index = CatalogIndex.from_catalog(self.heroes, self.items)
+        install_index(self.index)
     
     def get_match_details(self, match_id: int) -> Optional[Dict]:
-        """Получить полные детали матча по ID"""
+        """Получить полные детали матча по ID (сначала из хранилища)"""
         try:
-            params = {
-                'key': self.api_key,
-                'match_id': match_id
-            }
-            url = f"{self.API_URL}/{self.MATCH_INTERFACE}/GetMatchDetails/v1"
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data.get('result'):
-                logger.info(f"✓ Матча {match_id} загружена")
-                return data['result']
-            return None
+            if self.match_store:
+                details = self.match_store.get_match(match_id)
+                if details:
+                    return details
+            details = self.fetch_match_details(match_id)
+            logger.info(f"✓ Матча {match_id} загружена")
+            if self.match_store:
+                self.match_store.upsert_matches([details])
+            return details
         except Exception as e:
             logger.error(f"Ошибка получения матчи: {e}")
             return None
     
+    def fetch_match_details(self, match_id: int) -> Dict:
+        """Детали матча; при ошибке - исключение (для пакетной загрузки)"""
+        params = {
+            'key': self.api_key,
+            'match_id': match_id
+        }
+        url = f"{self.API_URL}/{self.MATCH_INTERFACE}/GetMatchDetails/v1"
+        response = self.http.get(url, params=params)
+        response.raise_for_status()
+        
+        result = response.json().get('result')
+        if not result:
+            raise LookupError(f"пустой ответ для матча {match_id}")
+        if result.get('error'):
+            raise LookupError(result['error'])
+        return result
+    
+    def get_match_details_bulk(self, match_ids: Iterable[int], workers: Optional[int] = None,
+                               rate_limit: Optional[float] = None) -> Iterator[MatchFetchResult]:
+        """
+        Детали многих матчей параллельно, по мере готовности
+        
+        Args:
+            match_ids: ID матчей (например, из get_match_history)
+            workers: Потоков (по умолчанию BULK_FETCH_WORKERS)
+            rate_limit: Запросов в секунду (по умолчанию BULK_FETCH_RATE)
+        
+        Yields:
+            MatchFetchResult: details или error для каждого ID
+        
+        Матчи из хранилища выдаются сразу, без запросов и без ожидания
+        ограничителя частоты; загруженные сохраняются пакетами по STORE_BATCH.
+        """
+        options = {}
+        if workers is not None:
+            options['workers'] = workers
+        if rate_limit is not None:
+            options['rate_limit'] = rate_limit
+        store = self.match_store
+        
+        match_ids = list(dict.fromkeys(match_ids))
+        stored = store.get_matches(match_ids) if store else {}
+        for match_id in match_ids:
+            if match_id in stored:
+                yield MatchFetchResult(match_id, details=stored[match_id])
+        
+        fetcher = BulkMatchFetcher(self.fetch_match_details, **options)
+        batch = []
+        try:
+            for result in fetcher.fetch_all(match_id for match_id in match_ids if match_id not in stored):
+                if store and result.ok:
+                    batch.append(result.details)
+                    if len(batch) >= self.STORE_BATCH:
+                        store.upsert_matches(batch)
+                        batch = []
+                yield result
+        finally:
+            if batch:
+                store.upsert_matches(batch)
+        logger.info(f"✓ Пакетная загрузка матчей: {fetcher.get_stats()}, из хранилища {len(stored)}")
+    
     def get_match_history(self, account_id: int, hero_id: Optional[int] = None, 
                          skill: Optional[int] = None, matches_requested: int = 20) -> Optional[List[Dict]]:
         """
-        Получить историю матчей игрока
+        Получить историю матчей игрока (из хранилища, пока она свежая)
         
         Args:
             account_id: Account ID игрока (32-bit)
@@ -69,35 +232,110 @@ class Dota2WebAPI:
             matches_requested: Кол-во матчей
         """
         try:
-            params = {
-                'key': self.api_key,
-                'account_id': account_id,
-                'matches_requested': matches_requested
-            }
-            if hero_id:
-                params['hero_id'] = hero_id
-            if skill is not None:
-                params['skill'] = skill
-            
-            url = f"{self.API_URL}/{self.MATCH_INTERFACE}/GetMatchHistory/v1"
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data.get('result', {}).get('matches'):
-                logger.info(f"✓ История матчей {account_id} загружена ({len(data['result']['matches'])} матч)")
-                return data['result']['matches']
+            if self.match_store:
+                stored = self.match_store.get_history(account_id, hero_id, skill, matches_requested)
+                if stored:
+                    return stored
+            result = self._fetch_history_page(account_id, hero_id, skill, matches_requested)
+            if result.get('matches'):
+                logger.info(f"✓ История матчей {account_id} загружена ({len(result['matches'])} матч)")
+                if self.match_store:
+                    self.match_store.upsert_history(account_id, result['matches'], hero_id=hero_id,
+                                                    skill=skill, matches_requested=matches_requested)
+                return result['matches']
             return None
         except Exception as e:
             logger.error(f"Ошибка получения истории матчей: {e}")
             return None
     
+    def iter_match_history(self, account_id: int, hero_id: Optional[int] = None,
+                           skill: Optional[int] = None, max_matches: Optional[int] = None,
+                           since: Optional[Union[datetime, int]] = None,
+                           page_size: int = MATCH_HISTORY_PAGE_SIZE) -> Iterator[Dict]:
+        """
+        Вся история матчей игрока, страница за страницей (новые первыми)
+        
+        Пока вызывающий обрабатывает страницу, следующая уже загружается.
+        В памяти не больше двух страниц независимо от длины истории.
+        
+        Args:
+            account_id: Account ID игрока (32-bit)
+            hero_id: (опционально) Фильтр по герою
+            skill: (опционально) Уровень - 0=Any, 1=Normal, 2=High, 3=VeryHigh
+            max_matches: Остановиться после стольких матчей
+            since: Остановиться на первом матче, начатом раньше (datetime или unix-время)
+            page_size: Строк на запрос (не больше 100)
+        
+        Yields:
+            Строки GetMatchHistory
+        
+        Raises:
+            Ошибка загрузки страницы (после повторов HTTP-клиента)
+        """
+        if isinstance(since, datetime):
+            since = int(since.timestamp())
+        page_size = max(1, min(page_size, 100))
+        
+        def fetch_page(start_at_match_id: Optional[int]) -> Dict:
+            return self._fetch_history_page(account_id, hero_id, skill, page_size, start_at_match_id)
+        
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="match-history")
+        page = executor.submit(fetch_page, None)
+        yielded = 0
+        try:
+            while page is not None:
+                result = page.result()
+                rows = result.get('matches') or []
+                if self.match_store and rows:
+                    self.match_store.upsert_history(account_id, rows, hero_id=hero_id, skill=skill,
+                                                    matches_requested=None)
+                
+                # Следующая страница загружается, пока вызывающий разбирает эту
+                page = None
+                last_page = (not rows or result.get('results_remaining', 0) <= 0
+                             or (max_matches is not None and yielded + len(rows) >= max_matches)
+                             or (since is not None and rows[-1].get('start_time', 0) < since))
+                if not last_page:
+                    page = executor.submit(fetch_page, rows[-1]['match_id'] - 1)
+                
+                for row in rows:
+                    if since is not None and row.get('start_time', 0) < since:
+                        return
+                    if max_matches is not None and yielded >= max_matches:
+                        return
+                    yielded += 1
+                    yield row
+        finally:
+            if page is not None:
+                page.cancel()
+            executor.shutdown(wait=False)
+    
+    def _fetch_history_page(self, account_id: int, hero_id: Optional[int], skill: Optional[int],
+                            matches_requested: int, start_at_match_id: Optional[int] = None) -> Dict:
+        """Одна страница GetMatchHistory (result); при ошибке - исключение"""
+        params = {
+            'key': self.api_key,
+            'account_id': account_id,
+            'matches_requested': matches_requested
+        }
+        if hero_id:
+            params['hero_id'] = hero_id
+        if skill is not None:
+            params['skill'] = skill
+        if start_at_match_id is not None:
+            params['start_at_match_id'] = start_at_match_id
+        
+        url = f"{self.API_URL}/{self.MATCH_INTERFACE}/GetMatchHistory/v1"
+        response = self.http.get(url, params=params)
+        response.raise_for_status()
+        return response.json().get('result', {})
+    
     def get_live_league_games(self) -> Optional[List[Dict]]:
         """Получить текущие live матчи лиги"""
         try:
             params = {'key': self.api_key}
             url = f"{self.API_URL}/{self.MATCH_INTERFACE}/GetLiveLeagueGames/v1"
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -120,7 +358,7 @@ class Dota2WebAPI:
                 params['start_at_team_id'] = start_team_id
             
             url = f"{self.API_URL}/{self.MATCH_INTERFACE}/GetTeamInfoByTeamID/v1"
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -146,49 +384,76 @@ class Dota2WebAPI:
         self._load_items()
         return self.items
     
-    def _load_heroes(self):
-        """Загрузить список героев"""
+    def _load_heroes(self) -> bool:
+        """Загрузить список героев (имена на основном языке и на русском); True - загружен"""
         try:
-            params = {'key': self.api_key}
+            params = {'key': self.api_key, 'language': self.LANGUAGE}
             url = f"{self.API_URL}/{self.ECONOMY_INTERFACE}/GetHeroes/v1"
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
             if data.get('result', {}).get('heroes'):
+                # Новый словарь заменяет старый целиком: читатели не видят частичный каталог
+                heroes = {}
                 for hero in data['result']['heroes']:
                     name = hero.get('name', '').replace('npc_dota_hero_', '')
-                    hero['localized_name'] = name
+                    hero.setdefault('localized_name', name)
                     hero['images'] = {
                         'sb': f"{self.STATIC_CDN}/heroes/{name}_sb.png",
                         'lg': f"{self.STATIC_CDN}/heroes/{name}_lg.png",
                         'full': f"{self.STATIC_CDN}/heroes/{name}_full.png",
                     }
-                    self.heroes[name] = hero
+                    heroes[name] = hero
+                self._add_russian_names(url, 'heroes', heroes)
+                self.heroes = heroes
                 logger.info(f"✓ Загружено героев: {len(self.heroes)}")
+                return True
+            logger.warning("⚠️  Пустой список героев")
         except Exception as e:
             logger.warning(f"⚠️  Не удалось загрузить героев: {e}")
+        return False
     
-    def _load_items(self):
-        """Загрузить список предметов"""
+    def _load_items(self) -> bool:
+        """Загрузить список предметов (имена на основном языке и на русском); True - загружен"""
         try:
-            params = {'key': self.api_key}
+            params = {'key': self.api_key, 'language': self.LANGUAGE}
             url = f"{self.API_URL}/{self.ECONOMY_INTERFACE}/GetGameItems/v1"
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
             if data.get('result', {}).get('items'):
+                items = {}
                 for item in data['result']['items']:
                     name = item.get('name', '').replace('item_', '')
-                    item['localized_name'] = name
+                    item.setdefault('localized_name', name)
                     item['images'] = {
                         'lg': f"{self.STATIC_CDN}/items/{name}_lg.png",
                     }
-                    self.items[name] = item
+                    items[name] = item
+                self._add_russian_names(url, 'items', items)
+                self.items = items
                 logger.info(f"✓ Загружено предметов: {len(self.items)}")
+                return True
+            logger.warning("⚠️  Пустой список предметов")
         except Exception as e:
             logger.warning(f"⚠️  Не удалось загрузить предметы: {e}")
+        return False
+    
+    def _add_russian_names(self, url: str, key: str, records: Dict[str, Dict]):
+        """Дополнить каталог русскими именами (localized_name_ru); без них каталог остаётся рабочим"""
+        try:
+            response = self.http.get(url, params={'key': self.api_key, 'language': self.LANGUAGE_RU})
+            response.raise_for_status()
+            names = {row.get('id'): row.get('localized_name')
+                     for row in response.json().get('result', {}).get(key, [])}
+        except Exception as e:
+            logger.warning(f"⚠️  Русские имена ({key}) не загружены: {e}")
+            return
+        for record in records.values():
+            if names.get(record.get('id')):
+                record['localized_name_ru'] = names[record['id']]
     
     def player_summary(self, account_ids: List[int]) -> Dict[int, Dict]:
         """
@@ -201,7 +466,7 @@ class Dota2WebAPI:
                 'steamids': ','.join(str(32 + aid) for aid in account_ids),  # Конвертировать в 64-bit
             }
             url = "http://api.steampowered.com/ISteamUser/GetPlayerSummaries/v0002"
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -217,9 +482,16 @@ class Dota2WebAPI:
 class StratzAPI:
     """Альтернативный API - Stratz (GraphQL)"""
     
-    def __init__(self, api_key: str):
+    TIMEOUTS = {"stratz.graphql": 5}
+    # Бесплатный ключ Stratz ограничен строже Steam WebAPI
+    RATE_LIMITS = {"api.stratz.com": (5, 10)}
+    
+    def __init__(self, api_key: str, http: Optional[ApiClient] = None):
         self.api_key = api_key
         self.base_url = "https://api.stratz.com/graphql"
+        self.http = http or get_client()
+        self.http.set_timeouts(self.TIMEOUTS)
+        self.http.set_rate_limits(self.RATE_LIMITS)
     
     def get_player_profile(self, steam_id: str) -> Optional[Dict]:
         """Получить профиль игрока через Stratz"""
@@ -244,11 +516,11 @@ class StratzAPI:
                 "Content-Type": "application/json"
             }
             
-            response = requests.post(
+            response = self.http.post(
                 self.base_url,
+                endpoint="stratz.graphql",
                 json={"query": query},
-                headers=headers,
-                timeout=5
+                headers=headers
             )
             response.raise_for_status()
             
@@ -270,8 +542,9 @@ class HybridGameAnalyzer:
     иначе использует симуляцию
     """
     
-    def __init__(self, steam_id: Optional[str] = None, use_live: bool = False):
-        self.dota_api = Dota2WebAPI(steam_id=steam_id)
+    def __init__(self, steam_id: Optional[str] = None, use_live: bool = False,
+                 static_data: Optional[Dict] = None):
+        self.dota_api = Dota2WebAPI(steam_id=steam_id, static_data=static_data)
         self.use_live = use_live
         self.fallback = True  # Использовать fallback если API не работает
     
@@ -313,18 +586,8 @@ class HybridGameAnalyzer:
         }
     
     def _get_hero_name(self, hero_id: int) -> str:
-        """Получить имя героя по ID"""
-        # Миниатюрный словарь (в реальности нужна полная база)
-        heroes = {
-            1: "Anti-Mage",
-            2: "Axe",
-            3: "Bane",
-            11: "Shadow Fiend",
-            16: "Tidehunter",
-            20: "Phantom Assassin",
-            # ... и т.д.
-        }
-        return heroes.get(hero_id, f"Hero#{hero_id}")
+        """Получить имя героя по ID (из индекса каталога)"""
+        return get_index().hero_name(hero_id, default=f"Hero#{hero_id}")
     
     def _estimate_level(self, xpm: int, game_time: int) -> int:
         """Оценить уровень по XPM и времени"""
@@ -13,6 +13,8 @@ from enum import Enum
 import tkinter as tk
 from tkinter import font as tkFont
 
+from clock import RealClock
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -41,22 +43,28 @@ class Advice:
 class DotaAdvisor:
     """Текстовый UI помощник для Dota 2"""
     
-    def __init__(self, position: str = "top-right"):
+    def __init__(self, position: str = "top-right", clock=None):
         """
         Инициализировать помощника
         
         Args:
             position: Позиция на экране (top-right, top-left, bottom-right, bottom-left)
+            clock: Часы для длительности показа советов (RealClock по умолчанию)
         """
         self.position = position
+        self.clock = clock or RealClock()
         self.advice_queue: List[Advice] = []
         self.current_advice: Optional[Advice] = None
+        self.advice_expires_at: Optional[float] = None  # Когда скрыть текущий совет
+        self.advice_shown = 0
         self.is_running = False
         self.window: Optional[tk.Tk] = None
         self.label: Optional[tk.Label] = None
         self.icon_label: Optional[tk.Label] = None
         self.priority_label: Optional[tk.Label] = None
         self.hero_label: Optional[tk.Label] = None  # Новое: отображение героя
+        self.status_label: Optional[tk.Label] = None
+        self.status_text = "🔄 Ожидание советов..."  # Строка статуса (прогрев, ожидание)
         
         # Текущий герой
         self.current_hero_name = "Unknown Hero"
@@ -141,6 +149,14 @@ class DotaAdvisor:
 
 
 
+    def set_status(self, text: str):
+        """
+        Установить строку статуса (можно из любого потока)
+        
+        Окно подхватывает её на ближайшем обновлении.
+        """
+        self.status_text = text
+
     def _run_window(self):
         """Основной цикл окна"""
         try:
@@ -251,37 +267,47 @@ class DotaAdvisor:
         footer_frame = tk.Frame(self.window, bg="#0a0a0a")
         footer_frame.pack(fill=tk.X, side=tk.BOTTOM)
         
-        status_label = tk.Label(
+        self.status_label = tk.Label(
             footer_frame,
-            text="🔄 Ожидание советов...",
+            text=self.status_text,
             font=("Arial", 8),
             bg="#0a0a0a",
             fg="#999999"
         )
-        status_label.pack(side=tk.LEFT, padx=5, pady=3)
+        self.status_label.pack(side=tk.LEFT, padx=5, pady=3)
 
     def _update_advice(self):
         """Обновить текущий совет"""
         if not self.is_running:
             return
         
+        self.tick()
+        if self.status_label and self.status_label.cget("text") != self.status_text:
+            self.status_label.config(text=self.status_text)
+        
+        # Продолжить обновление
+        if self.window:
+            self.window.after(500, self._update_advice)
+
+    def tick(self):
+        """
+        Шаг показа советов: скрыть истёкший, показать следующий по приоритету
+        
+        Работает и без окна (например, в ускоренной симуляции матча).
+        """
+        now = self.clock.monotonic()
+        if self.current_advice and self.advice_expires_at is not None and now >= self.advice_expires_at:
+            self._clear_advice_after_delay()
+        
         # Если есть советы в очереди
         if self.advice_queue:
             # Сортировать по приоритету
             self.advice_queue.sort(key=lambda a: a.priority, reverse=True)
             self.current_advice = self.advice_queue.pop(0)
+            self.advice_expires_at = now + self.current_advice.duration
+            self.advice_shown += 1
             
             self._display_advice(self.current_advice)
-            
-            # Запланировать очистку через duration
-            self.window.after(
-                int(self.current_advice.duration * 1000),
-                self._clear_advice_after_delay
-            )
-        
-        # Продолжить обновление
-        if self.window:
-            self.window.after(500, self._update_advice)
 
     def _display_advice(self, advice: Advice):
         """Отобразить совет в окне"""
@@ -305,6 +331,7 @@ class DotaAdvisor:
         if self.label:
             self.label.config(text="")
         self.current_advice = None
+        self.advice_expires_at = None
 
     def _get_color_for_type(self, advisor_type: AdvisorType) -> str:
         """Получить цвет для типа совета"""
@@ -4,7 +4,7 @@
 
 import logging
 import math
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -21,9 +21,9 @@ class FarmingType(Enum):
     ROSHAN = "roshan"       # Рошан
 
 
-@dataclass
+@dataclass(frozen=True)
 class FarmSpot:
-    """Точка фарма - место скопления мобов"""
+    """Точка фарма - место скопления мобов (неизменяема: карта общая для сессий)"""
     name: str                      # Название спота
     position: Tuple[float, float]  # (x, y) координаты на миникарте
     gold_per_minute: float         # Золото в минуту
@@ -36,8 +36,12 @@ class FarmSpot:
 class FarmingOptimizer:
     """Оптимизатор маршрутов фарма"""
     
-    def __init__(self):
-        self.farm_spots = self._initialize_farm_spots()
+    def __init__(self, farm_spots: Optional[Sequence[FarmSpot]] = None):
+        """
+        Args:
+            farm_spots: Готовая карта спотов (общая для нескольких сессий; не изменяется)
+        """
+        self.farm_spots = farm_spots if farm_spots is not None else self._initialize_farm_spots()
         self.hero_position = (500, 500)  # Текущая позиция героя
         self.last_farm_route = None
         self.current_objective = None
@@ -172,6 +176,19 @@ class FarmingOptimizer:
         logger.info(f"📍 Рассчитан маршрут фарма: {[s.name for s in route[:3]]}")
         return route
 
+    def restore_route(self, spot_names: List[str],
+                      hero_position: Tuple[float, float]) -> List[FarmSpot]:
+        """
+        Восстановить маршрут по именам спотов (тёплый старт)
+        
+        Споты, которых больше нет в карте фарма, пропускаются.
+        """
+        spots = {spot.name: spot for spot in self.farm_spots}
+        route = [spots[name] for name in spot_names if name in spots]
+        self.hero_position = hero_position
+        self.last_farm_route = route or None
+        return route
+
     def _optimize_route(self, current_pos: Tuple[float, float],
                        spots: List[FarmSpot]) -> List[FarmSpot]:
         """
@@ -180,7 +197,8 @@ class FarmingOptimizer:
         Использует простую эвристику: ближайший непосещённый спот
         """
         route = []
-        unvisited = spots.copy()
+        efficiency = {}  # Споты могут быть общими для сессий - не изменять их
+        unvisited = list(spots)
         current = current_pos
         
         while unvisited:
@@ -192,15 +210,14 @@ class FarmingOptimizer:
             
             # Рассчитать "эффективность" спота
             distance = self._distance(current, nearest.position)
-            efficiency = (nearest.gold_per_minute / max(distance, 1)) * (1 - nearest.difficulty)
+            efficiency[nearest.name] = (nearest.gold_per_minute / max(distance, 1)) * (1 - nearest.difficulty)
             
-            nearest.efficiency = efficiency
             route.append(nearest)
             unvisited.remove(nearest)
             current = nearest.position
         
         # Сортировать по эффективности
-        route.sort(key=lambda s: s.efficiency, reverse=True)
+        route.sort(key=lambda s: efficiency[s.name], reverse=True)
         
         return route
 
@@ -5,38 +5,77 @@
 
 import logging
 from typing import Optional, Dict, List
-from datetime import datetime
-import psutil
 import random  # НОВОЕ: случайные вариации
 
+from game_state import GameState, HeroTable
+from state_history import StateHistory
+from process_watcher import ProcessWatcher
+from clock import RealClock
+from hero_index import get_index
+from config import HISTORY_CAPACITY, PROCESS_RESCAN_MIN, PROCESS_RESCAN_MAX, GAME_DETECTION_ENABLED
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Неизменяемые данные симуляции - общие для всех тиков
+SIM_SECONDS_PER_GAME_MINUTE = 6.0  # Симуляция идёт быстрее реальной игры
+SIM_HERO_POSITION = (420, 650)
+SIM_EARLY_ITEMS = ("Boots",)
+SIM_LATE_ITEMS = ("Hand of Midas", "Power Treads")
+SIM_ALLY_NAMES = ("Rubick", "Templar Assassin", "Tidehunter", "Shadow Shaman")
+SIM_ALLY_ROLES = ("support", "midlane", "offlane", "support")
+SIM_ALLY_HP = (80, 100, 70, 60)
+SIM_ENEMY_NAMES = ("Phantom Assassin", "Shadow Fiend", "Dark Seer", "Crystal Maiden", "Earthshaker")
+SIM_ENEMY_ROLES = ("carry", "midlane", "offlane", "support", "support")
+
+SIM_EVENT_FIRST_BLOOD = "Ты получил First Blood"
+SIM_EVENT_PEACEFUL = "Идет мирный фарм"
+SIM_EVENT_TELEKINESIS = "Rubick использовал Telekinesis на Shadow Fiend"
+SIM_EVENT_GANK_REPELLED = "Ганк отбит!"
+SIM_EVENT_MAP_CONTROL = "Твоя команда контролирует карту"
+SIM_EVENT_LANE_PRESSURE = "Враги давят на линию"
+
+
+def _last_hits_event(game_state: GameState) -> str:
+    return f"{game_state.hero_name} получил {game_state.last_hits} последних удара"
+
+
 class GameAnalyzer:
-    def __init__(self, process_name: str = "dota2.exe"):
+    def __init__(self, process_name: str = "dota2.exe", clock=None,
+                 detect_process: bool = GAME_DETECTION_ENABLED,
+                 history_capacity: int = HISTORY_CAPACITY):
+        """
+        Args:
+            process_name: Имя процесса игры
+            clock: Часы (RealClock по умолчанию, VirtualClock для ускоренной симуляции)
+            detect_process: False - не искать процесс, считать игру запущенной
+            history_capacity: Сколько последних состояний хранить в истории
+        """
         self.process_name = process_name
+        self.clock = clock or RealClock()
+        self.detect_process = detect_process
         self.is_game_active = False
-        self.game_state_history = []
+        self.process_watcher = ProcessWatcher(process_name, PROCESS_RESCAN_MIN, PROCESS_RESCAN_MAX,
+                                              clock=self.clock.monotonic)
+        self.match_started_at = self.clock.monotonic()  # Отсчёт игрового времени симуляции
+        self.game_state_history = StateHistory(history_capacity)  # Числовые ряды, фиксированный размер
         self.last_update = None
         self.game_time_offset = random.randint(10, 25)  # НОВОЕ: для вариативности
 
     def check_game_running(self) -> bool:
-        """Проверить, запущена ли Dota 2"""
+        """Проверить, запущена ли Dota 2 (процесс закреплён по PID)"""
+        if not self.detect_process:
+            self.is_game_active = True
+            return True
         try:
-            for proc in psutil.process_iter(['name']):
-                if self.process_name.lower() in proc.info['name'].lower():
-                    self.is_game_active = True
-                    logger.info("✓ Dota 2 запущена")
-                    return True
-            self.is_game_active = False
-            logger.warning("✗ Dota 2 не запущена")
-            return False
+            self.is_game_active = self.process_watcher.is_running()
+            return self.is_game_active
         except Exception as e:
             logger.error(f"Ошибка при проверке процесса: {e}")
             return False
 
-    def get_current_game_state(self) -> Optional[Dict]:
+    def get_current_game_state(self) -> Optional[GameState]:
         """
         Получить текущее состояние игры
         
@@ -46,13 +85,18 @@ class GameAnalyzer:
         - Анализ логов игры
         
         Returns:
-            Словарь с состоянием игры или None
+            GameState (читается как словарь) или None
         """
         if not self.check_game_running():
             return None
 
+        return self._simulate_game_state()
+
+    def _simulate_game_state(self) -> GameState:
+        """Сгенерировать очередное состояние симуляции и добавить его в историю"""
         # НОВОЕ: добавить вариативность
-        game_time = self.game_time_offset + len(self.game_state_history) // 6  # растет со временем
+        elapsed = self.clock.monotonic() - self.match_started_at
+        game_time = self.game_time_offset + int(elapsed // SIM_SECONDS_PER_GAME_MINUTE)  # растет со временем
         
         # Случайные вариации параметров
         hp_percent = random.randint(60, 100)
@@ -68,51 +112,54 @@ class GameAnalyzer:
         nearby_enemy_count = random.randint(0, 2)
         
         # Примерное состояние игры (с вариациями!)
-        game_state = {
-            "game_time": game_time,  # Минуты - РАСТЕТ!
-            "hero_name": "Anti-Mage",
-            "hero_position": (420, 650),  # Позиция героя на миникарте
-            "level": min(30, 5 + game_time // 3),  # Уровень растет
-            "hp": hp,
-            "max_hp": max_hp,
-            "gold": gold,
-            "items": ["Hand of Midas", "Power Treads"] if game_time > 10 else ["Boots"],
-            "last_hits": last_hits,
-            "denies": 3,
-            "kills": 0,
-            "deaths": 0,
-            "assists": 2,
-            "nearby_enemy_count": nearby_enemy_count,  # НОВОЕ
+        level_step = game_time // 3
+        team_step = min(level_step, 24)  # Уровни остальных героев не выше 30
+        game_state = GameState(
+            game_time=game_time,  # Минуты - РАСТЕТ!
+            hero_name="Anti-Mage",
+            hero_position=SIM_HERO_POSITION,  # Позиция героя на миникарте
+            level=min(30, 5 + level_step),  # Уровень растет
+            hp=hp,
+            max_hp=max_hp,
+            gold=gold,
+            items=SIM_LATE_ITEMS if game_time > 10 else SIM_EARLY_ITEMS,
+            last_hits=last_hits,
+            denies=3,
+            kills=0,
+            deaths=0,
+            assists=2,
+            nearby_enemy_count=nearby_enemy_count,  # НОВОЕ
             
-            "allies": [
-                {"name": "Rubick", "level": max(5, 4 + game_time // 3), "position": "support", "hp_percent": 80},
-                {"name": "Templar Assassin", "level": max(5, 5 + game_time // 3), "position": "midlane", "hp_percent": 100},
-                {"name": "Tidehunter", "level": max(5, 4 + game_time // 3), "position": "offlane", "hp_percent": 70},
-                {"name": "Shadow Shaman", "level": max(4, 3 + game_time // 3), "position": "support", "hp_percent": 60},
-            ],
+            allies=HeroTable(
+                SIM_ALLY_NAMES, SIM_ALLY_ROLES,
+                levels=(max(5, 4 + team_step), max(5, 5 + team_step),
+                        max(5, 4 + team_step), max(4, 3 + team_step)),
+                hp_percent=SIM_ALLY_HP
+            ),
             
-            "enemies": [
-                {"name": "Phantom Assassin", "level": max(6, 5 + game_time // 3), "position": "carry", "visible": random.choice([True, False])},
-                {"name": "Shadow Fiend", "level": max(7, 6 + game_time // 3), "position": "midlane", "visible": True},
-                {"name": "Dark Seer", "level": max(5, 4 + game_time // 3), "position": "offlane", "visible": random.choice([True, False])},
-                {"name": "Crystal Maiden", "level": max(4, 3 + game_time // 3), "position": "support", "visible": True},
-                {"name": "Earthshaker", "level": max(5, 4 + game_time // 3), "position": "support", "visible": random.choice([True, False])},
-            ],
+            enemies=HeroTable(
+                SIM_ENEMY_NAMES, SIM_ENEMY_ROLES,
+                levels=(max(6, 5 + team_step), max(7, 6 + team_step), max(5, 4 + team_step),
+                        max(4, 3 + team_step), max(5, 4 + team_step)),
+                # Shadow Fiend и Crystal Maiden видны всегда, остальные - случайно
+                visible=(random.getrandbits(1) | 0b10 | random.getrandbits(1) << 2
+                         | 0b1000 | random.getrandbits(1) << 4)
+            ),
             
-            "team_gold": 12500 + (game_time * 800),
-            "enemy_gold": 11800 + (game_time * 750),
-            "recent_events": [
-                "Ты получил First Blood" if game_time < 5 else "Идет мирный фарм",
-                f"Anti-Mage получил {last_hits} последних удара",
-                "Rubick использовал Telekinesis на Shadow Fiend" if random.random() > 0.5 else "Ганк отбит!",
-                "Твоя команда контролирует карту" if random.random() > 0.5 else "Враги давят на линию",
-            ],
+            team_gold=12500 + (game_time * 800),
+            enemy_gold=11800 + (game_time * 750),
+            events=(
+                SIM_EVENT_FIRST_BLOOD if game_time < 5 else SIM_EVENT_PEACEFUL,
+                _last_hits_event,
+                SIM_EVENT_TELEKINESIS if random.random() > 0.5 else SIM_EVENT_GANK_REPELLED,
+                SIM_EVENT_MAP_CONTROL if random.random() > 0.5 else SIM_EVENT_LANE_PRESSURE,
+            ),
             
-            "timestamp": datetime.now().isoformat()
-        }
+            created_at=self.clock.time()
+        )
         
         self.last_update = game_state
-        self.game_state_history.append(game_state)
+        self.game_state_history.append(game_state, game_state.created_at)
         
         logger.debug(f"Game State: Time={game_time}m, Gold={gold}, HP={hp_percent}%, Nearby enemies={nearby_enemy_count}")
         
@@ -153,9 +200,8 @@ class GameAnalyzer:
         if enemy.get('level', 0) > game_state.get('level', 0):
             threat += 0.3
         
-        # Враги с опасными льготами
-        dangerous_heroes = ["Phantom Assassin", "Shadow Fiend", "Earthshaker"]
-        if enemy.get('name') in dangerous_heroes:
+        # Враги с опасными льготами (признак из индекса героев)
+        if get_index().is_dangerous(enemy.get('name')):
             threat += 0.2
         
         return min(threat, 1.0)
@@ -0,0 +1,438 @@
+"""
+Компактная модель состояния игры
+GameState и таблицы героев на __slots__ вместо вложенных словарей на каждый тик.
+Поддерживает доступ как к словарю (get, [], in), поэтому стратеги,
+оптимизатор фарма и тренер работают с ней без изменений.
+"""
+
+import struct
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+_MISSING = object()
+
+
+class HeroSnapshot:
+    """
+    Лёгкое представление одного героя из HeroTable
+
+    Не хранит данных - читает столбцы таблицы. Ведёт себя как словарь
+    {"name", "level", "position", "visible"/"hp_percent"}.
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: 'HeroTable', index: int):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key: str) -> Any:
+        table = self.table
+        if key == 'name':
+            return table.names[self.index]
+        if key == 'level':
+            return table.levels[self.index]
+        if key == 'position':
+            return table.roles[self.index]
+        if key == 'visible' and table.visible is not None:
+            return bool(table.visible >> self.index & 1)
+        if key == 'hp_percent' and table.hp_percent is not None:
+            return table.hp_percent[self.index]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self) -> List[str]:
+        return [key for key in HeroTable.FIELDS if key in self]
+
+    def to_dict(self) -> Dict:
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"HeroSnapshot({self.to_dict()})"
+
+
+class HeroTable:
+    """
+    Столбцовая таблица героев одной команды
+
+    Имена и роли - общие неизменяемые кортежи (не копируются между тиками),
+    уровни и HP - bytes, видимость - битовая маска.
+    """
+    __slots__ = ('names', 'roles', 'levels', 'visible', 'hp_percent')
+
+    FIELDS = ('name', 'level', 'position', 'visible', 'hp_percent')
+
+    def __init__(self, names: Tuple[str, ...], roles: Tuple[str, ...], levels: Iterable[int],
+                 visible: Optional[int] = None, hp_percent: Optional[Iterable[int]] = None):
+        self.names = names
+        self.roles = roles
+        self.levels = bytes(levels)
+        self.visible = visible
+        self.hp_percent = bytes(hp_percent) if hp_percent is not None else None
+
+    @classmethod
+    def from_dicts(cls, heroes: Iterable[Dict]) -> 'HeroTable':
+        """Собрать таблицу из списка словарей старого формата"""
+        heroes = list(heroes)
+        visible = None
+        if any('visible' in h for h in heroes):
+            visible = 0
+            for i, hero in enumerate(heroes):
+                if hero.get('visible'):
+                    visible |= 1 << i
+        hp_percent = None
+        if any('hp_percent' in h for h in heroes):
+            hp_percent = [max(0, min(255, int(h.get('hp_percent', 0)))) for h in heroes]
+        return cls(
+            names=tuple(h.get('name', 'Unknown') for h in heroes),
+            roles=tuple(h.get('position', 'unknown') for h in heroes),
+            levels=[max(0, min(255, int(h.get('level', 0)))) for h in heroes],
+            visible=visible,
+            hp_percent=hp_percent
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[HeroSnapshot]:
+        for i in range(len(self.names)):
+            yield HeroSnapshot(self, i)
+
+    def __getitem__(self, index: int) -> HeroSnapshot:
+        if index < 0:
+            index += len(self.names)
+        if not 0 <= index < len(self.names):
+            raise IndexError(index)
+        return HeroSnapshot(self, index)
+
+    def __bool__(self) -> bool:
+        return bool(self.names)
+
+    def to_list(self) -> List[Dict]:
+        return [hero.to_dict() for hero in self]
+
+
+class TeamRoster:
+    """
+    Неизменяемый состав обеих команд (имена, роли, какие столбцы есть)
+
+    Один и тот же состав переиспользуется всеми состояниями матча.
+    Кэш составов ограничен CACHE_SIZE последними использованными, чтобы
+    долгоживущий процесс не копил составы прошлых матчей.
+    """
+    __slots__ = ('ally_names', 'ally_roles', 'ally_has_hp', 'ally_has_visible',
+                 'enemy_names', 'enemy_roles', 'enemy_has_hp', 'enemy_has_visible', 'record_size')
+
+    CACHE_SIZE = 64
+
+    _cache: 'OrderedDict[tuple, TeamRoster]' = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    def __init__(self, allies: HeroTable, enemies: HeroTable):
+        self.ally_names, self.ally_roles = allies.names, allies.roles
+        self.ally_has_hp = allies.hp_percent is not None
+        self.ally_has_visible = allies.visible is not None
+        self.enemy_names, self.enemy_roles = enemies.names, enemies.roles
+        self.enemy_has_hp = enemies.hp_percent is not None
+        self.enemy_has_visible = enemies.visible is not None
+        self.record_size = (_team_size(len(allies), self.ally_has_hp, self.ally_has_visible)
+                            + _team_size(len(enemies), self.enemy_has_hp, self.enemy_has_visible))
+
+    @classmethod
+    def for_teams(cls, allies: HeroTable, enemies: HeroTable) -> 'TeamRoster':
+        """Найти готовый состав или создать новый"""
+        key = (allies.names, allies.roles, allies.hp_percent is not None, allies.visible is not None,
+               enemies.names, enemies.roles, enemies.hp_percent is not None, enemies.visible is not None)
+        with cls._cache_lock:
+            roster = cls._cache.get(key)
+            if roster is not None:
+                cls._cache.move_to_end(key)
+                return roster
+            roster = cls._cache[key] = cls(allies, enemies)
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return roster
+
+
+def _team_size(count: int, has_hp: bool, has_visible: bool) -> int:
+    """Сколько байт занимает команда в записи: уровни, HP, маска видимости"""
+    return count + (count if has_hp else 0) + (_MASK.size if has_visible else 0)
+
+
+def _pack_team(table: HeroTable) -> bytes:
+    packed = table.levels
+    if table.hp_percent is not None:
+        packed += table.hp_percent
+    if table.visible is not None:
+        packed += _MASK.pack(table.visible)
+    return packed
+
+
+def _unpack_team(record: bytes, offset: int, names: Tuple[str, ...], roles: Tuple[str, ...],
+                 has_hp: bool, has_visible: bool) -> Tuple[HeroTable, int]:
+    count = len(names)
+    levels = record[offset:offset + count]
+    offset += count
+    hp_percent = None
+    if has_hp:
+        hp_percent = record[offset:offset + count]
+        offset += count
+    visible = None
+    if has_visible:
+        visible = _MASK.unpack_from(record, offset)[0]
+        offset += _MASK.size
+    return HeroTable(names, roles, levels, visible, hp_percent), offset
+
+
+# Числовые поля упакованы в одну запись bytes: (имя, формат struct)
+_SCALAR_FIELDS = (
+    ('game_time', 'i'), ('level', 'H'), ('hp', 'i'), ('max_hp', 'i'), ('gold', 'i'),
+    ('last_hits', 'i'), ('denies', 'i'), ('kills', 'H'), ('deaths', 'H'), ('assists', 'H'),
+    ('nearby_enemy_count', 'B'), ('team_gold', 'i'), ('enemy_gold', 'i'), ('created_at', 'd'),
+)
+_SCALARS = struct.Struct('<' + ''.join(fmt for _, fmt in _SCALAR_FIELDS))
+_SCALAR_INDEX = {name: i for i, (name, _) in enumerate(_SCALAR_FIELDS)}
+_MASK = struct.Struct('<I')
+
+# Допустимые значения целых форматов: больше/меньше - прижимаются к границе
+_FORMAT_RANGES = {'B': (0, 0xFF), 'H': (0, 0xFFFF), 'i': (-2 ** 31, 2 ** 31 - 1)}
+
+
+def _fit(fmt: str, value: Any) -> Any:
+    """Привести значение к формату поля (дробные - к целому, вне диапазона - к границе)"""
+    if fmt == 'd':
+        return float(value or 0.0)
+    low, high = _FORMAT_RANGES[fmt]
+    return min(high, max(low, int(value or 0)))
+
+
+def _pack_scalars(values: Tuple) -> bytes:
+    try:
+        return _SCALARS.pack(*values)
+    except struct.error:
+        # Редкий случай (дробное или слишком большое значение) - не замедляет обычный тик
+        return _SCALARS.pack(*(_fit(fmt, value) for (_, fmt), value in zip(_SCALAR_FIELDS, values)))
+
+
+def _scalar_offsets() -> Dict[str, Tuple[struct.Struct, int, str]]:
+    offsets, position = {}, 0
+    for name, fmt in _SCALAR_FIELDS:
+        field_struct = struct.Struct('<' + fmt)
+        offsets[name] = (field_struct, position, fmt)
+        position += field_struct.size
+    return offsets
+
+
+_SCALAR_OFFSETS = _scalar_offsets()
+
+
+def _scalar_property(name: str) -> property:
+    field_struct, offset, fmt = _SCALAR_OFFSETS[name]
+
+    def fget(self: 'GameState'):
+        return field_struct.unpack_from(self._record, offset)[0]
+
+    def fset(self: 'GameState', value):
+        try:
+            field_struct.pack_into(self._record, offset, value)
+        except struct.error:
+            field_struct.pack_into(self._record, offset, _fit(fmt, value))
+
+    return property(fget, fset)
+
+
+class GameState:
+    """
+    Состояние игры на одном тике
+
+    Числовые поля и уровни героев упакованы в одну запись bytes, имена и
+    роли героев лежат в общем TeamRoster. recent_events и timestamp
+    вычисляются при обращении. Необязательные поля источника (например gpm
+    из GSI) лежат в extra. Таблицы команд распаковываются из записи при
+    первом обращении и запоминаются до замены состава.
+    """
+    __slots__ = ('hero_name', 'hero_position', 'items', 'roster', 'events', 'extra', '_record', '_tables')
+
+    # Порядок ключей как в прежнем словаре game_state
+    KEYS = (
+        'game_time', 'hero_name', 'hero_position', 'level', 'hp', 'max_hp', 'gold',
+        'items', 'last_hits', 'denies', 'kills', 'deaths', 'assists',
+        'nearby_enemy_count', 'allies', 'enemies', 'team_gold', 'enemy_gold',
+        'recent_events', 'timestamp'
+    )
+
+    game_time = _scalar_property('game_time')
+    level = _scalar_property('level')
+    hp = _scalar_property('hp')
+    max_hp = _scalar_property('max_hp')
+    gold = _scalar_property('gold')
+    last_hits = _scalar_property('last_hits')
+    denies = _scalar_property('denies')
+    kills = _scalar_property('kills')
+    deaths = _scalar_property('deaths')
+    assists = _scalar_property('assists')
+    nearby_enemy_count = _scalar_property('nearby_enemy_count')
+    team_gold = _scalar_property('team_gold')
+    enemy_gold = _scalar_property('enemy_gold')
+    created_at = _scalar_property('created_at')
+
+    def __init__(self, game_time: int = 0, hero_name: str = "", hero_position: Tuple = (500, 500),
+                 level: int = 1, hp: int = 0, max_hp: int = 1, gold: int = 0,
+                 items: Tuple[str, ...] = (), last_hits: int = 0, denies: int = 0,
+                 kills: int = 0, deaths: int = 0, assists: int = 0, nearby_enemy_count: int = 0,
+                 allies: Optional[HeroTable] = None, enemies: Optional[HeroTable] = None,
+                 team_gold: int = 0, enemy_gold: int = 0, created_at: float = 0.0,
+                 events: Any = (), extra: Optional[Dict] = None):
+        allies = allies if allies is not None else EMPTY_TEAM
+        enemies = enemies if enemies is not None else EMPTY_TEAM
+        self.hero_name = hero_name
+        self.hero_position = hero_position
+        self.items = items
+        self.roster = TeamRoster.for_teams(allies, enemies)
+        self.events = events
+        self.extra = extra
+        self._tables = None
+        self._record = bytearray(_pack_scalars((
+            game_time, level, hp, max_hp, gold, last_hits, denies, kills, deaths, assists,
+            nearby_enemy_count, team_gold, enemy_gold, created_at
+        )) + _pack_team(allies) + _pack_team(enemies))
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'GameState':
+        """Преобразовать словарь game_state (например из GSI) в GameState"""
+        known = {key: data[key] for key in _FIELD_KEYS if key in data}
+        if 'allies' in known:
+            known['allies'] = HeroTable.from_dicts(known['allies'])
+        if 'enemies' in known:
+            known['enemies'] = HeroTable.from_dicts(known['enemies'])
+        if 'items' in known:
+            known['items'] = tuple(known['items'])
+        if 'recent_events' in data:
+            known['events'] = tuple(data['recent_events'])
+        if 'timestamp' in data:
+            try:
+                known['created_at'] = datetime.fromisoformat(data['timestamp']).timestamp()
+            except (TypeError, ValueError):
+                pass
+        extra = {key: value for key, value in data.items()
+                 if key not in _ALL_KEYS and key not in _FIELD_KEYS}
+        return cls(extra=extra or None, **known)
+
+    @property
+    def allies(self) -> HeroTable:
+        return self._teams()[0]
+
+    @allies.setter
+    def allies(self, table: HeroTable):
+        self._set_teams(table, self.enemies)
+
+    @property
+    def enemies(self) -> HeroTable:
+        return self._teams()[1]
+
+    @enemies.setter
+    def enemies(self, table: HeroTable):
+        self._set_teams(self.allies, table)
+
+    def scalars(self, names: Iterable[str]) -> List[Any]:
+        """Несколько числовых полей одной распаковкой записи (для StateHistory)"""
+        values = _SCALARS.unpack_from(self._record)
+        return [values[_SCALAR_INDEX[name]] for name in names]
+
+    def _teams(self) -> Tuple[HeroTable, HeroTable]:
+        """Таблицы команд (распаковываются из записи один раз)"""
+        if self._tables is None:
+            self._tables = self._unpack_teams()
+        return self._tables
+
+    def _unpack_teams(self) -> Tuple[HeroTable, HeroTable]:
+        """Восстановить таблицы команд из записи"""
+        roster = self.roster
+        allies, offset = _unpack_team(self._record, _SCALARS.size, roster.ally_names, roster.ally_roles,
+                                      roster.ally_has_hp, roster.ally_has_visible)
+        enemies, _ = _unpack_team(self._record, offset, roster.enemy_names, roster.enemy_roles,
+                                  roster.enemy_has_hp, roster.enemy_has_visible)
+        return allies, enemies
+
+    def _set_teams(self, allies: HeroTable, enemies: HeroTable):
+        self.roster = TeamRoster.for_teams(allies, enemies)
+        self._record = self._record[:_SCALARS.size] + _pack_team(allies) + _pack_team(enemies)
+        self._tables = None
+
+    @property
+    def recent_events(self) -> List[str]:
+        # Элемент events - строка или функция от состояния (текст собирается по требованию)
+        return [event(self) if callable(event) else event for event in self.events]
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.created_at).isoformat()
+
+    # --- Доступ как к словарю ---
+    # (метода items() нет: это имя занято полем предметов; используйте to_dict())
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _ALL_KEYS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: str, value: Any):
+        if key in _FIELD_KEYS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in _ALL_KEYS or bool(self.extra and key in self.extra)
+
+    def keys(self) -> List[str]:
+        return list(self.KEYS) + (list(self.extra) if self.extra else [])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.KEYS) + (len(self.extra) if self.extra else 0)
+
+    def to_dict(self) -> Dict:
+        """Полный словарь старого формата (для JSON, логов и т.п.)"""
+        data = {}
+        for key in self.keys():
+            value = self[key]
+            if isinstance(value, HeroTable):
+                value = value.to_list()
+            elif isinstance(value, tuple) and key == 'items':
+                value = list(value)
+            data[key] = value
+        return data
+
+    def __repr__(self) -> str:
+        return (f"GameState(game_time={self.game_time}, hero={self.hero_name!r}, "
+                f"level={self.level}, gold={self.gold}, hp={self.hp}/{self.max_hp})")
+
+
+# Поля, которые можно задать в конструкторе / через []
+_FIELD_KEYS = frozenset(GameState.KEYS) - {'recent_events', 'timestamp'} | {'created_at', 'events'}
+_ALL_KEYS = frozenset(GameState.KEYS)
+
+EMPTY_TEAM = HeroTable((), (), ())
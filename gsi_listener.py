@@ -0,0 +1,357 @@
+"""
+Dota 2 Game State Integration (GSI)
+Локальный HTTP-сервер принимает JSON, который клиент Dota 2 сам отправляет
+при каждом изменении состояния, и превращает его в привычный game_state
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from game_integration import GameAnalyzer
+from game_state import GameState
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Размер карты Dota 2 в мировых координатах и масштаб миникарты,
+# в котором работают FarmingOptimizer и OverlayRenderer
+WORLD_MIN = -8192
+WORLD_SIZE = 16384
+MINIMAP_SIZE = 1024
+
+# Враг считается "рядом", если ближе этого расстояния (мировые единицы)
+NEARBY_RADIUS = 1500
+
+TEAM_NAMES = {"radiant": 2, "dire": 3}
+
+
+def world_to_minimap(x: float, y: float) -> Tuple[int, int]:
+    """Перевести мировые координаты в координаты миникарты (y вниз)"""
+    mx = (x - WORLD_MIN) / WORLD_SIZE * MINIMAP_SIZE
+    my = (WORLD_MIN + WORLD_SIZE - y) / WORLD_SIZE * MINIMAP_SIZE
+    return int(mx), int(my)
+
+
+def humanize_name(internal_name: str, prefix: str) -> str:
+    """npc_dota_hero_shadow_shaman -> Shadow Shaman"""
+    name = internal_name[len(prefix):] if internal_name.startswith(prefix) else internal_name
+    return name.replace('_', ' ').title()
+
+
+def normalize_gsi_payload(payload: Dict, previous: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    Преобразовать GSI JSON в формат game_state
+
+    Args:
+        payload: Тело запроса от клиента Dota 2
+        previous: Предыдущее нормализованное состояние (для событий)
+
+    Returns:
+        Словарь game_state или None, если игрок не в матче
+    """
+    hero = payload.get('hero') or {}
+    player = payload.get('player') or {}
+    game_map = payload.get('map') or {}
+
+    if not hero.get('name') or not game_map:
+        return None
+
+    hero_x, hero_y = hero.get('xpos', 0), hero.get('ypos', 0)
+    clock_time = game_map.get('clock_time', game_map.get('game_time', 0)) or 0
+
+    items = []
+    for slot in range(6):
+        item = (payload.get('items') or {}).get(f'slot{slot}') or {}
+        item_name = item.get('name', 'empty')
+        if item_name != 'empty':
+            items.append(humanize_name(item_name, 'item_'))
+
+    enemies = _visible_enemies(payload, player.get('team_name'))
+    nearby_enemy_count = sum(
+        1 for enemy in enemies
+        if math.hypot(enemy['world_position'][0] - hero_x,
+                      enemy['world_position'][1] - hero_y) <= NEARBY_RADIUS
+    )
+
+    game_state = {
+        "game_time": max(0, int(clock_time) // 60),
+        "hero_name": humanize_name(hero['name'], 'npc_dota_hero_'),
+        "hero_position": world_to_minimap(hero_x, hero_y),
+        "level": hero.get('level', 1),
+        "hp": hero.get('health', 0),
+        "max_hp": hero.get('max_health', 1) or 1,
+        "gold": player.get('gold', 0),
+        "items": items,
+        "last_hits": player.get('last_hits', 0),
+        "denies": player.get('denies', 0),
+        "kills": player.get('kills', 0),
+        "deaths": player.get('deaths', 0),
+        "assists": player.get('assists', 0),
+        "nearby_enemy_count": nearby_enemy_count,
+        "allies": [],  # Клиент игрока не присылает данных о союзниках
+        "enemies": enemies,
+        "recent_events": _derive_events(payload, previous),
+        "gpm": player.get('gpm', 0),
+        "xpm": player.get('xpm', 0),
+        "hero_alive": hero.get('alive', True),
+        "match_id": game_map.get('matchid'),
+        "source": "gsi",
+        "timestamp": datetime.now().isoformat()
+    }
+    return game_state
+
+
+def _visible_enemies(payload: Dict, team_name: Optional[str]) -> List[Dict]:
+    """Вражеские герои, видимые на миникарте (компонент minimap)"""
+    own_team = TEAM_NAMES.get(team_name)
+    enemies = []
+    for unit in (payload.get('minimap') or {}).values():
+        unit_name = unit.get('unitname', '')
+        if not unit_name.startswith('npc_dota_hero_'):
+            continue
+        if own_team is None or unit.get('team') == own_team:
+            continue
+        x, y = unit.get('xpos', 0), unit.get('ypos', 0)
+        enemies.append({
+            "name": humanize_name(unit_name, 'npc_dota_hero_'),
+            "level": 0,  # GSI игрока не сообщает уровни врагов
+            "position": world_to_minimap(x, y),
+            "world_position": (x, y),
+            "visible": True,
+        })
+    return enemies
+
+
+def _derive_events(payload: Dict, previous: Optional[Dict]) -> List[str]:
+    """Составить список событий по изменению счётчиков"""
+    events = []
+    player = payload.get('player') or {}
+    hero = payload.get('hero') or {}
+
+    if previous:
+        if player.get('kills', 0) > previous.get('kills', 0):
+            events.append("Ты совершил убийство")
+        if player.get('deaths', 0) > previous.get('deaths', 0):
+            events.append("Ты погиб")
+        if hero.get('level', 0) > previous.get('level', 0):
+            events.append(f"Новый уровень: {hero.get('level')}")
+
+    for event in payload.get('events') or []:
+        event_type = event.get('event_type')
+        if event_type:
+            events.append(event_type.replace('_', ' '))
+
+    return events
+
+
+def build_gsi_config(uri: str, token: str = "", heartbeat: float = 5.0) -> str:
+    """
+    Текст файла gamestate_integration_coach.cfg для папки
+    steamapps/common/dota 2 beta/game/dota/cfg/gamestate_integration/
+    """
+    auth = f'\n    "auth"\n    {{\n        "token" "{token}"\n    }}' if token else ""
+    return f'''"Dota Coach"
+{{
+    "uri" "{uri}"
+    "timeout" "5.0"
+    "buffer" "0.1"
+    "throttle" "0.1"
+    "heartbeat" "{heartbeat}"{auth}
+    "data"
+    {{
+        "provider" "1"
+        "map" "1"
+        "player" "1"
+        "hero" "1"
+        "abilities" "1"
+        "items" "1"
+        "events" "1"
+        "minimap" "1"
+    }}
+}}
+'''
+
+
+class GSIListener:
+    """HTTP-сервер, принимающий push-обновления от клиента Dota 2"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 3000, auth_token: str = "",
+                 record_path: Optional[str] = None):
+        """
+        Args:
+            host: Адрес для прослушивания
+            port: Порт (0 = выбрать свободный)
+            auth_token: Ожидаемый токен из секции auth конфига GSI
+            record_path: Если задан, каждое обновление дописывается в файл (JSON lines)
+                для последующего воспроизведения через gsi_replay.py
+        """
+        self.host = host
+        self.port = port
+        self.auth_token = auth_token
+        self.record_path = record_path
+        self._record_started: Optional[float] = None
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+        self.latest_payload: Optional[Dict] = None
+        self.latest_state: Optional[Dict] = None
+        self.last_push_time: Optional[float] = None  # monotonic
+        self.push_count = 0
+        self.rejected_count = 0
+        self._callbacks: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+
+    def on_update(self, callback: Callable[[Dict], None]):
+        """Подписаться на новые состояния (вызывается из потока сервера)"""
+        self._callbacks.append(callback)
+
+    def start(self):
+        """Запустить сервер в фоновом потоке"""
+        if self.server:
+            return
+        listener = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    if length < 0:
+                        raise ValueError(f"Content-Length {length}")
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                    if not isinstance(payload, dict):
+                        raise ValueError(f"ожидался JSON-объект, получен {type(payload).__name__}")
+                except ValueError:
+                    self.send_response(400)
+                    self.end_headers()
+                    return
+                status = 200 if listener.handle_payload(payload) else 403
+                self.send_response(status)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                logger.debug(f"GSI: {format % args}")
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"📡 GSI слушает http://{self.host}:{self.port}/")
+
+    def stop(self):
+        """Остановить сервер"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            logger.info("⏹️ GSI остановлен")
+
+    def handle_payload(self, payload: Dict) -> bool:
+        """
+        Обработать одно push-обновление
+
+        Returns:
+            False если токен не совпал
+        """
+        if self.auth_token:
+            token = (payload.get('auth') or {}).get('token')
+            if token != self.auth_token:
+                self.rejected_count += 1
+                logger.warning("⚠️ GSI: неверный токен, обновление отклонено")
+                return False
+
+        with self._lock:
+            if self.record_path:
+                self._record(payload)
+            state = normalize_gsi_payload(payload, self.latest_payload_summary())
+            self.latest_payload = payload
+            self.last_push_time = time.monotonic()
+            self.push_count += 1
+            self.latest_state = state
+
+        if state is not None:
+            for callback in self._callbacks:
+                try:
+                    callback(state)
+                except Exception as e:
+                    logger.error(f"Ошибка обработчика GSI: {e}")
+        return True
+
+    def _record(self, payload: Dict):
+        """Дописать обновление в файл записи вместе со смещением по времени"""
+        now = time.monotonic()
+        if self._record_started is None:
+            self._record_started = now
+        try:
+            with open(self.record_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({"t": round(now - self._record_started, 3), "payload": payload},
+                                   ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"⚠️ Не удалось записать GSI: {e}")
+
+    def latest_payload_summary(self) -> Optional[Dict]:
+        """Счётчики прошлого обновления для вычисления событий"""
+        if not self.latest_payload:
+            return None
+        player = self.latest_payload.get('player') or {}
+        hero = self.latest_payload.get('hero') or {}
+        return {
+            "kills": player.get('kills', 0),
+            "deaths": player.get('deaths', 0),
+            "level": hero.get('level', 0),
+        }
+
+    def seconds_since_push(self) -> Optional[float]:
+        if self.last_push_time is None:
+            return None
+        return time.monotonic() - self.last_push_time
+
+
+class GSIGameAnalyzer(GameAnalyzer):
+    """
+    Анализатор, получающий состояние из GSI вместо симуляции
+
+    Интерфейс совпадает с GameAnalyzer, поэтому DotaCoach работает без изменений.
+    """
+
+    def __init__(self, listener: GSIListener, stale_after: float = 15.0,
+                 process_name: str = "dota2.exe"):
+        super().__init__(process_name=process_name)
+        self.listener = listener
+        self.stale_after = stale_after
+        self._last_seen_push = 0
+
+    def check_game_running(self) -> bool:
+        """Игра считается запущенной, если недавно было push-обновление"""
+        age = self.listener.seconds_since_push()
+        if age is not None and age <= self.stale_after:
+            self.is_game_active = True
+            return True
+        return super().check_game_running()
+
+    def get_current_game_state(self) -> Optional[GameState]:
+        """Последнее состояние из GSI (None если данных нет или они устарели)"""
+        age = self.listener.seconds_since_push()
+        if age is None or age > self.stale_after:
+            return None
+
+        if self.listener.push_count != self._last_seen_push:
+            self._last_seen_push = self.listener.push_count
+            latest = self.listener.latest_state
+            if latest is None:
+                self.last_update = None
+                return None
+            game_state = GameState.from_dict(latest)
+            # Новый матч - старая история больше не относится к делу
+            previous_match = self.last_update.get('match_id') if self.last_update else None
+            if previous_match and game_state.get('match_id') != previous_match:
+                self.game_state_history.clear()
+            self.last_update = game_state
+            self.game_state_history.append(game_state, game_state.created_at)
+
+        return self.last_update
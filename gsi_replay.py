@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Воспроизведение записанных GSI-обновлений
+Отправляет payload'ы из файла (JSON lines, как пишет GSIListener с record_path)
+на локальный слушатель - позволяет проверить тренера без запущенной Dota 2
+
+Пример:
+    python gsi_replay.py session.jsonl --url http://127.0.0.1:3000/ --speed 10
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Dict, Iterator, Tuple
+
+import requests
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def read_recording(path: str) -> Iterator[Tuple[float, Dict]]:
+    """
+    Прочитать запись
+
+    Поддерживаются строки вида {"t": 1.5, "payload": {...}} и "сырые" payload'ы
+    (тогда между ними выдерживается 1 секунда).
+    """
+    with open(path, encoding='utf-8') as f:
+        for index, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if 'payload' in entry:
+                yield float(entry.get('t', index)), entry['payload']
+            else:
+                yield float(index), entry
+
+
+def replay(path: str, url: str, speed: float = 1.0, token: str = "") -> int:
+    """
+    Отправить все обновления из файла
+
+    Args:
+        path: Файл записи
+        url: Адрес слушателя GSI
+        speed: Ускорение (0 = без пауз)
+        token: Подставить токен auth в каждый payload
+
+    Returns:
+        Количество отправленных обновлений
+    """
+    session = requests.Session()
+    started = time.monotonic()
+    sent = 0
+
+    for offset, payload in read_recording(path):
+        if speed > 0:
+            delay = offset / speed - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+        if token:
+            payload = dict(payload, auth={"token": token})
+
+        response = session.post(url, json=payload, timeout=5)
+        if response.status_code != 200:
+            logger.warning(f"⚠️ Обновление {sent} отклонено: HTTP {response.status_code}")
+        sent += 1
+
+    elapsed = time.monotonic() - started
+    logger.info(f"✓ Отправлено {sent} обновлений за {elapsed:.1f}с")
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Воспроизвести запись Dota 2 GSI")
+    parser.add_argument("recording", help="Файл записи (JSON lines)")
+    parser.add_argument("--url", default="http://127.0.0.1:3000/", help="Адрес слушателя GSI")
+    parser.add_argument("--speed", type=float, default=1.0, help="Ускорение (0 = максимально быстро)")
+    parser.add_argument("--token", default="", help="Токен auth")
+    args = parser.parse_args()
+
+    try:
+        replay(args.recording, args.url, speed=args.speed, token=args.token)
+    except requests.exceptions.ConnectionError:
+        logger.error(f"❌ Слушатель GSI недоступен по адресу {args.url}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Индекс героев и предметов
+Один неизменяемый индекс по каталогам GetHeroes/GetGameItems: запись по ID,
+по внутреннему имени (npc_dota_hero_antimage, antimage) и по
+локализованному имени (английскому и русскому) - за O(1). Имена
+сравниваются без учёта регистра, пробелов и дефисов, поэтому "Anti-Mage",
+"Antimage" (GSI) и "npc_dota_hero_antimage" - один герой.
+
+Пока каталог API не загружен, действует базовый индекс - герои, о которых
+знают правила тренера. Роли и признак опасности есть только в базовой
+таблице (в каталоге API их нет) и переносятся в индекс каталога по ID.
+Русские имена приходят из каталога (запрос с language=ru_ru); в базовой
+таблице их нет.
+"""
+
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HERO_PREFIX = "npc_dota_hero_"
+ITEM_PREFIX = "item_"
+
+ROLES = ("carry", "midlaner", "support", "offlane")
+
+# (ID, внутреннее имя без префикса, английское имя, роли, опасен)
+BASE_HEROES = (
+    (1, "antimage", "Anti-Mage", ("carry",), False),
+    (2, "axe", "Axe", (), False),
+    (3, "bane", "Bane", (), False),
+    (5, "crystal_maiden", "Crystal Maiden", ("support",), False),
+    (6, "drow_ranger", "Drow Ranger", ("carry",), False),
+    (7, "earthshaker", "Earthshaker", (), True),
+    (8, "juggernaut", "Juggernaut", ("carry",), False),
+    (11, "nevermore", "Shadow Fiend", ("midlaner",), True),
+    (13, "puck", "Puck", ("midlaner",), False),
+    (17, "storm_spirit", "Storm Spirit", ("midlaner",), False),
+    (26, "lion", "Lion", ("support",), False),
+    (27, "shadow_shaman", "Shadow Shaman", ("support",), False),
+    (29, "tidehunter", "Tidehunter", ("offlane",), False),
+    (44, "phantom_assassin", "Phantom Assassin", ("carry",), True),
+    (46, "templar_assassin", "Templar Assassin", ("midlaner",), False),
+    (55, "dark_seer", "Dark Seer", ("offlane",), False),
+    (86, "rubick", "Rubick", ("support",), False),
+    (96, "centaur", "Centaur Warrunner", ("offlane",), False),
+    (108, "abyssal_underlord", "Underlord", ("offlane",), False),
+)
+
+
+def normalize_name(name: str) -> str:
+    """"npc_dota_hero_anti_mage", "Anti-Mage", "anti mage" -> "antimage\""""
+    name = name.lower()
+    for prefix in (HERO_PREFIX, ITEM_PREFIX):
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    return "".join(char for char in name if char.isalnum())
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Герой или предмет"""
+    id: int
+    internal_name: str          # npc_dota_hero_antimage / item_blink
+    name_en: str
+    name_ru: str
+    roles: Tuple[str, ...] = ()
+    dangerous: bool = False
+
+    @property
+    def short_name(self) -> str:
+        """Ключ каталога Dota2WebAPI (antimage / blink)"""
+        for prefix in (HERO_PREFIX, ITEM_PREFIX):
+            if self.internal_name.startswith(prefix):
+                return self.internal_name[len(prefix):]
+        return self.internal_name
+
+
+Key = Union[int, str]
+
+
+class _Lookup:
+    """Таблицы одного вида записей: по ID и по нормализованному имени"""
+
+    __slots__ = ('by_id', 'by_name')
+
+    def __init__(self, entries: Iterable[CatalogEntry]):
+        by_id: Dict[int, CatalogEntry] = {}
+        by_name: Dict[str, CatalogEntry] = {}
+        for entry in entries:
+            by_id[entry.id] = entry
+            for name in (entry.internal_name, entry.name_en, entry.name_ru):
+                if name:
+                    by_name.setdefault(normalize_name(name), entry)
+        self.by_id: Mapping[int, CatalogEntry] = MappingProxyType(by_id)
+        self.by_name: Mapping[str, CatalogEntry] = MappingProxyType(by_name)
+
+    def get(self, key: Optional[Key]) -> Optional[CatalogEntry]:
+        if key is None:
+            return None
+        if isinstance(key, int) or (isinstance(key, str) and key.isdigit()):
+            return self.by_id.get(int(key))
+        return self.by_name.get(normalize_name(key))
+
+
+class CatalogIndex:
+    """
+    Неизменяемый индекс героев и предметов
+
+    Таблица ролей role_table ({"carry": ("Anti-Mage", ...)}) строится из
+    записей и общая для стратега, конфигурации и хоста сессий.
+    """
+
+    def __init__(self, heroes: Iterable[CatalogEntry], items: Iterable[CatalogEntry] = ()):
+        heroes = tuple(heroes)
+        self._heroes = _Lookup(heroes)
+        self._items = _Lookup(items)
+        self.role_table: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+            role: tuple(entry.name_en for entry in heroes if role in entry.roles) for role in ROLES
+        })
+
+    @classmethod
+    def from_catalog(cls, heroes: Mapping[str, Dict], items: Mapping[str, Dict],
+                     base: Optional['CatalogIndex'] = None) -> 'CatalogIndex':
+        """
+        Индекс по каталогам Dota2WebAPI (heroes/items по короткому имени)
+
+        Роли и признак опасности берутся из base (по умолчанию - базовый
+        индекс); герои базы, которых нет в каталоге, сохраняются.
+        """
+        base = base or BASE_INDEX
+        hero_entries = {}
+        for short_name, hero in heroes.items():
+            if hero.get('id') is None:
+                continue
+            known = base.hero(hero['id'])
+            hero_entries[hero['id']] = cls._entry(hero, short_name, HERO_PREFIX, known)
+        for entry in base.heroes:
+            hero_entries.setdefault(entry.id, entry)
+
+        item_entries = [cls._entry(item, short_name, ITEM_PREFIX, base.item(item['id']))
+                        for short_name, item in items.items() if item.get('id') is not None]
+        return cls(hero_entries.values(), item_entries)
+
+    @staticmethod
+    def _entry(record: Dict, short_name: str, prefix: str, known: Optional[CatalogEntry]) -> CatalogEntry:
+        # Старые каталоги хранили в localized_name короткое имя - тогда лучше имя из базы
+        name_en = record.get('localized_name') or short_name
+        if name_en == short_name:
+            name_en = known.name_en if known else short_name.replace('_', ' ').title()
+        return CatalogEntry(
+            id=record['id'],
+            internal_name=record.get('name') or f"{prefix}{short_name}",
+            name_en=name_en,
+            name_ru=record.get('localized_name_ru') or (known.name_ru if known else name_en),
+            roles=known.roles if known else (),
+            dangerous=known.dangerous if known else False,
+        )
+
+    # --- Поиск ---
+
+    def hero(self, key: Optional[Key]) -> Optional[CatalogEntry]:
+        """Герой по ID, внутреннему или локализованному имени"""
+        return self._heroes.get(key)
+
+    def item(self, key: Optional[Key]) -> Optional[CatalogEntry]:
+        """Предмет по ID, внутреннему или локализованному имени"""
+        return self._items.get(key)
+
+    def hero_name(self, key: Optional[Key], default: Optional[str] = None) -> Optional[str]:
+        """Английское имя героя (как в game_state)"""
+        entry = self.hero(key)
+        return entry.name_en if entry else default
+
+    def has_role(self, hero: Optional[Key], role: str) -> bool:
+        entry = self.hero(hero)
+        return entry is not None and role in entry.roles
+
+    def is_dangerous(self, hero: Optional[Key]) -> bool:
+        entry = self.hero(hero)
+        return entry is not None and entry.dangerous
+
+    @property
+    def heroes(self) -> Tuple[CatalogEntry, ...]:
+        return tuple(self._heroes.by_id.values())
+
+    @property
+    def items(self) -> Tuple[CatalogEntry, ...]:
+        return tuple(self._items.by_id.values())
+
+    def __repr__(self):
+        return f"CatalogIndex(heroes={len(self._heroes.by_id)}, items={len(self._items.by_id)})"
+
+
+BASE_INDEX = CatalogIndex(
+    CatalogEntry(id=hero_id, internal_name=f"{HERO_PREFIX}{short_name}", name_en=name_en, name_ru=name_en,
+                 roles=roles, dangerous=dangerous)
+    for hero_id, short_name, name_en, roles, dangerous in BASE_HEROES
+)
+
+_current_index = BASE_INDEX
+
+
+def get_index() -> CatalogIndex:
+    """Текущий индекс процесса (базовый, пока каталог API не загружен)"""
+    return _current_index
+
+
+def install_index(index: CatalogIndex):
+    """Сделать индекс текущим (замена ссылки атомарна, читатели не блокируются)"""
+    global _current_index
+    _current_index = index
+    logger.debug(f"Индекс каталога обновлён: {index}")
@@ -0,0 +1,231 @@
+"""
+Общий HTTP-клиент для внешних API (Steam WebAPI, Stratz)
+Один пул соединений на процесс: keep-alive, gzip, повтор запросов при
+429/5xx и сетевых ошибках с экспоненциальной задержкой и случайным
+разбросом, таймауты по эндпоинтам. Частота запросов ограничена корзиной
+токенов на хост, а одинаковые одновременные запросы объединяются в один.
+По каждому эндпоинту считаются задержки (p50/p95/p99), ошибки, повторы,
+ожидания ограничителя и объединённые вызовы.
+"""
+
+import json
+
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import MetricsRegistry
+from rate_limit import SingleFlight, TokenBucket
+from config import (HTTP_POOL_SIZE, HTTP_RETRIES, HTTP_BACKOFF_BASE, HTTP_BACKOFF_MAX, HTTP_TIMEOUT,
+                    HTTP_RATE_LIMIT, HTTP_RATE_BURST)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class ApiClient:
+    """
+    HTTP-клиент с пулом соединений и повторами
+
+    Возвращает последний ответ как есть (в том числе с кодом ошибки после
+    исчерпания повторов) - проверку raise_for_status делает вызывающий код.
+    Сетевая ошибка после последней попытки пробрасывается.
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, retries: int = HTTP_RETRIES,
+                 backoff_base: float = HTTP_BACKOFF_BASE, backoff_max: float = HTTP_BACKOFF_MAX,
+                 timeout: float = HTTP_TIMEOUT, timeouts: Optional[Dict[str, float]] = None,
+                 rate_limit: float = HTTP_RATE_LIMIT, rate_burst: int = HTTP_RATE_BURST,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            pool_size: Соединений на хост в пуле
+            retries: Повторов после первой попытки
+            backoff_base: Базовая задержка повтора (сек), растёт вдвое с каждой попыткой
+            backoff_max: Предел задержки повтора
+            timeout: Таймаут по умолчанию (сек)
+            timeouts: Таймауты по эндпоинтам {"GetMatchDetails": 10, ...}
+            rate_limit: Запросов в секунду на хост по умолчанию (0 = без ограничения)
+            rate_burst: Ёмкость корзины токенов хоста
+            sleep: Функция ожидания (между попытками и в ограничителе)
+        """
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.sleep = sleep
+        self.metrics = MetricsRegistry()
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.rate_limits: Dict[str, Tuple[float, int]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self._single_flight = SingleFlight()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+
+    def set_timeouts(self, timeouts: Dict[str, float], override: bool = False):
+        """Задать таймауты эндпоинтов (уже заданные не меняются без override)"""
+        for endpoint, timeout in timeouts.items():
+            if override or endpoint not in self.timeouts:
+                self.timeouts[endpoint] = timeout
+
+    def set_rate_limits(self, limits: Dict[str, Tuple[float, int]], override: bool = False):
+        """Задать лимиты хостов {"api.stratz.com": (запросов в секунду, пачка)}"""
+        with self._buckets_lock:
+            for host, limit in limits.items():
+                if override or host not in self.rate_limits:
+                    self.rate_limits[host] = limit
+                    self._buckets.pop(host, None)
+
+    def get(self, url: str, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+        return self.request("GET", url, endpoint, **kwargs)
+
+    def post(self, url: str, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+        return self.request("POST", url, endpoint, **kwargs)
+
+    def request(self, method: str, url: str, endpoint: Optional[str] = None,
+                **kwargs) -> requests.Response:
+        """
+        Выполнить запрос с повторами
+
+        Одинаковые одновременные запросы (метод, URL, params, json)
+        выполняются один раз, все вызывающие получают один и тот же ответ.
+
+        Args:
+            method: GET, POST, ...
+            url: Адрес
+            endpoint: Имя эндпоинта для статистики и таймаута (по умолчанию - из пути URL)
+            **kwargs: Аргументы requests (params, json, headers, timeout)
+        """
+        endpoint = endpoint or self.endpoint_name(url)
+        kwargs.setdefault("timeout", self.timeouts.get(endpoint, self.timeout))
+
+        response, shared = self._single_flight.do(self._request_key(method, url, kwargs),
+                                                  lambda: self._send(method, url, endpoint, kwargs))
+        if shared:
+            self.metrics.increment(f"{endpoint}.coalesced")
+        return response
+
+    def _send(self, method: str, url: str, endpoint: str, kwargs: Dict) -> requests.Response:
+        bucket = self._bucket(urlsplit(url).netloc)
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            if waited:
+                self.metrics.increment(f"{endpoint}.throttled")
+                self.metrics.record("throttle_wait", waited)
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(endpoint, started, error=True)
+                if attempt >= self.retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.debug(f"{endpoint}: {type(e).__name__}, повтор через {delay:.2f}с")
+            else:
+                failed = response.status_code in RETRY_STATUSES
+                self._record(endpoint, started, error=failed or response.status_code >= 400)
+                if not failed or attempt >= self.retries:
+                    return response
+                delay = self._retry_after(response) or self._backoff(attempt)
+                logger.debug(f"{endpoint}: HTTP {response.status_code}, повтор через {delay:.2f}с")
+                response.close()
+
+            attempt += 1
+            self.metrics.increment(f"{endpoint}.retries")
+            self.sleep(delay)
+
+    @staticmethod
+    def endpoint_name(url: str) -> str:
+        """Имя эндпоинта по URL: /IDOTA2Match_570/GetMatchDetails/v1 -> GetMatchDetails"""
+        parts = [part for part in urlsplit(url).path.split("/") if part]
+        if len(parts) >= 2 and parts[-1].lower().startswith("v") and parts[-1][1:].isdigit():
+            return parts[-2]
+        return parts[-1] if parts else urlsplit(url).netloc
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Статистика по эндпоинтам: задержки (мс), ошибки, повторы, throttled
+        (запросы, ждавшие ограничителя) и coalesced (вызовы, получившие чужой
+        ответ). Время ожидания ограничителя - в "throttle_wait".
+        """
+        snapshot = self.metrics.snapshot()
+        counters = snapshot["counters"]
+        stats = {}
+        for endpoint, summary in snapshot["stages"].items():
+            if endpoint == "throttle_wait":
+                stats[endpoint] = summary
+                continue
+            errors = counters.get(f"{endpoint}.errors", 0)
+            stats[endpoint] = dict(summary,
+                                   errors=errors,
+                                   error_rate=round(errors / summary["count"], 3) if summary["count"] else 0.0,
+                                   retries=counters.get(f"{endpoint}.retries", 0),
+                                   throttled=counters.get(f"{endpoint}.throttled", 0),
+                                   coalesced=counters.get(f"{endpoint}.coalesced", 0))
+        return stats
+
+    def close(self):
+        self.session.close()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        """Корзина токенов хоста (общая для всех потоков процесса)"""
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.rate_limits.get(host, (self.rate_limit, self.rate_burst))
+                bucket = self._buckets[host] = TokenBucket(rate, burst, sleep=self.sleep)
+            return bucket
+
+    @staticmethod
+    def _request_key(method: str, url: str, kwargs: Dict) -> Tuple:
+        """Ключ объединения: одинаковые метод, URL, параметры, заголовки и тело"""
+        def items(mapping):
+            return tuple(sorted((str(k), str(v)) for k, v in dict(mapping or {}).items()))
+        return (method.upper(), url, items(kwargs.get("params")), items(kwargs.get("headers")),
+                json.dumps([kwargs.get("json"), kwargs.get("data")], sort_keys=True, default=str))
+
+    def _record(self, endpoint: str, started: float, error: bool):
+        self.metrics.record(endpoint, time.perf_counter() - started)
+        if error:
+            self.metrics.increment(f"{endpoint}.errors")
+
+    def _backoff(self, attempt: int) -> float:
+        """Полный разброс: случайная задержка от 0 до base * 2^attempt (не больше max)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Задержка из заголовка Retry-After (секунды), если сервер её указал"""
+        value = response.headers.get("Retry-After")
+        if value and value.strip().isdigit():
+            return min(float(value), self.backoff_max)
+        return None
+
+
+_shared_client: Optional[ApiClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_client() -> ApiClient:
+    """Общий клиент процесса (создаётся при первом обращении)"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = ApiClient()
+    return _shared_client
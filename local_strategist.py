@@ -4,9 +4,14 @@
 """
 
 import logging
-from typing import Dict, List, Optional
+import threading
+import time
+from typing import Dict, List, Mapping, Optional, Sequence
 from enum import Enum
 
+from state_diff import StateDiffer
+from hero_index import get_index
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -23,27 +28,87 @@ class AdviceCategory(Enum):
 class LocalStrategist:
     """Локальный анализатор игровой ситуации"""
     
-    def __init__(self):
-        self.hero_roles = {
-            "carry": ["Anti-Mage", "Phantom Assassin", "Juggernaut", "Drow Ranger"],
-            "midlaner": ["Shadow Fiend", "Puck", "Templar Assassin", "Storm Spirit"],
-            "support": ["Crystal Maiden", "Lion", "Rubick", "Shadow Shaman"],
-            "offlane": ["Tidehunter", "Centaur", "Dark Seer", "Underlord"],
-        }
+    # Правило -> поля game_state, которые оно читает.
+    # Правило пересчитывается, только если какое-то из его полей изменилось.
+    RULE_INPUTS = {
+        "_analyze_economy": ("gold", "game_time", "last_hits", "recently_shopped"),
+        "_analyze_safety": ("hp", "max_hp", "nearby_enemy_count"),
+        "_analyze_positioning": ("game_time", "level", "hero_name", "position"),
+        "_analyze_items": ("items", "hero_name", "level", "game_time"),
+        "_analyze_teamfight": ("level", "allies"),
+    }
+    
+    # Порядок выполнения правил при ограниченном времени: безопасность - всегда,
+    # остальные по убыванию важности (последние отбрасываются первыми)
+    ESSENTIAL_RULES = ("_analyze_safety",)
+    RULE_ORDER = ("_analyze_safety", "_analyze_teamfight", "_analyze_economy",
+                  "_analyze_positioning", "_analyze_items")
     
-    def analyze_situation(self, game_state: Dict) -> Dict:
+    def __init__(self, hero_roles: Optional[Mapping[str, Sequence[str]]] = None):
+        """
+        Args:
+            hero_roles: Своя таблица ролей (по умолчанию - роли текущего индекса каталога)
+        """
+        self._hero_roles = hero_roles
+        self.differ = StateDiffer()
+        self._last_state = None
+        self._rule_cache: Dict[str, List[Dict]] = {}
+        self._stale_rules = set()  # Правила, не пересчитанные из-за нехватки времени
+        self.rules_evaluated = 0
+        self.rules_skipped = 0
+        self.rules_over_budget = 0
+        # analyze_situation зовут и воркер AnalysisStage, и ask_for_help
+        self._lock = threading.Lock()
+    
+    @property
+    def hero_roles(self) -> Mapping[str, Sequence[str]]:
+        """Таблица ролей (индекс читается при обращении - после загрузки каталога он другой)"""
+        if self._hero_roles is not None:
+            return self._hero_roles
+        return get_index().role_table
+    
+    def _has_role(self, hero: str, role: str) -> bool:
+        if self._hero_roles is None:
+            return get_index().has_role(hero, role)
+        # Имя героя может прийти в любом виде (GSI, внутреннее, русское) - приводим по индексу
+        return get_index().hero_name(hero, default=hero) in self._hero_roles.get(role, ())
+    
+    def analyze_situation(self, game_state: Dict, time_budget: Optional[float] = None) -> Dict:
         """
         Анализировать текущую ситуацию и вернуть рекомендации
+        
+        Правила, чьи входные поля не изменились с прошлого вызова,
+        не пересчитываются - используется их прошлый результат.
+        
+        Args:
+            game_state: Состояние игры
+            time_budget: Сколько секунд можно потратить; когда время вышло,
+                         необязательные правила не пересчитываются (берётся
+                         прошлый результат или правило пропускается)
         """
         try:
-            recommendations = []
+            started = time.perf_counter()
+            with self._lock:
+                recommendations = []
+                changes = self.differ.diff(self._last_state, game_state)
             
-            # Базовый анализ
-            recommendations.extend(self._analyze_economy(game_state))
-            recommendations.extend(self._analyze_safety(game_state))
-            recommendations.extend(self._analyze_positioning(game_state))
-            recommendations.extend(self._analyze_items(game_state))
-            recommendations.extend(self._analyze_teamfight(game_state))
+                # Базовый анализ
+                for rule in self.RULE_ORDER:
+                    needs_update = (rule not in self._rule_cache or rule in self._stale_rules
+                                    or changes.touches(self.RULE_INPUTS[rule]))
+                    if needs_update and (time_budget is None or rule in self.ESSENTIAL_RULES
+                                         or time.perf_counter() - started < time_budget):
+                        self._rule_cache[rule] = getattr(self, rule)(game_state)
+                        self._stale_rules.discard(rule)
+                        self.rules_evaluated += 1
+                    elif needs_update:
+                        # Не успели - пересчитать при следующем вызове
+                        self._stale_rules.add(rule)
+                        self.rules_over_budget += 1
+                    else:
+                        self.rules_skipped += 1
+                    recommendations.extend(self._rule_cache.get(rule, ()))
+                self._last_state = game_state
             
             # Сортировать по приоритету
             recommendations.sort(key=lambda x: x.get('priority', 0), reverse=True)
@@ -138,7 +203,7 @@ class LocalStrategist:
             })
         
         # Видимо, Carry в раннюю кэрри время должен быть на линии
-        if hero in self.hero_roles.get("carry", []) and game_time < 15:
+        if self._has_role(hero, "carry") and game_time < 15:
             if game_state.get('position') != "lane":
                 advice.append({
                     "type": "positioning",
@@ -29,7 +29,7 @@ def main():
             logger.info("Перезапустите приложение для загрузки конфигурации.\n")
             return
         
-        coach = DotaCoach()
+        coach = DotaCoach(show_window=True)  # Окно сразу, пока идёт прогрев
         coach.run()
         
     except KeyboardInterrupt:
@@ -0,0 +1,117 @@
+"""
+Параллельная загрузка деталей матчей
+Детали сотни матчей из get_match_history - сотня последовательных запросов.
+BulkMatchFetcher выполняет их в ограниченном пуле потоков с ограничением
+частоты и выдаёт результаты по мере готовности. Ошибка одного матча не
+прерывает остальные - она возвращается в результате этого матча.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from config import BULK_FETCH_WORKERS, BULK_FETCH_RATE
+from rate_limit import TokenBucket
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MatchFetchResult:
+    """Результат загрузки одного матча"""
+    match_id: int
+    details: Optional[Dict] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0   # сек, включая ожидание ограничителя частоты
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BulkMatchFetcher:
+    """
+    Загрузка множества матчей ограниченным пулом
+
+    В работе одновременно не больше 2 * workers идентификаторов, поэтому
+    вход может быть ленивым и длинным. Повторные ID загружаются один раз.
+    """
+
+    def __init__(self, fetch: Callable[[int], Dict], workers: int = BULK_FETCH_WORKERS,
+                 rate_limit: float = BULK_FETCH_RATE, limiter: Optional[TokenBucket] = None):
+        """
+        Args:
+            fetch: Загрузка одного матча (исключение = ошибка этого матча)
+            workers: Потоков
+            rate_limit: Запросов в секунду, равномерно (0 = без ограничения)
+            limiter: Готовая корзина токенов (вместо rate_limit)
+        """
+        self.fetch = fetch
+        self.workers = max(1, workers)
+        self.limiter = limiter or TokenBucket(rate_limit, burst=1)
+        self.fetched = 0
+        self.failed = 0
+        self.rate_wait = 0.0
+        self._lock = threading.Lock()
+
+    def fetch_all(self, match_ids: Iterable[int]) -> Iterator[MatchFetchResult]:
+        """
+        Загрузить матчи
+
+        Yields:
+            MatchFetchResult в порядке готовности
+        """
+        ids = iter(match_ids)
+        seen = set()
+        pending = set()
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="match-fetch")
+        try:
+            while True:
+                for match_id in ids:
+                    if match_id in seen:
+                        continue
+                    seen.add(match_id)
+                    pending.add(executor.submit(self._fetch_one, match_id))
+                    if len(pending) >= self.workers * 2:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result.ok:
+                        self.fetched += 1
+                    else:
+                        self.failed += 1
+                    yield result
+        finally:
+            # Генератор закрыт раньше - незапущенные загрузки отменяются
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "rate_wait_s": round(self.rate_wait, 3),
+        }
+
+    def _fetch_one(self, match_id: int) -> MatchFetchResult:
+        started = time.perf_counter()
+        try:
+            waited = self.limiter.acquire()
+            if waited:
+                with self._lock:
+                    self.rate_wait += waited
+            details = self.fetch(match_id)
+            return MatchFetchResult(match_id, details=details, elapsed=time.perf_counter() - started)
+        except Exception as e:
+            logger.debug(f"Матч {match_id} не загружен: {e}")
+            return MatchFetchResult(match_id, error=f"{type(e).__name__}: {e}",
+                                    elapsed=time.perf_counter() - started)
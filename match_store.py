@@ -0,0 +1,263 @@
+"""
+Локальное хранилище матчей (SQLite)
+Детали матчей и строки истории матчей, загруженные из Steam WebAPI,
+сохраняются на диск. Повторные запросы истории тех же игроков и деталей
+тех же матчей обслуживаются из хранилища, в сеть уходят только
+недостающие или устаревшие записи.
+
+Таблицы:
+    matches         - детали матча (JSON), индекс по start_time
+    match_players   - участники матча, индексы по account_id и hero_id
+    history_rows    - строки GetMatchHistory по игроку
+    history_queries - когда и сколько строк истории запрашивалось
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from config import MATCH_HISTORY_MAX_AGE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_id    INTEGER PRIMARY KEY,
+    start_time  INTEGER,
+    payload     TEXT NOT NULL,
+    fetched_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_matches_start_time ON matches (start_time);
+
+CREATE TABLE IF NOT EXISTS match_players (
+    match_id     INTEGER NOT NULL,
+    player_slot  INTEGER NOT NULL,
+    account_id   INTEGER,
+    hero_id      INTEGER,
+    PRIMARY KEY (match_id, player_slot)
+);
+CREATE INDEX IF NOT EXISTS idx_match_players_account ON match_players (account_id);
+CREATE INDEX IF NOT EXISTS idx_match_players_hero ON match_players (hero_id);
+
+CREATE TABLE IF NOT EXISTS history_rows (
+    account_id  INTEGER NOT NULL,
+    match_id    INTEGER NOT NULL,
+    start_time  INTEGER,
+    hero_id     INTEGER,
+    skill       INTEGER,
+    payload     TEXT NOT NULL,
+    PRIMARY KEY (account_id, match_id)
+);
+CREATE INDEX IF NOT EXISTS idx_history_account_time ON history_rows (account_id, start_time);
+CREATE INDEX IF NOT EXISTS idx_history_hero ON history_rows (hero_id);
+
+CREATE TABLE IF NOT EXISTS history_queries (
+    account_id  INTEGER NOT NULL,
+    hero_id     INTEGER NOT NULL,   -- 0 = любой герой
+    skill       INTEGER NOT NULL,   -- -1 = любой уровень
+    requested   INTEGER NOT NULL,
+    fetched_at  REAL NOT NULL,
+    PRIMARY KEY (account_id, hero_id, skill)
+);
+"""
+
+
+class MatchStore:
+    """
+    Хранилище матчей и истории игроков
+
+    Соединение открывается при первом обращении и общее для всех потоков
+    (доступ под блокировкой). Запись - пакетами в одной транзакции.
+    """
+
+    def __init__(self, path: str, history_max_age: float = MATCH_HISTORY_MAX_AGE,
+                 details_max_age: Optional[float] = None, clock=time.time):
+        """
+        Args:
+            path: Файл базы (":memory:" - в памяти)
+            history_max_age: Сколько секунд история игрока считается свежей
+            details_max_age: Срок деталей матча (None - бессрочно: сыгранный матч не меняется)
+            clock: Настенные часы (time.time)
+        """
+        self.path = path
+        self.history_max_age = history_max_age
+        self.details_max_age = details_max_age
+        self.clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    # --- Детали матчей ---
+
+    def get_match(self, match_id: int) -> Optional[Dict]:
+        """Детали матча из хранилища (None - нет или устарели)"""
+        with self._lock:
+            row = self.conn.execute("SELECT payload, fetched_at FROM matches WHERE match_id = ?",
+                                    (match_id,)).fetchone()
+            if row is None or not self._fresh(row[1], self.details_max_age):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def get_matches(self, match_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Детали нескольких матчей одним запросом {match_id: детали} (только свежие)"""
+        match_ids = list(dict.fromkeys(match_ids))
+        found = {}
+        with self._lock:
+            for start in range(0, len(match_ids), 500):  # Предел числа параметров SQLite
+                chunk = match_ids[start:start + 500]
+                rows = self.conn.execute(
+                    f"SELECT match_id, payload, fetched_at FROM matches "
+                    f"WHERE match_id IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+                for match_id, payload, fetched_at in rows:
+                    if self._fresh(fetched_at, self.details_max_age):
+                        found[match_id] = json.loads(payload)
+            self.hits += len(found)
+            self.misses += len(match_ids) - len(found)
+        return found
+
+    def upsert_matches(self, matches: Iterable[Dict]):
+        """Сохранить детали матчей (одна транзакция на пакет)"""
+        now = self.clock()
+        match_rows, player_rows = [], []
+        for match in matches:
+            match_rows.append((match['match_id'], match.get('start_time'),
+                               json.dumps(match, ensure_ascii=False, separators=(',', ':')), now))
+            player_rows.extend(self._player_rows(match))
+        if not match_rows:
+            return
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO matches (match_id, start_time, payload, fetched_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (match_id) DO UPDATE SET start_time = excluded.start_time, "
+                "payload = excluded.payload, fetched_at = excluded.fetched_at", match_rows)
+            self._upsert_players(player_rows)
+
+    # --- История игроков ---
+
+    def get_history(self, account_id: int, hero_id: Optional[int] = None, skill: Optional[int] = None,
+                    matches_requested: int = 20) -> Optional[List[Dict]]:
+        """
+        История игрока из хранилища
+
+        Returns:
+            Строки (новые первыми) или None - такой запрос не выполнялся,
+            устарел или запрашивал меньше строк
+        """
+        with self._lock:
+            query = self.conn.execute(
+                "SELECT requested, fetched_at FROM history_queries "
+                "WHERE account_id = ? AND hero_id = ? AND skill = ?",
+                (account_id, hero_id or 0, -1 if skill is None else skill)).fetchone()
+            if (query is None or query[0] < matches_requested
+                    or not self._fresh(query[1], self.history_max_age)):
+                self.misses += 1
+                return None
+            sql = "SELECT payload FROM history_rows WHERE account_id = ?"
+            args: list = [account_id]
+            if hero_id:
+                sql += " AND hero_id = ?"
+                args.append(hero_id)
+            if skill is not None:
+                sql += " AND skill = ?"
+                args.append(skill)
+            rows = self.conn.execute(sql + " ORDER BY start_time DESC LIMIT ?",
+                                     args + [matches_requested]).fetchall()
+            self.hits += 1
+        return [json.loads(payload) for payload, in rows]
+
+    def upsert_history(self, account_id: int, rows: List[Dict], hero_id: Optional[int] = None,
+                       skill: Optional[int] = None, matches_requested: Optional[int] = 20):
+        """
+        Сохранить строки истории и отметить запрос как выполненный (одна транзакция)
+
+        matches_requested=None - только строки (страница постраничного обхода),
+        без отметки запроса.
+        """
+        history_rows, player_rows = [], []
+        for row in rows:
+            own_hero = next((player.get('hero_id') for player in row.get('players', [])
+                             if player.get('account_id') == account_id), hero_id)
+            history_rows.append((account_id, row['match_id'], row.get('start_time'), own_hero, skill,
+                                 json.dumps(row, ensure_ascii=False, separators=(',', ':'))))
+            player_rows.extend(self._player_rows(row))
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO history_rows (account_id, match_id, start_time, hero_id, skill, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (account_id, match_id) DO UPDATE SET "
+                "start_time = excluded.start_time, hero_id = COALESCE(excluded.hero_id, hero_id), "
+                "skill = COALESCE(excluded.skill, skill), payload = excluded.payload", history_rows)
+            self._upsert_players(player_rows)
+            if matches_requested is None:
+                return
+            self.conn.execute(
+                "INSERT OR REPLACE INTO history_queries (account_id, hero_id, skill, requested, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (account_id, hero_id or 0, -1 if skill is None else skill, matches_requested, self.clock()))
+
+    # --- Выборки по индексам ---
+
+    def matches_for_account(self, account_id: int, since: Optional[int] = None) -> List[int]:
+        """ID матчей игрока (из деталей и истории), новые первыми"""
+        sql = ("SELECT DISTINCT p.match_id FROM match_players p "
+               "LEFT JOIN matches m ON m.match_id = p.match_id "
+               "LEFT JOIN history_rows h ON h.match_id = p.match_id AND h.account_id = p.account_id "
+               "WHERE p.account_id = ?")
+        args: list = [account_id]
+        if since is not None:
+            sql += " AND COALESCE(m.start_time, h.start_time) >= ?"
+            args.append(since)
+        with self._lock:
+            rows = self.conn.execute(sql + " ORDER BY COALESCE(m.start_time, h.start_time) DESC",
+                                     args).fetchall()
+        return [match_id for match_id, in rows]
+
+    def matches_with_hero(self, hero_id: int) -> List[int]:
+        """ID матчей, где играли героем"""
+        with self._lock:
+            rows = self.conn.execute("SELECT DISTINCT match_id FROM match_players WHERE hero_id = ?",
+                                     (hero_id,)).fetchall()
+        return [match_id for match_id, in rows]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            matches = self.conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+            history = self.conn.execute("SELECT COUNT(*) FROM history_rows").fetchone()[0]
+        return {"matches": matches, "history_rows": history, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _fresh(self, fetched_at: float, max_age: Optional[float]) -> bool:
+        return max_age is None or self.clock() - fetched_at <= max_age
+
+    @staticmethod
+    def _player_rows(match: Dict) -> List[tuple]:
+        return [(match['match_id'], player.get('player_slot', index), player.get('account_id'),
+                 player.get('hero_id'))
+                for index, player in enumerate(match.get('players', []))]
+
+    def _upsert_players(self, player_rows: List[tuple]):
+        self.conn.executemany(
+            "INSERT INTO match_players (match_id, player_slot, account_id, hero_id) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (match_id, player_slot) DO UPDATE SET "
+            "account_id = COALESCE(excluded.account_id, account_id), hero_id = excluded.hero_id",
+            player_rows)
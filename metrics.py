@@ -0,0 +1,209 @@
+"""
+Метрики задержек по этапам тренера
+Гистограммы в стиле HDR (логарифмические корзины с линейным делением внутри),
+запись O(1) без выделения памяти; p50/p95/p99 доступны через JSON по HTTP
+или периодическую выгрузку в файл
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек в микросекундах
+
+    Значения до 32 мкс хранятся точно, дальше каждая степень двойки делится
+    на 16 корзин - относительная погрешность не больше ~6%.
+    """
+
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+    def __init__(self, max_value_us: int = 60_000_000):
+        """
+        Args:
+            max_value_us: Наибольшее различимое значение (большие обрезаются)
+        """
+        self.max_value_us = max_value_us
+        self._counts = [0] * (self._index(max_value_us) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        if shift <= 0:
+            return value
+        return shift * cls.SUB_BUCKET_HALF + (value >> shift)
+
+    @classmethod
+    def _upper_bound(cls, index: int) -> int:
+        """Наибольшее значение, попадающее в корзину"""
+        if index < 2 * cls.SUB_BUCKET_HALF:
+            return index
+        shift, sub = divmod(index, cls.SUB_BUCKET_HALF)
+        shift -= 1
+        sub += cls.SUB_BUCKET_HALF
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value_us: int):
+        """Записать одно значение"""
+        value_us = min(max(int(value_us), 0), self.max_value_us)
+        index = self._index(value_us)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total_us += value_us
+            if value_us > self.max_us:
+                self.max_us = value_us
+
+    def percentile(self, fraction: float) -> int:
+        """Значение (мкс), не меньше которого доля fraction записей"""
+        with self._lock:
+            if not self.count:
+                return 0
+            target = max(1, int(fraction * self.count + 0.5))
+            seen = 0
+            for index, bucket in enumerate(self._counts):
+                seen += bucket
+                if seen >= target:
+                    return min(self._upper_bound(index), self.max_us)
+            return self.max_us
+
+    def summary(self) -> Dict:
+        """Сводка в миллисекундах"""
+        mean = self.total_us / self.count if self.count else 0
+        return {
+            "count": self.count,
+            "mean_ms": round(mean / 1000, 3),
+            "p50_ms": round(self.percentile(0.50) / 1000, 3),
+            "p95_ms": round(self.percentile(0.95) / 1000, 3),
+            "p99_ms": round(self.percentile(0.99) / 1000, 3),
+            "max_ms": round(self.max_us / 1000, 3),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * len(self._counts)
+            self.count = 0
+            self.total_us = 0
+            self.max_us = 0
+
+
+class MetricsRegistry:
+    """Набор гистограмм по этапам и простых счётчиков"""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def record(self, stage: str, seconds: float):
+        """Записать длительность этапа"""
+        self.histogram(stage).record(seconds * 1_000_000)
+
+    @contextmanager
+    def time(self, stage: str):
+        """Замерить блок кода: with metrics.time("farm_route"): ..."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def increment(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def snapshot(self) -> Dict:
+        """Текущее состояние всех метрик (для JSON)"""
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "stages": {stage: histogram.summary()
+                       for stage, histogram in sorted(self._histograms.items())},
+            "counters": dict(self._counters),
+        }
+
+    def dump(self, path: str):
+        """Записать снимок в файл (атомарно, через временный файл)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        for histogram in list(self._histograms.values()):
+            histogram.reset()
+        with self._lock:
+            self._counters.clear()
+
+
+class MetricsServer:
+    """Локальный HTTP-эндпоинт: GET /metrics -> JSON снимок"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108):
+        """
+        Args:
+            registry: Источник метрик
+            host: Адрес (по умолчанию только локальный)
+            port: Порт (0 = выбрать свободный)
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.server = None  # ThreadingHTTPServer, создаётся в start()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.server:
+            return
+        # http.server нужен только при включённом эндпоинте
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('', '/metrics'):
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = json.dumps(registry.snapshot(), ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Metrics: {format % args}")
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"📈 Метрики доступны на http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -1,12 +1,14 @@
 """
 Визуализатор оверлея - рисует маршруты фарма на экран
-Использует PIL для рисования и работает без вмешательства в игру
+Использует PIL для рисования и работает без вмешательства в игру.
+Маршрут получает как подписчик темы farm_route демона тренера
+(on_farm_route), а не считает сам.
 """
 
 import logging
 import threading
 import time
-from typing import List, Tuple, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from PIL import Image, ImageDraw, ImageFont
 import mss
 import numpy as np
@@ -18,12 +20,13 @@ logger = logging.getLogger(__name__)
 class OverlayRenderer:
     """Рендерер оверлея для визуализации маршрутов"""
     
-    def __init__(self, monitor_index: int = 0):
+    def __init__(self, monitor_index: int = 0, farm_spots: Optional[Sequence] = None):
         """
         Инициализировать рендерер оверлея
         
         Args:
             monitor_index: Индекс монитора для захвата (0 = основной)
+            farm_spots: Карта спотов для сообщений farm_route (по умолчанию - FarmingOptimizer)
         """
         self.sct = mss.mss()
         self.monitor_index = monitor_index
@@ -37,6 +40,8 @@ class OverlayRenderer:
         self.overlay_alpha = 0.7
         self.enable_arrows = True
         self.enable_text = True
+        self._farm_spots = farm_spots
+        self._spots_by_name: Optional[Dict[str, object]] = None
         
         logger.info(f"✓ OverlayRenderer инициализирован (монитор {monitor_index})")
 
@@ -66,6 +71,23 @@ class OverlayRenderer:
         self.farm_route = route
         self.hero_position = hero_pos
 
+    def on_farm_route(self, topic: str, data: Dict):
+        """
+        Подписчик хаба (RecommendationHub.subscribe или CoachClient): маршрут из анализа тренера
+        
+        Args:
+            topic: Тема сообщения (farm_route)
+            data: Данные сообщения: route - имена спотов, hero_position - позиция героя
+        """
+        if self._spots_by_name is None:
+            if self._farm_spots is None:
+                from farming_optimizer import FarmingOptimizer
+                self._farm_spots = FarmingOptimizer().farm_spots
+            self._spots_by_name = {spot.name: spot for spot in self._farm_spots}
+        route = [self._spots_by_name[name] for name in data.get("route", ()) if name in self._spots_by_name]
+        hero_position = data.get("hero_position")
+        self.set_farm_route(route, tuple(hero_position) if hero_position else self.hero_position)
+
     def _render_loop(self):
         """Главный цикл отрендеринга"""
         try:
@@ -0,0 +1,128 @@
+"""
+Наблюдение за процессом Dota 2
+Процесс ищется полным перебором один раз, после чего его PID закрепляется
+и проверяется напрямую. Повторный поиск идёт только пока игры нет,
+с экспоненциально растущим интервалом.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ProcessWatcher:
+    """
+    Закреплённый по PID наблюдатель за процессом
+
+    Пока процесс жив, проверка стоит одного psutil.Process(pid).
+    Когда процесса нет, is_running() не сканирует систему чаще, чем
+    позволяет текущая задержка (min_backoff, 2x, 4x ... max_backoff).
+    """
+
+    def __init__(self, process_name: str = "dota2.exe", min_backoff: float = 1.0,
+                 max_backoff: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            process_name: Имя процесса (сравнивается без учёта регистра, по вхождению)
+            min_backoff: Задержка перед повторным поиском после первой неудачи
+            max_backoff: Максимальная задержка между поисками
+            clock: Источник монотонного времени
+        """
+        self.process_name = process_name.lower()
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+
+        self.pid: Optional[int] = None
+        self._create_time: Optional[float] = None   # Защита от повторного использования PID
+        self._backoff = min_backoff
+        self._next_scan = 0.0                        # Первый вызов сразу сканирует
+        self._started_callbacks: List[Callable[[int], None]] = []
+        self._stopped_callbacks: List[Callable[[int], None]] = []
+
+        self.scans = 0
+        self.liveness_checks = 0
+
+    def on_started(self, callback: Callable[[int], None]):
+        """Подписаться на запуск процесса (аргумент - PID)"""
+        self._started_callbacks.append(callback)
+
+    def on_stopped(self, callback: Callable[[int], None]):
+        """Подписаться на завершение процесса (аргумент - PID)"""
+        self._stopped_callbacks.append(callback)
+
+    def is_running(self) -> bool:
+        """Запущен ли процесс (дёшево, если PID уже закреплён)"""
+        if self.pid is not None:
+            if self._pinned_alive():
+                return True
+            self._unpin()
+
+        if self.clock() < self._next_scan:
+            return False
+        return self._scan()
+
+    def get_stats(self) -> Dict:
+        return {
+            "pid": self.pid,
+            "scans": self.scans,
+            "liveness_checks": self.liveness_checks,
+            "backoff": self._backoff,
+        }
+
+    def _pinned_alive(self) -> bool:
+        self.liveness_checks += 1
+        try:
+            proc = psutil.Process(self.pid)
+            return (proc.create_time() == self._create_time
+                    and proc.status() != psutil.STATUS_ZOMBIE)
+        except psutil.NoSuchProcess:
+            return False
+        except psutil.AccessDenied:
+            # Нет прав на детали - это не завершение; проверяем хотя бы PID
+            return psutil.pid_exists(self.pid)
+
+    def _scan(self) -> bool:
+        """Полный перебор процессов"""
+        self.scans += 1
+        for proc in psutil.process_iter(['name', 'create_time']):
+            name = proc.info['name']
+            # Без create_time закрепить нельзя: сверка по PID сразу "завершит" процесс
+            if (name and self.process_name in name.lower()
+                    and proc.info['create_time'] is not None):
+                self._pin(proc.pid, proc.info['create_time'])
+                return True
+
+        # Игры нет - следующий поиск не раньше чем через текущую задержку
+        self._next_scan = self.clock() + self._backoff
+        self._backoff = min(self._backoff * 2, self.max_backoff)
+        return False
+
+    def _pin(self, pid: int, create_time: float):
+        self.pid = pid
+        self._create_time = create_time
+        self._backoff = self.min_backoff
+        logger.info(f"✓ Dota 2 запущена (PID {pid})")
+        self._notify(self._started_callbacks, pid)
+
+    def _unpin(self):
+        pid = self.pid
+        self.pid = None
+        self._create_time = None
+        # Игру могли перезапустить - первый поиск сразу, дальше с задержкой
+        self._next_scan = 0.0
+        logger.warning(f"✗ Dota 2 завершилась (PID {pid})")
+        self._notify(self._stopped_callbacks, pid)
+
+    @staticmethod
+    def _notify(callbacks: List[Callable[[int], None]], pid: int):
+        for callback in callbacks:
+            try:
+                callback(pid)
+            except Exception as e:
+                logger.error(f"Ошибка в обработчике события процесса: {e}")
@@ -0,0 +1,100 @@
+"""
+Ограничение частоты и объединение одинаковых запросов
+TokenBucket - корзина токенов: в среднем rate запросов в секунду, пачкой
+до burst. SingleFlight - одинаковые запросы, пришедшие одновременно,
+выполняются один раз: остальные вызывающие ждут и получают тот же результат.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Корзина токенов (потокобезопасная)"""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: Токенов в секунду (0 = без ограничения)
+            burst: Ёмкость корзины - сколько запросов можно сделать сразу
+            clock: Монотонные часы
+            sleep: Функция ожидания
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Взять токен, при необходимости дождавшись его
+
+        Returns:
+            Сколько секунд пришлось ждать
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Токен берётся в долг: следующие вызывающие встают в очередь за ним
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            self.sleep(delay)
+        return delay
+
+
+class SingleFlight:
+    """Один вызов на ключ одновременно; повторные вызовы ждут его результат"""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: BaseException = None
+
+    def __init__(self):
+        self._calls: Dict[Hashable, 'SingleFlight._Call'] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Выполнить func или дождаться уже идущего вызова с тем же ключом
+
+        Returns:
+            (результат, shared) - shared=True, если результат чужого вызова.
+            Исключение ведущего вызова пробрасывается всем ожидающим.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
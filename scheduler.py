@@ -0,0 +1,183 @@
+"""
+Планировщик периодических задач тренера
+Мин-куча дедлайнов на монотонных часах вместо фиксированного time.sleep
+"""
+
+import heapq
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledJob:
+    """Периодическая задача планировщика"""
+    name: str                      # Уникальное имя задачи
+    callback: Callable[[], None]   # Что выполнять
+    interval: float                # Период в секундах
+    jitter: float = 0.0            # Случайная добавка к периоду (0..jitter сек)
+    next_run: float = 0.0          # Следующий дедлайн (monotonic)
+    run_count: int = 0             # Сколько раз выполнена
+    enabled: bool = True           # Можно временно отключить
+    seq: int = field(default=0, repr=False)  # Версия записи в куче
+
+
+class TaskScheduler:
+    """
+    Планировщик с мин-кучей дедлайнов
+
+    Цикл спит ровно до ближайшего дедлайна и просыпается раньше,
+    если вызван wake() (например, при остановке тренера).
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 wait: Optional[Callable[[threading.Event, Optional[float]], bool]] = None,
+                 before_tick: Optional[Callable[[], None]] = None,
+                 after_tick: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            clock: Монотонные часы
+            wait: Ожидание события с таймаутом (по умолчанию Event.wait);
+                  для виртуальных часов - VirtualClock.wait
+            before_tick: Вызывается перед первой задачей тика (пачки задач
+                         с наступившим дедлайном)
+            after_tick: Вызывается после последней задачи тика
+        """
+        self.clock = clock
+        self._wait = wait or (lambda event, timeout: event.wait(timeout))
+        self.before_tick = before_tick
+        self.after_tick = after_tick
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._heap: List[tuple] = []
+        self._counter = 0
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+
+    def add_job(self, name: str, callback: Callable[[], None], interval: float,
+                jitter: float = 0.0, initial_delay: float = 0.0) -> ScheduledJob:
+        """
+        Зарегистрировать периодическую задачу
+
+        Args:
+            name: Имя задачи
+            callback: Функция без аргументов
+            interval: Период в секундах
+            jitter: Максимальная случайная добавка к периоду
+            initial_delay: Задержка перед первым запуском
+        """
+        if interval <= 0:
+            raise ValueError(f"Интервал задачи {name} должен быть > 0")
+
+        job = ScheduledJob(name=name, callback=callback, interval=interval, jitter=jitter)
+        with self._lock:
+            previous = self.jobs.get(name)
+            if previous:
+                previous.seq = -1
+            self.jobs[name] = job
+            self._push(job, self.clock() + initial_delay)
+        self._wakeup.set()
+        return job
+
+    def remove_job(self, name: str):
+        """Удалить задачу (запись в куче станет неактуальной)"""
+        with self._lock:
+            job = self.jobs.pop(name, None)
+            if job:
+                job.seq = -1
+
+    def reschedule(self, name: str, delay: float = 0.0):
+        """Перенести ближайший запуск задачи (0 = выполнить как можно скорее)"""
+        with self._lock:
+            job = self.jobs.get(name)
+            if job is None:
+                return
+            self._push(job, self.clock() + delay)
+        self._wakeup.set()
+
+    def time_until_next(self) -> Optional[float]:
+        """Сколько секунд до ближайшего дедлайна (None если задач нет)"""
+        with self._lock:
+            self._drop_stale()
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - self.clock())
+
+    def run_pending(self) -> int:
+        """
+        Выполнить все задачи, у которых наступил дедлайн
+
+        Returns:
+            Количество выполненных задач
+        """
+        executed = 0
+        now = self.clock()
+
+        while True:
+            with self._lock:
+                self._drop_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                deadline, _, _, job = heapq.heappop(self._heap)
+
+                # Следующий дедлайн считается от плановой точки, без накопления дрейфа
+                next_run = deadline + self._interval_with_jitter(job)
+                if next_run <= now:
+                    next_run = now + self._interval_with_jitter(job)
+                self._push(job, next_run)
+
+            if not job.enabled:
+                continue
+
+            if executed == 0 and self.before_tick:
+                self.before_tick()
+            job.callback()
+            job.run_count += 1
+            executed += 1
+
+        if executed and self.after_tick:
+            self.after_tick()
+        return executed
+
+    def run_forever(self, should_continue: Callable[[], bool]):
+        """
+        Основной цикл: спать до ближайшего дедлайна и выполнять задачи
+
+        Args:
+            should_continue: Цикл работает, пока функция возвращает True
+        """
+        while should_continue():
+            wait = self.time_until_next()
+            if wait is None or wait > 0:
+                self._wait(self._wakeup, wait)
+                self._wakeup.clear()
+                if not should_continue():
+                    break
+            self.run_pending()
+
+    def wake(self):
+        """Прервать ожидание цикла (например, при остановке)"""
+        self._wakeup.set()
+
+    def _push(self, job: ScheduledJob, deadline: float):
+        """Положить задачу в кучу, сделав предыдущие записи неактуальными"""
+        self._counter += 1
+        job.seq = self._counter
+        job.next_run = deadline
+        heapq.heappush(self._heap, (deadline, self._counter, job.name, job))
+
+    def _drop_stale(self):
+        """Выкинуть с вершины кучи устаревшие записи"""
+        while self._heap and self._heap[0][3].seq != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    @staticmethod
+    def _interval_with_jitter(job: ScheduledJob) -> float:
+        if job.jitter > 0:
+            return job.interval + random.uniform(0, job.jitter)
+        return job.interval
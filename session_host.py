@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Хост нескольких сессий тренера в одном процессе
+Каждый игрок - независимая сессия DotaCoach со своим состоянием, историей
+и хабом советов. Неизменяемые данные (карта фарма, роли героев, каталоги
+героев/предметов API) создаются один раз и общие для всех сессий. Задачи
+сессий выполняются в общем пуле потоков: одна сессия никогда не
+обрабатывается двумя потоками одновременно.
+
+Метрики: get_stats() и snapshot() по каждой сессии; snapshot() совместим
+с MetricsServer (GET /metrics).
+
+Память: почти всё, что держит тренер, - кольцевой буфер истории состояний
+(при HISTORY_CAPACITY=3600 около 280 КБ из ~310 КБ). Общие данные экономят
+лишь несколько КБ на сессию, поэтому лёгкость сессии задаётся ёмкостью её
+истории - SESSION_HISTORY_CAPACITY (по умолчанию 600, около 1/4 полного
+тренера).
+
+Запуск:
+    python session_host.py [сессий] [--seconds N]
+"""
+
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+from clock import RealClock
+from farming_optimizer import FarmingOptimizer, FarmSpot
+from game_integration import GameAnalyzer
+from config import SESSION_WORKERS, SESSION_HISTORY_CAPACITY
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SharedCoachData:
+    """Неизменяемые таблицы, общие для всех сессий"""
+    farm_spots: Tuple[FarmSpot, ...]
+    hero_roles: Optional[Mapping[str, Sequence[str]]] = None  # None - роли текущего индекса каталога
+    static_data: Optional[Mapping] = None  # Каталоги героев и предметов API ({"heroes", "items"})
+
+    @classmethod
+    def build(cls, static_data: Optional[Mapping] = None) -> 'SharedCoachData':
+        return cls(farm_spots=tuple(FarmingOptimizer().farm_spots), static_data=static_data)
+
+
+class CoachSession:
+    """Сессия одного игрока"""
+
+    def __init__(self, session_id: str, coach):
+        self.session_id = session_id
+        self.coach = coach
+        self.busy = False     # Задачи сессии сейчас выполняются в пуле
+        self.ticks = 0
+        self.busy_time = 0.0
+        self.errors = 0
+
+    def get_stats(self) -> Dict:
+        coach = self.coach
+        return {
+            "ticks": self.ticks,
+            "busy_ms": round(self.busy_time * 1000, 1),
+            "errors": self.errors,
+            "published": coach.hub.published,
+            "history": len(coach.game_analyzer.game_state_history)
+            if hasattr(coach.game_analyzer, 'game_state_history') else 0,
+            "tick_budget": coach.tick_budget.get_stats(),
+        }
+
+
+class SessionHost:
+    """
+    N независимых сессий тренера в одном процессе
+
+    Диспетчер спит до ближайшего дедлайна среди всех сессий и отправляет
+    сессии с наступившими задачами в пул. На виртуальных часах сессии
+    выполняются синхронно в потоке диспетчера.
+    """
+
+    def __init__(self, workers: int = SESSION_WORKERS, clock=None,
+                 history_capacity: int = SESSION_HISTORY_CAPACITY,
+                 shared: Optional[SharedCoachData] = None):
+        """
+        Args:
+            workers: Потоков в общем пуле
+            clock: Часы всех сессий (RealClock по умолчанию)
+            history_capacity: Ёмкость истории состояний одной сессии
+            shared: Общие данные (по умолчанию строятся один раз здесь)
+        """
+        self.clock = clock or RealClock()
+        self.workers = workers
+        self.history_capacity = history_capacity
+        self.shared = shared or SharedCoachData.build()
+        self.sessions: Dict[str, CoachSession] = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coach-session")
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.is_running = False
+
+    def add_session(self, session_id: str, game_analyzer=None):
+        """
+        Добавить сессию игрока
+
+        Args:
+            session_id: Идентификатор игрока
+            game_analyzer: Источник состояния игрока (по умолчанию - симуляция)
+
+        Returns:
+            DotaCoach сессии (советы - через coach.hub.subscribe)
+        """
+        from coach import DotaCoach
+        if session_id in self.sessions:
+            raise ValueError(f"Сессия {session_id} уже существует")
+        if game_analyzer is None:
+            game_analyzer = GameAnalyzer(clock=self.clock, detect_process=False,
+                                         history_capacity=self.history_capacity)
+
+        coach = DotaCoach(clock=self.clock, shared=self.shared, game_analyzer=game_analyzer)
+        coach.present_locally = False  # Советы получают фронтенды игрока через хаб сессии
+        coach.is_running = True
+        coach._setup_scheduler()
+
+        # Каталоги API загружаются первой сессией и дальше общие
+        dota_api = getattr(coach.game_analyzer, 'dota_api', None)
+        if self.shared.static_data is None and dota_api is not None and hasattr(dota_api, 'export_static_data'):
+            self.shared = replace(self.shared, static_data=dota_api.export_static_data())
+
+        with self._lock:
+            self.sessions[session_id] = CoachSession(session_id, coach)
+        self._wakeup.set()
+        logger.info(f"➕ Сессия {session_id} добавлена (всего {len(self.sessions)})")
+        return coach
+
+    def remove_session(self, session_id: str):
+        """Завершить сессию игрока"""
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+        if session:
+            session.coach.is_running = False
+            session.coach.analysis_stage.shutdown()
+            logger.info(f"➖ Сессия {session_id} завершена (осталось {len(self.sessions)})")
+
+    def run_pending(self) -> int:
+        """
+        Отправить в пул сессии, у которых наступил дедлайн
+
+        Returns:
+            Сколько сессий отправлено
+        """
+        with self._lock:
+            due = [session for session in self.sessions.values()
+                   if not session.busy and session.coach.scheduler.time_until_next() == 0]
+            for session in due:
+                session.busy = True
+
+        for session in due:
+            if self.clock.virtual:
+                self._run_session(session)
+            else:
+                self.executor.submit(self._run_session, session)
+        return len(due)
+
+    def time_until_next(self) -> Optional[float]:
+        """Сколько ждать до ближайшего дедлайна свободной сессии (None - ждать пробуждения)"""
+        with self._lock:
+            waits = [session.coach.scheduler.time_until_next() for session in self.sessions.values()
+                     if not session.busy]
+        waits = [wait for wait in waits if wait is not None]
+        return min(waits) if waits else None
+
+    def run_forever(self, should_continue: Callable[[], bool]):
+        """Цикл диспетчера"""
+        while should_continue():
+            if self.run_pending():
+                continue
+            self.clock.wait(self._wakeup, self.time_until_next())
+            self._wakeup.clear()
+
+    def start(self):
+        """Запустить диспетчер в отдельном потоке"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._thread = threading.Thread(target=self.run_forever, args=(lambda: self.is_running,),
+                                        daemon=True)
+        self._thread.start()
+        logger.info(f"🏠 Хост сессий запущен ({self.workers} потоков)")
+
+    def stop(self):
+        """Остановить диспетчер и все сессии"""
+        self.is_running = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.executor.shutdown(wait=True)
+        for session_id in list(self.sessions):
+            self.remove_session(session_id)
+        logger.info("⏹️ Хост сессий остановлен")
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            sessions = list(self.sessions.values())
+        return {
+            "sessions": len(sessions),
+            "workers": self.workers,
+            "busy": sum(session.busy for session in sessions),
+            "per_session": {session.session_id: session.get_stats() for session in sessions},
+        }
+
+    def snapshot(self) -> Dict:
+        """Метрики всех сессий (формат MetricsServer: по снимку MetricsRegistry на сессию)"""
+        with self._lock:
+            sessions = list(self.sessions.values())
+        return {
+            "sessions": {session.session_id: dict(session.coach.metrics.snapshot(), **session.get_stats())
+                         for session in sessions},
+        }
+
+    def _run_session(self, session: CoachSession):
+        started = time.perf_counter()
+        try:
+            session.coach.scheduler.run_pending()
+        except Exception as e:
+            session.errors += 1
+            logger.error(f"Ошибка в сессии {session.session_id}: {e}")
+        finally:
+            session.busy_time += time.perf_counter() - started
+            session.ticks += 1
+            session.busy = False
+            self._wakeup.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Несколько сессий тренера в одном процессе")
+    parser.add_argument("sessions", nargs="?", type=int, default=8, help="Сессий (игроков)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Сколько работать")
+    args = parser.parse_args()
+
+    for name in ("coach", "farming_optimizer", "local_strategist", "dota_advisor",
+                 "game_integration", "state_diff", "startup"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    host = SessionHost()
+    for index in range(args.sessions):
+        host.add_session(f"player-{index + 1}")
+    host.start()
+    try:
+        time.sleep(args.seconds)
+    except KeyboardInterrupt:
+        pass
+    stats = host.get_stats()
+    host.stop()
+    for session_id, session in stats["per_session"].items():
+        logger.info(f"{session_id}: тиков {session['ticks']}, занято {session['busy_ms']}мс, "
+                    f"опубликовано {session['published']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Запись и воспроизведение игровых сессий
+SessionRecorder пишет поток game_state, который получает DotaCoach, в файл
+(JSON lines). Воспроизведение прогоняет запись через весь конвейер тренера
+(стратег, оптимизатор фарма, очередь помощника) и меряет задержку каждого тика.
+
+Пример:
+    STATE_RECORD_PATH=session.jsonl python main.py     # записать
+    python session_replay.py session.jsonl --speed 100  # воспроизвести в 100 раз быстрее
+    python session_replay.py session.jsonl --speed 0    # максимально быстро
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from game_state import GameState
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class SessionRecorder:
+    """Запись состояний игры в файл (JSON lines: {"t": смещение, "state": {...}})"""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.monotonic):
+        self.path = path
+        self.clock = clock
+        self._file = open(path, 'a', encoding='utf-8')
+        self._started = clock()
+        self._lock = threading.Lock()
+        self.recorded = 0
+        logger.info(f"📼 Запись сессии в {path}")
+
+    def record(self, game_state):
+        """Записать одно состояние (GameState или словарь)"""
+        data = game_state.to_dict() if hasattr(game_state, 'to_dict') else dict(game_state)
+        line = json.dumps({"t": round(self.clock() - self._started, 3), "state": data},
+                          ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_session(path: str) -> Iterator[Tuple[float, GameState]]:
+    """Прочитать запись: (смещение от начала в секундах, GameState)"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            yield float(entry['t']), GameState.from_dict(entry['state'])
+
+
+class ReplayGameAnalyzer:
+    """Источник состояний из записи (интерфейс GameAnalyzer)"""
+
+    def __init__(self, states: List[GameState]):
+        self.states = states
+        self.position = 0
+        self.is_game_active = True
+
+    def check_game_running(self) -> bool:
+        return self.position < len(self.states)
+
+    def get_current_game_state(self) -> Optional[GameState]:
+        if self.position >= len(self.states):
+            return None
+        state = self.states[self.position]
+        self.position += 1
+        return state
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def replay_session(path: str, speed: float = 1.0, coach=None) -> Dict:
+    """
+    Прогнать запись через конвейер тренера
+
+    Каждый тик выполняет полный набор работы без учёта интервалов
+    планировщика: рассылка изменений, анализ фарма, анализ стратега и
+    постановка рекомендации в очередь помощника. Так нагрузка
+    воспроизводима и сравнима между сборками.
+
+    Args:
+        path: Файл записи
+        speed: Ускорение (1 = реальное время, 100 = в 100 раз быстрее, 0 = без пауз)
+        coach: Готовый DotaCoach (по умолчанию создаётся новый)
+
+    Returns:
+        Отчёт: число тиков, пропускная способность, задержки тиков (мс)
+    """
+    recording = list(read_session(path))
+    if coach is None:
+        from coach import DotaCoach
+        coach = DotaCoach()
+    coach.game_analyzer = ReplayGameAnalyzer([state for _, state in recording])
+
+    latencies: List[float] = []
+    started = time.monotonic()
+
+    for offset, _ in recording:
+        if speed > 0:
+            delay = offset / speed - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+        tick_started = time.perf_counter()
+        coach._poll_game_state()
+        game_state = coach.current_game_state
+        if coach.enable_farming_tips:
+            coach._analyze_and_recommend_farming(game_state)
+        analysis = coach._timed_analysis(game_state)
+        coach._report_analysis(analysis, game_state)
+        coach._arbiter_job()
+        latencies.append((time.perf_counter() - tick_started) * 1000)
+
+    elapsed = time.monotonic() - started
+    ordered = sorted(latencies)
+    report = {
+        "ticks": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_tps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50": round(_percentile(ordered, 0.50), 3),
+            "p95": round(_percentile(ordered, 0.95), 3),
+            "p99": round(_percentile(ordered, 0.99), 3),
+            "max": round(ordered[-1], 3) if ordered else 0.0,
+        },
+        "advice_queued": len(coach.advisor.advice_queue),
+        "stages": coach.metrics.snapshot()["stages"],
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Воспроизвести запись сессии через конвейер тренера")
+    parser.add_argument("recording", help="Файл записи (JSON lines)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Ускорение (0 = максимально быстро)")
+    parser.add_argument("--verbose", action="store_true", help="Не скрывать журнал тренера")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Журнал каждого тика исказит замер на больших скоростях
+        for name in ("coach", "farming_optimizer", "local_strategist", "dota_advisor", "state_diff"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    report = replay_session(args.recording, speed=args.speed)
+    latency = report["latency_ms"]
+    logger.info(f"✓ Тиков: {report['ticks']} за {report['elapsed_s']}с "
+                f"({report['throughput_tps']} тиков/с)")
+    logger.info(f"⏱️ Задержка тика, мс: p50={latency['p50']} p95={latency['p95']} "
+                f"p99={latency['p99']} max={latency['max']}")
+    for stage, summary in report["stages"].items():
+        logger.info(f"   {stage:<18} p50={summary['p50_ms']} p95={summary['p95_ms']} "
+                    f"p99={summary['p99_ms']} (n={summary['count']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Ускоренная симуляция матча
+Тренер работает на виртуальных часах: планировщик, кулдауны, длительность
+советов и игровое время симуляции идут без реального ожидания.
+
+Запуск:
+    python simulate_match.py [минуты_матча] [--verbose]
+"""
+
+import argparse
+import logging
+import time
+from typing import Dict
+
+from clock import VirtualClock
+from game_integration import GameAnalyzer, SIM_SECONDS_PER_GAME_MINUTE
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def simulate_match(minutes: float = 40, coach=None, clock: VirtualClock = None) -> Dict:
+    """
+    Прогнать симулированный матч через тренера
+
+    Args:
+        minutes: Длительность матча в игровых минутах
+        coach: Готовый DotaCoach на виртуальных часах (по умолчанию создаётся новый)
+        clock: Виртуальные часы (по умолчанию берутся из coach или создаются)
+
+    Returns:
+        Отчёт: виртуальное и реальное время, число состояний и советов
+    """
+    if coach is None:
+        from coach import DotaCoach
+        coach = DotaCoach(clock=clock or VirtualClock())
+    clock = coach.clock
+    if not clock.virtual:
+        raise ValueError("Симуляция матча требует виртуальных часов")
+
+    # Процесс игры не нужен - состояние генерирует симуляция
+    coach.game_analyzer = GameAnalyzer(clock=clock, detect_process=False)
+    coach._setup_scheduler()
+
+    virtual_duration = minutes * SIM_SECONDS_PER_GAME_MINUTE
+    virtual_started = clock.monotonic()
+    real_started = time.perf_counter()
+    coach.scheduler.run_forever(lambda: clock.monotonic() - virtual_started < virtual_duration)
+    real_elapsed = time.perf_counter() - real_started
+    coach.analysis_stage.shutdown()
+
+    return {
+        "game_minutes": coach.game_analyzer.last_update.game_time if coach.game_analyzer.last_update else 0,
+        "virtual_s": round(clock.monotonic() - virtual_started, 1),
+        "real_s": round(real_elapsed, 3),
+        "states": coach.game_analyzer.game_state_history.total,
+        "analyses": coach.analysis_stage.completed,
+        "advice_shown": coach.advisor.advice_shown,
+        "jobs": {name: job.run_count for name, job in coach.scheduler.jobs.items()},
+        "tick_budget": coach.tick_budget.get_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ускоренная симуляция матча")
+    parser.add_argument("minutes", nargs="?", type=float, default=40, help="Игровых минут")
+    parser.add_argument("--verbose", action="store_true", help="Не скрывать журнал тренера")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        for name in ("coach", "farming_optimizer", "local_strategist", "dota_advisor",
+                     "game_integration", "state_diff"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    report = simulate_match(args.minutes)
+    logger.info(f"✓ {args.minutes:g} игровых минут (до {report['game_minutes']}-й, "
+                f"{report['virtual_s']}с виртуально) за {report['real_s']}с реального времени")
+    logger.info(f"   Состояний: {report['states']}, анализов: {report['analyses']}, "
+                f"советов показано: {report['advice_shown']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Параллельный холодный старт
+Независимые компоненты (статические данные, карта фарма, TTS, окно помощника)
+создаются одновременно в пуле потоков: время старта - самая долгая задача,
+а не их сумма.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ParallelInit:
+    """
+    Набор независимых задач инициализации
+
+    Задачи не должны зависеть друг от друга. Если задача упала, исключение
+    пробрасывается из run() после завершения остальных - как при
+    последовательном создании.
+    """
+
+    def __init__(self, max_workers: int = 4, metrics=None):
+        """
+        Args:
+            max_workers: Потоков (1 = последовательно, в текущем потоке)
+            metrics: MetricsRegistry для длительностей init.<задача>
+        """
+        self.max_workers = max_workers
+        self.metrics = metrics
+        self._tasks: List[Tuple[str, Callable[[], Any]]] = []
+        self.durations: Dict[str, float] = {}
+        self.elapsed: Optional[float] = None
+
+    def add(self, name: str, func: Callable[[], Any]):
+        """Добавить задачу; результат будет в run()[name]"""
+        self._tasks.append((name, func))
+
+    def run(self) -> Dict[str, Any]:
+        """Выполнить все задачи и вернуть их результаты по имени"""
+        started = time.perf_counter()
+        if self.max_workers <= 1 or len(self._tasks) <= 1:
+            results = {name: self._timed(name, func) for name, func in self._tasks}
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self._tasks)),
+                                    thread_name_prefix="coach-init") as executor:
+                futures = [(name, executor.submit(self._timed, name, func)) for name, func in self._tasks]
+                # result() пробрасывает исключение первой упавшей задачи
+                results = {name: future.result() for name, future in futures}
+        self.elapsed = time.perf_counter() - started
+
+        slowest = max(self.durations.items(), key=lambda item: item[1], default=("-", 0.0))
+        logger.info(f"✓ Компоненты готовы за {self.elapsed * 1000:.0f}мс "
+                    f"(сумма задач {sum(self.durations.values()) * 1000:.0f}мс, "
+                    f"дольше всех {slowest[0]} - {slowest[1] * 1000:.0f}мс)")
+        return results
+
+    def _timed(self, name: str, func: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return func()
+        finally:
+            duration = time.perf_counter() - started
+            self.durations[name] = duration
+            if self.metrics:
+                self.metrics.record(f"init.{name}", duration)
+            logger.debug(f"Инициализация {name}: {duration * 1000:.1f}мс")
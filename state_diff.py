@@ -0,0 +1,206 @@
+"""
+Сравнение соседних состояний игры
+Выдаёт типизированный набор изменений и рассылает его только тем
+потребителям, чьи входные поля затронуты
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ChangeKind(Enum):
+    """Типы изменений"""
+    MOVED = "moved"                      # Герой сменил позицию
+    HP_DROPPED = "hp_dropped"            # HP уменьшилось
+    HP_RESTORED = "hp_restored"          # HP выросло
+    ENEMY_VISIBLE = "enemy_visible"      # Враг появился в поле зрения
+    ENEMY_HIDDEN = "enemy_hidden"        # Враг пропал из поля зрения
+    GOLD_THRESHOLD = "gold_threshold"    # Золото пересекло порог
+    LEVEL_UP = "level_up"                # Новый уровень
+    VALUE_CHANGED = "value_changed"      # Любое другое поле
+
+
+@dataclass(frozen=True)
+class Change:
+    """Одно изменение"""
+    kind: ChangeKind
+    field: str          # Поле game_state верхнего уровня
+    old: Any = None
+    new: Any = None
+    detail: Any = None  # Расстояние, величина урона, имя героя, порог...
+
+
+class ChangeSet:
+    """Набор изменений между двумя состояниями"""
+
+    def __init__(self, changes: Optional[List[Change]] = None, full: bool = False):
+        """
+        Args:
+            changes: Список изменений
+            full: True если предыдущего состояния нет (изменилось всё)
+        """
+        self.changes = changes or []
+        self.full = full
+        self.fields: Set[str] = {change.field for change in self.changes}
+
+    def touches(self, fields: Iterable[str]) -> bool:
+        """Затронуто ли хотя бы одно из полей"""
+        return self.full or not self.fields.isdisjoint(fields)
+
+    def of_kind(self, kind: ChangeKind) -> List[Change]:
+        return [change for change in self.changes if change.kind == kind]
+
+    def __bool__(self) -> bool:
+        return self.full or bool(self.changes)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __repr__(self) -> str:
+        if self.full:
+            return "ChangeSet(full)"
+        return f"ChangeSet({[f'{c.kind.value}:{c.field}' for c in self.changes]})"
+
+
+# Поля, которые меняются каждый тик и не несут смысла для анализа
+IGNORED_FIELDS = frozenset({'timestamp', 'recent_events'})
+
+
+class StateDiffer:
+    """Сравнивает два game_state (GameState или словари)"""
+
+    def __init__(self, gold_thresholds: Sequence[int] = (500, 1000, 2000, 3000, 4000, 5500)):
+        """
+        Args:
+            gold_thresholds: Пороги золота (примерно цены ключевых предметов)
+        """
+        self.gold_thresholds = tuple(sorted(gold_thresholds))
+
+    def diff(self, old, new) -> ChangeSet:
+        """
+        Сравнить состояния
+
+        Returns:
+            ChangeSet; если old is None - полный набор (full=True)
+        """
+        if old is None:
+            return ChangeSet(full=True)
+
+        changes: List[Change] = []
+        for field in self._fields(old, new):
+            before, after = old.get(field), new.get(field)
+            if field in ('allies', 'enemies'):
+                before, after = self._team(before), self._team(after)
+            if before == after:
+                continue
+
+            if field == 'hero_position':
+                changes.append(Change(ChangeKind.MOVED, field, before, after,
+                                      self._distance(before, after)))
+            elif field == 'hp' and before is not None and after is not None:
+                kind = ChangeKind.HP_DROPPED if after < before else ChangeKind.HP_RESTORED
+                changes.append(Change(kind, field, before, after, abs(after - before)))
+            elif field == 'level' and before is not None and after is not None and after > before:
+                changes.append(Change(ChangeKind.LEVEL_UP, field, before, after))
+            elif field == 'gold':
+                changes.append(Change(ChangeKind.VALUE_CHANGED, field, before, after))
+                changes.extend(self._gold_thresholds(before or 0, after or 0))
+            elif field == 'enemies':
+                changes.append(Change(ChangeKind.VALUE_CHANGED, field, before, after))
+                changes.extend(self._visibility(before, after))
+            else:
+                changes.append(Change(ChangeKind.VALUE_CHANGED, field, before, after))
+
+        return ChangeSet(changes)
+
+    @staticmethod
+    def _fields(old, new) -> List[str]:
+        fields = list(old.keys())
+        seen = set(fields)
+        fields.extend(key for key in new.keys() if key not in seen)
+        return [field for field in fields if field not in IGNORED_FIELDS]
+
+    @staticmethod
+    def _team(team) -> Tuple:
+        """Привести команду к сравнимому виду: ((имя, уровень, видим, hp), ...)"""
+        if not team:
+            return ()
+        return tuple((hero.get('name'), hero.get('level'), hero.get('visible'), hero.get('hp_percent'))
+                     for hero in team)
+
+    @staticmethod
+    def _distance(before, after) -> Optional[float]:
+        if not before or not after:
+            return None
+        return math.hypot(after[0] - before[0], after[1] - before[1])
+
+    def _gold_thresholds(self, before: int, after: int) -> List[Change]:
+        low, high = min(before, after), max(before, after)
+        return [
+            Change(ChangeKind.GOLD_THRESHOLD, 'gold', before, after, threshold)
+            for threshold in self.gold_thresholds
+            if low < threshold <= high
+        ]
+
+    @staticmethod
+    def _visibility(before: Tuple, after: Tuple) -> List[Change]:
+        was_visible = {hero[0]: bool(hero[2]) for hero in before}
+        changes = []
+        for name, _, visible, _ in after:
+            previously = was_visible.get(name, False)
+            if visible and not previously:
+                changes.append(Change(ChangeKind.ENEMY_VISIBLE, 'enemies', False, True, name))
+            elif previously and not visible:
+                changes.append(Change(ChangeKind.ENEMY_HIDDEN, 'enemies', True, False, name))
+        return changes
+
+
+class StateDiffBus:
+    """
+    Рассылка изменений подписчикам
+
+    Каждый подписчик указывает поля, от которых зависит, и получает
+    вызов только когда они изменились.
+    """
+
+    def __init__(self, differ: Optional[StateDiffer] = None):
+        self.differ = differ or StateDiffer()
+        self._subscribers: List[Tuple[frozenset, Callable[[ChangeSet, Any], None]]] = []
+        self.published = 0
+        self.deliveries = 0
+        self.skipped = 0
+
+    def subscribe(self, fields: Iterable[str], callback: Callable[[ChangeSet, Any], None]):
+        """
+        Подписаться на изменения полей
+
+        Args:
+            fields: Поля game_state, от которых зависит потребитель
+            callback: Функция (changes, new_state)
+        """
+        self._subscribers.append((frozenset(fields), callback))
+
+    def publish(self, old, new) -> ChangeSet:
+        """Сравнить состояния и разослать изменения"""
+        changes = self.differ.diff(old, new)
+        self.published += 1
+        for fields, callback in self._subscribers:
+            if changes.touches(fields):
+                self.deliveries += 1
+                callback(changes, new)
+            else:
+                self.skipped += 1
+        return changes
+
+    def get_stats(self) -> Dict:
+        return {
+            "published": self.published,
+            "deliveries": self.deliveries,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,147 @@
+"""
+История состояний игры фиксированного размера
+Числовые ряды хранятся в заранее выделенных столбцах NumPy (кольцевой буфер),
+поэтому память не растёт со временем матча
+"""
+
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class StateHistory:
+    """
+    Кольцевой буфер числовых рядов game_state
+
+    Каждое значение пишется дважды (в позицию i и i + capacity), поэтому
+    последние n значений всегда лежат в памяти подряд и window() отдаёт
+    их как представление без копирования.
+    """
+
+    FIELDS = ('game_time', 'gold', 'last_hits', 'hp', 'level',
+              'team_gold', 'enemy_gold', 'nearby_enemy_count')
+
+    def __init__(self, capacity: int = 3600):
+        """
+        Args:
+            capacity: Сколько последних состояний хранить
+        """
+        if capacity <= 0:
+            raise ValueError("Ёмкость истории должна быть > 0")
+        self.capacity = capacity
+        self._columns = np.zeros((len(self.FIELDS), 2 * capacity), dtype=np.int32)
+        self._times = np.zeros(2 * capacity, dtype=np.float64)
+        self._field_index = {name: i for i, name in enumerate(self.FIELDS)}
+        self._head = 0   # Куда писать следующее значение (0..capacity-1)
+        self._size = 0   # Сколько значений хранится
+        self.total = 0   # Сколько состояний добавлено за всё время
+
+    def append(self, game_state, timestamp: float = 0.0):
+        """
+        Добавить состояние (O(1), буфер не растёт)
+
+        Args:
+            game_state: GameState или словарь game_state
+            timestamp: Время состояния (например created_at или monotonic)
+        """
+        head, mirror = self._head, self._head + self.capacity
+        if hasattr(game_state, 'scalars'):
+            values = game_state.scalars(self.FIELDS)   # GameState: одна распаковка записи
+        else:
+            values = [game_state.get(name, 0) or 0 for name in self.FIELDS]
+        columns = self._columns
+        columns[:, head] = values
+        columns[:, mirror] = columns[:, head]
+        self._times[head] = self._times[mirror] = timestamp
+
+        self._head = (head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.total += 1
+
+    def window(self, field: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        Последние n значений ряда в хронологическом порядке (без копирования)
+
+        Args:
+            field: Имя ряда из FIELDS
+            n: Длина окна (по умолчанию - вся история)
+
+        Returns:
+            Представление только для чтения
+        """
+        view = self._slice(self._columns[self._field_index[field]], n)
+        view.flags.writeable = False
+        return view
+
+    def times(self, n: Optional[int] = None) -> np.ndarray:
+        """Метки времени последних n состояний (без копирования)"""
+        view = self._slice(self._times, n)
+        view.flags.writeable = False
+        return view
+
+    def windows(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Окна всех рядов сразу"""
+        return {field: self.window(field, n) for field in self.FIELDS}
+
+    def latest(self, field: str) -> Optional[int]:
+        """Последнее значение ряда (None если история пуста)"""
+        if not self._size:
+            return None
+        return int(self._columns[self._field_index[field], self._head + self.capacity - 1])
+
+    def clear(self):
+        """Очистить историю (например, при начале нового матча)"""
+        self._head = 0
+        self._size = 0
+        self.total = 0
+
+    def export(self) -> Dict:
+        """Содержимое истории в виде списков (для снимка тёплого старта)"""
+        return {
+            "fields": list(self.FIELDS),
+            "times": self.times().tolist(),
+            "columns": {field: self.window(field).tolist() for field in self.FIELDS},
+            "total": self.total,
+        }
+
+    def restore(self, data: Dict):
+        """
+        Вставить сохранённую историю перед текущими значениями
+
+        Args:
+            data: Результат export() (поля должны совпадать)
+        """
+        if list(data.get("fields", ())) != list(self.FIELDS):
+            raise ValueError("Поля сохранённой истории не совпадают")
+        saved_total = int(data.get("total", len(data["times"])))
+        times = np.concatenate([np.asarray(data["times"], dtype=np.float64), self.times()])[-self.capacity:]
+        columns = np.stack([
+            np.concatenate([np.asarray(data["columns"][field], dtype=np.int32), self.window(field)])
+            for field in self.FIELDS
+        ])[:, -self.capacity:]
+
+        n = len(times)
+        self._columns[:, :n] = columns
+        self._columns[:, self.capacity:self.capacity + n] = columns
+        self._times[:n] = times
+        self._times[self.capacity:self.capacity + n] = times
+        self._head = n % self.capacity
+        self._size = n
+        self.total += saved_total
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Память, занятая буфером (постоянна)"""
+        return self._columns.nbytes + self._times.nbytes
+
+    def _slice(self, column: np.ndarray, n: Optional[int]) -> np.ndarray:
+        n = self._size if n is None else max(0, min(n, self._size))
+        end = self._head + self.capacity
+        return column[end - n:end]
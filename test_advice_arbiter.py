@@ -0,0 +1,95 @@
+"""
+Тестирование арбитра рекомендаций
+"""
+
+import logging
+from advice_arbiter import RecommendationArbiter
+from clock import VirtualClock
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_winner_by_priority_and_freshness():
+    """Побеждает важный совет; со временем свежий обгоняет старый"""
+    clock = VirtualClock()
+    arbiter = RecommendationArbiter(max_per_minute=10, half_life=5.0, clock=clock.monotonic)
+    arbiter.offer("recommendation", {"message": "стратегия", "priority": 6})
+    arbiter.offer("farm_route", {"message": "лес", "priority": 7})
+    assert arbiter.select().topic == "farm_route"
+
+    arbiter.offer("recommendation", {"message": "старое", "priority": 8}, source="strategy")
+    clock.advance(10)  # 8 * 0.25 = 2
+    arbiter.offer("farm_route", {"message": "новое", "priority": 5})
+    assert arbiter.select().data["message"] == "новое"
+    logger.info("✓ Оценка по приоритету и свежести")
+
+
+def test_budget_and_staleness():
+    """Бюджет в минуту соблюдается, срочное проходит, старое отбрасывается"""
+    clock = VirtualClock()
+    arbiter = RecommendationArbiter(max_per_minute=2, max_age=20.0, clock=clock.monotonic)
+    emitted = 0
+    for second in range(60):
+        arbiter.offer("farm_route", {"priority": 7})
+        if arbiter.select():
+            emitted += 1
+        clock.advance(1)
+    assert emitted == 2
+    assert arbiter.replaced > 0 and arbiter.deferred > 0
+
+    arbiter.offer("recommendation", {"message": "враги рядом", "priority": 9}, source="danger")
+    clock.advance(0.5)
+    assert arbiter.select().source == "danger"  # Срочное - вне бюджета
+
+    clock.advance(21)
+    assert arbiter.select() is None
+    assert arbiter.pending == 0 and arbiter.dropped_stale >= 1
+    assert arbiter.budget_left() == 1  # Срочный совет тоже расходует бюджет
+    logger.info(f"✓ Бюджет и устаревание: {arbiter.get_stats()}")
+
+
+def test_urgent_passes_behind_fresher_advice():
+    """При исчерпанном бюджете срочный совет не блокируется более свежим обычным"""
+    clock = VirtualClock()
+    arbiter = RecommendationArbiter(max_per_minute=1, max_age=20.0, half_life=10.0,
+                                    clock=clock.monotonic)
+    arbiter.offer("farm_route", {"priority": 5})
+    assert arbiter.select() is not None  # Бюджет израсходован
+
+    arbiter.offer("recommendation", {"message": "враги рядом", "priority": 9}, source="danger")
+    clock.advance(15)  # 9 * 0.5^1.5 ~ 3.2
+    arbiter.offer("farm_route", {"message": "лес", "priority": 6})
+    winner = arbiter.select()
+    assert winner is not None and winner.source == "danger"
+    assert arbiter.select() is None and arbiter.pending == 1  # Обычный ждёт бюджета
+    logger.info("✓ Срочный совет проходит при исчерпанном бюджете")
+
+
+def test_coach_queue_stays_bounded():
+    """Очередь помощника не растёт за долгий матч"""
+    from coach import DotaCoach
+    from simulate_match import simulate_match
+
+    coach = DotaCoach(clock=VirtualClock())
+    coach.farm_analysis_cooldown = 2   # Анализаторы предлагают гораздо чаще бюджета
+    coach.recommendation_cooldown = 3
+    report = simulate_match(minutes=20, coach=coach)
+    stats = coach.arbiter.get_stats()
+    minutes = report["virtual_s"] / 60
+
+    assert stats["offered"] > stats["emitted"]
+    assert stats["emitted"] <= coach.arbiter.max_per_minute * (minutes + 1)
+    assert len(coach.advisor.advice_queue) <= 1
+    logger.info(f"✓ {report['virtual_s']}с матча: предложено {stats['offered']}, "
+                f"показано {report['advice_shown']}")
+
+
+if __name__ == "__main__":
+    test_winner_by_priority_and_freshness()
+    test_budget_and_staleness()
+    test_urgent_passes_behind_fresher_advice()
+    test_coach_queue_stays_bounded()
@@ -0,0 +1,72 @@
+"""
+Тестирование фонового этапа анализа
+"""
+
+import logging
+import threading
+import time
+from analysis_worker import AnalysisStage
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _wait_idle(stage: AnalysisStage, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while stage.queue_depth and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_submit_does_not_block_and_latest_wins():
+    """submit не ждёт анализа, а ожидающее состояние замещается новым"""
+    release = threading.Event()
+    seen = []
+
+    def slow_analyze(game_state):
+        release.wait(2.0)
+        seen.append(game_state["tick"])
+        return {"status": "success", "recommendations": []}
+
+    stage = AnalysisStage(slow_analyze, max_age=60.0)
+
+    started = time.monotonic()
+    for tick in range(5):
+        stage.submit({"tick": tick})
+    assert time.monotonic() - started < 0.5
+    assert stage.queue_depth == 2
+
+    release.set()
+    _wait_idle(stage)
+
+    # Первое состояние уже было в работе, затем анализируется только самое новое
+    assert seen == [0, 4]
+    assert stage.cancelled == 3
+
+    result = stage.poll()
+    assert result is not None and result.game_state["tick"] == 4
+    assert stage.get_stats()["last_result_age"] is not None
+    stage.shutdown()
+    logger.info(f"✓ Статистика: {stage.get_stats()}")
+
+
+def test_stale_results_are_dropped():
+    """Результат по устаревшему состоянию не выдаётся"""
+    now = [0.0]
+    stage = AnalysisStage(lambda gs: {"status": "success"}, max_age=5.0, clock=lambda: now[0])
+
+    stage.submit({"tick": 1})
+    _wait_idle(stage)
+
+    now[0] = 10.0
+    assert stage.poll() is None
+    assert stage.dropped_stale == 1
+    stage.shutdown()
+    logger.info("✓ Устаревший результат отброшен")
+
+
+if __name__ == "__main__":
+    test_submit_does_not_block_and_latest_wins()
+    test_stale_results_are_dropped()
@@ -0,0 +1,102 @@
+"""
+Тестирование asyncio-ядра тренера
+"""
+
+import logging
+import threading
+import time
+from async_coach import AsyncCoachRunner
+from game_integration import GameAnalyzer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _coach():
+    from coach import DotaCoach
+    coach = DotaCoach()
+    coach.game_analyzer = GameAnalyzer(detect_process=False)
+    coach.is_running = True
+    coach.farm_analysis_cooldown = 0.2
+    coach.recommendation_cooldown = 0.2
+    return coach
+
+
+def test_tasks_run_and_overlap_blocking_io():
+    """Медленное чтение состояния не задерживает обновление оверлея"""
+    coach = _coach()
+    fetch = coach.game_analyzer.get_current_game_state
+
+    def slow_fetch():
+        time.sleep(0.3)
+        return fetch()
+
+    coach.game_analyzer.get_current_game_state = slow_fetch
+    runner = AsyncCoachRunner(coach, poll_interval=0.05, ui_interval=0.05, jitter=0)
+    coach.async_runner = runner
+    threading.Timer(1.2, coach.stop).start()
+
+    started = time.monotonic()
+    runner.run()
+    assert time.monotonic() - started < 2.0
+
+    runs = runner.task_runs
+    assert runs["ui_heartbeat"] >= 15          # цикл не ждал чтения состояния
+    assert 2 <= runs["poll_state"] <= 4         # чтение шло в своём пуле
+    assert runs["strategy"] >= 1 and runs["farming"] >= 1
+    assert coach.advisor.advice_shown + len(coach.advisor.advice_queue) >= 2
+    logger.info(f"✓ Запуски задач: {runs}")
+
+
+def test_shutdown_cancels_blocked_analysis():
+    """Остановка не ждёт зависший анализ"""
+    coach = _coach()
+    coach.strategist.analyze_situation = lambda *args, **kwargs: time.sleep(5)
+    runner = AsyncCoachRunner(coach, poll_interval=0.05, jitter=0)
+    coach.async_runner = runner
+    threading.Timer(0.4, coach.stop).start()
+
+    started = time.monotonic()
+    runner.run()
+    assert time.monotonic() - started < 1.5
+    assert runner.analysis_executor._shutdown
+    assert coach.speech_blocking
+    logger.info("✓ Структурная отмена при остановке")
+
+
+def test_speech_stays_on_one_thread():
+    """Движок TTS создаётся и озвучивает в одном потоке озвучивания"""
+    import voice_assistant
+    threads = []
+
+    class StubAssistant:
+        def __init__(self, language):
+            threads.append(("init", threading.current_thread().name))
+
+        def speak(self, text):
+            threads.append(("speak", threading.current_thread().name))
+
+    original = voice_assistant.VoiceAssistant
+    voice_assistant.VoiceAssistant = StubAssistant
+    try:
+        coach = _coach()
+        coach._speak("раз")
+        coach.speech_blocking = False
+        coach._speak("два")
+        coach._speech_executor.shutdown(wait=True)
+    finally:
+        voice_assistant.VoiceAssistant = original
+
+    assert [kind for kind, _ in threads] == ["init", "speak", "speak"]
+    assert len({name for _, name in threads}) == 1
+    assert threads[0][1].startswith("coach-speech")
+    logger.info(f"✓ Озвучивание в потоке {threads[0][1]}")
+
+
+if __name__ == "__main__":
+    test_tasks_run_and_overlap_blocking_io()
+    test_shutdown_cancels_blocked_analysis()
+    test_speech_stays_on_one_thread()
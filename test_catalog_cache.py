@@ -0,0 +1,165 @@
+"""
+Тестирование кэша каталогов героев и предметов на диске
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from catalog_cache import CatalogCache, CATALOG_VERSION
+from dota2_api import Dota2WebAPI
+from hero_index import BASE_INDEX, install_index
+from http_client import ApiClient
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class _StubCatalog(BaseHTTPRequestHandler):
+    """Заглушка GetHeroes/GetGameItems со счётчиком запросов (каждый каталог - на двух языках)"""
+    protocol_version = "HTTP/1.1"
+    requests_served = 0
+    hero = "npc_dota_hero_antimage"
+
+    def do_GET(self):
+        type(self).requests_served += 1
+        if "GetHeroes" in self.path and "language=ru_ru" in self.path:
+            payload = {"result": {"heroes": [{"id": 1, "name": type(self).hero, "localized_name": "Антимаг"}]}}
+        elif "GetHeroes" in self.path:
+            payload = {"result": {"heroes": [{"id": 1, "name": type(self).hero}]}}
+        else:
+            payload = {"result": {"items": [{"id": 1, "name": "item_blink"}]}}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _setup():
+    _StubCatalog.requests_served = 0
+    _StubCatalog.hero = "npc_dota_hero_antimage"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubCatalog)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_class = type("StubDota2WebAPI", (Dota2WebAPI,),
+                     {"API_URL": f"http://127.0.0.1:{server.server_address[1]}"})
+    return server, api_class, ApiClient(retries=0)
+
+
+def test_second_start_reads_cache():
+    """Первый запуск загружает каталоги из API и сохраняет, второй - читает с диска"""
+    server, api_class, client = _setup()
+    clock = _Clock()
+    path = os.path.join(tempfile.mkdtemp(), "cache", "catalog.json")
+    try:
+        first = api_class("key", http=client, catalog_cache=CatalogCache(path, ttl=60, clock=clock))
+        assert "antimage" in first.heroes and _StubCatalog.requests_served == 4
+        assert os.path.exists(path)
+
+        cache = CatalogCache(path, ttl=60, clock=clock)
+        second = api_class("key", http=client, catalog_cache=cache)
+        assert second.heroes == first.heroes and second.items == first.items
+        assert _StubCatalog.requests_served == 4  # Без запросов к API
+        assert second.get_hero("Антимаг").id == 1  # Русские имена сохранены в кэше
+        assert second.catalog_refresh is None
+        logger.info(f"✓ Каталоги из кэша за {cache.last_load_ms:.2f}мс")
+    finally:
+        client.close()
+        server.shutdown()
+        install_index(BASE_INDEX)
+
+
+def test_stale_cache_refreshes_in_background():
+    """Устаревший кэш используется сразу и обновляется в фоне"""
+    server, api_class, client = _setup()
+    clock = _Clock()
+    path = os.path.join(tempfile.mkdtemp(), "catalog.json")
+    try:
+        CatalogCache(path, clock=clock).save({"antimage": {"id": 1}}, {"blink": {"id": 1}})
+        clock.now += 120
+        _StubCatalog.hero = "npc_dota_hero_axe"
+
+        cache = CatalogCache(path, ttl=60, clock=clock)
+        api = api_class("key", http=client, catalog_cache=cache)
+        assert "antimage" in api.heroes  # Старая копия доступна сразу
+        api.catalog_refresh.join(timeout=5)
+        assert "axe" in api.heroes and "antimage" not in api.heroes
+        assert _StubCatalog.requests_served == 4
+        assert api.get_hero(1).internal_name == "npc_dota_hero_axe"  # Индекс перестроен
+
+        refreshed = CatalogCache(path, ttl=60, clock=clock).load()
+        assert "axe" in refreshed["heroes"] and refreshed["fetched_at"] == clock.now
+        logger.info("✓ Устаревший кэш обновлён в фоне")
+    finally:
+        client.close()
+        server.shutdown()
+        install_index(BASE_INDEX)
+
+
+def test_failed_refresh_keeps_cache_stale():
+    """Неудачное обновление не продлевает устаревший кэш"""
+    server, api_class, client = _setup()
+    server.shutdown()
+    server.server_close()  # API недоступен
+    clock = _Clock()
+    path = os.path.join(tempfile.mkdtemp(), "catalog.json")
+    try:
+        CatalogCache(path, clock=clock).save({"antimage": {"id": 1}}, {"blink": {"id": 1}})
+        saved_at = clock.now
+        clock.now += 100_000
+
+        cache = CatalogCache(path, ttl=60, clock=clock)
+        api = api_class("key", http=client, catalog_cache=cache)
+        api.catalog_refresh.join(timeout=5)
+        assert "antimage" in api.heroes and cache.saved == 0
+        stale = CatalogCache(path, ttl=60, clock=clock).load()
+        assert stale["fetched_at"] == saved_at and not cache.is_fresh(stale)
+        assert api.load_static_data() is False
+        logger.info("✓ Неудачное обновление не продлевает кэш")
+    finally:
+        client.close()
+        install_index(BASE_INDEX)
+
+
+def test_invalid_cache_is_ignored():
+    """Повреждённый файл и файл другой версии не загружаются"""
+    path = os.path.join(tempfile.mkdtemp(), "catalog.json")
+    cache = CatalogCache(path)
+    assert cache.load() is None
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("{broken")
+    assert cache.load() is None
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"version": CATALOG_VERSION + 1, "fetched_at": 0,
+                   "heroes": {"a": {}}, "items": {"b": {}}}, f)
+    assert cache.load() is None
+
+    cache.save({"a": {}}, {"b": {}})
+    assert cache.load()["heroes"] == {"a": {}}
+    logger.info("✓ Некорректный кэш игнорируется")
+
+
+if __name__ == "__main__":
+    test_second_start_reads_cache()
+    test_stale_cache_refreshes_in_background()
+    test_failed_refresh_keeps_cache_stale()
+    test_invalid_cache_is_ignored()
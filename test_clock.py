@@ -0,0 +1,98 @@
+"""
+Тестирование виртуальных часов и ускоренной симуляции матча
+"""
+
+import logging
+import threading
+import time
+from clock import VirtualClock
+from dota_advisor import DotaAdvisor, AdvisorType
+from scheduler import TaskScheduler
+from simulate_match import simulate_match
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_virtual_clock_timers():
+    """Таймеры срабатывают по порядку при сдвиге часов"""
+    clock = VirtualClock(start=100.0, wall_start=1700000000.0)
+    fired = []
+    clock.call_later(5, lambda: fired.append(("b", clock.monotonic())))
+    clock.call_later(2, lambda: fired.append(("a", clock.monotonic())))
+    cancelled = clock.call_later(3, lambda: fired.append(("x", clock.monotonic())))
+    cancelled.cancel()
+
+    clock.sleep(4)
+    assert fired == [("a", 102.0)]
+    assert clock.time() == 1700000004.0
+
+    # Ожидание без таймаута доходит до ближайшего таймера
+    assert not clock.wait(threading.Event())
+    assert fired == [("a", 102.0), ("b", 105.0)]
+
+    # Таймеров больше нет - бесконечное ожидание было бы холостым циклом
+    try:
+        clock.wait(threading.Event())
+        assert False, "ожидание без таймаута и таймеров должно отклоняться"
+    except RuntimeError:
+        pass
+    assert clock.monotonic() == 105.0
+    event = threading.Event()
+    event.set()
+    assert clock.wait(event)
+    logger.info("✓ Таймеры виртуальных часов")
+
+
+def test_scheduler_runs_hour_instantly():
+    """Час работы планировщика проходит без реального ожидания"""
+    clock = VirtualClock()
+    scheduler = TaskScheduler(clock=clock.monotonic, wait=clock.wait)
+    scheduler.add_job("poll", lambda: None, 1.0)
+    scheduler.add_job("strategy", lambda: None, 30.0)
+
+    started = time.perf_counter()
+    scheduler.run_forever(lambda: clock.monotonic() < 3600)
+    assert time.perf_counter() - started < 2.0
+    assert scheduler.jobs["poll"].run_count == 3600
+    assert scheduler.jobs["strategy"].run_count == 120
+    logger.info("✓ Час планировщика за доли секунды")
+
+
+def test_advice_duration_uses_clock():
+    """Совет скрывается по часам, без окна"""
+    clock = VirtualClock()
+    advisor = DotaAdvisor(clock=clock)
+    advisor.show_advice("Фарми лес", AdvisorType.FARMING, priority=3, duration=8.0)
+    advisor.show_advice("Опасно!", AdvisorType.DANGER, priority=9, duration=4.0)
+
+    advisor.tick()
+    assert advisor.current_advice.text == "Опасно!"
+    clock.advance(4.0)
+    advisor.tick()
+    assert advisor.current_advice.text == "Фарми лес"
+    clock.advance(8.0)
+    advisor.tick()
+    assert advisor.current_advice is None and advisor.advice_shown == 2
+    logger.info("✓ Длительность советов по часам")
+
+
+def test_simulated_match():
+    """Целый матч симулируется за секунды"""
+    started = time.perf_counter()
+    report = simulate_match(minutes=40)
+    assert time.perf_counter() - started < 10.0
+    assert report["virtual_s"] >= 240
+    assert report["states"] > 200
+    assert report["analyses"] > 0 and report["advice_shown"] > 0
+    logger.info(f"✓ Матч: {report}")
+
+
+if __name__ == "__main__":
+    test_virtual_clock_timers()
+    test_scheduler_runs_hour_instantly()
+    test_advice_duration_uses_clock()
+    test_simulated_match()
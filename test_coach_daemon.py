@@ -0,0 +1,144 @@
+"""
+Тестирование демона тренера и подписки фронтендов
+"""
+
+import logging
+import time
+from coach_daemon import MAX_REQUEST_LINE, CoachClient, RecommendationHub
+from game_integration import GameAnalyzer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _wait_for_remote(hub: RecommendationHub, count: int, filtered: int = 0):
+    """Дождаться подключения count клиентов, из них filtered - с применённой подпиской"""
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        stats = hub.get_stats()
+        if stats["remote_subscribers"] >= count and stats["filtered_subscribers"] >= filtered:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"Клиенты не подключились: {hub.get_stats()}")
+
+
+def test_local_subscribers_filter_topics():
+    hub = RecommendationHub()
+    received = []
+    hub.subscribe(("threats",), lambda topic, data: received.append((topic, data)))
+    hub.subscribe(None, lambda topic, data: received.append(("all", topic)))
+
+    hub.publish("threats", {"danger_level": 0.4})
+    hub.publish("farm_route", {"message": "лес"})
+
+    assert received == [("threats", {"danger_level": 0.4}), ("all", "threats"), ("all", "farm_route")]
+    logger.info("✓ Локальные подписчики")
+
+
+def test_socket_fanout():
+    """Несколько фронтендов получают сообщения по сокету"""
+    hub = RecommendationHub(port=0)
+    hub.start()
+    hub.publish("recommendation", {"message": "старое"})
+    try:
+        everything = CoachClient(port=hub.port, timeout=2)
+        threats_only = CoachClient(port=hub.port, topics=["threats"], timeout=2)
+        _wait_for_remote(hub, 2, filtered=1)
+
+        hub.publish("farm_route", {"message": "лес"})
+        hub.publish("threats", {"danger_level": 0.7})
+
+        # Последнее сообщение каждой темы приходит сразу после подключения
+        assert [everything.receive()["topic"] for _ in range(3)] == ["recommendation", "farm_route", "threats"]
+        message = threats_only.receive()
+        assert message["topic"] == "threats" and message["data"] == {"danger_level": 0.7}
+        everything.close()
+        threats_only.close()
+    finally:
+        hub.stop()
+    logger.info(f"✓ Рассылка по сокету: {hub.get_stats()}")
+
+
+def test_requests_in_one_packet():
+    """Несколько запросов в одном пакете применяются все, без ожидания следующего"""
+    hub = RecommendationHub(port=0)
+    hub.start()
+    try:
+        client = CoachClient(port=hub.port, timeout=2)
+        client.sock.sendall(b'{"subscribe": ["farm_route"]}\n{"subscribe": ["threats"]}\n')
+        _wait_for_remote(hub, 1, filtered=1)
+        deadline = time.monotonic() + 2
+        while hub._remote[0].topics != {"threats"} and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert hub._remote[0].topics == {"threats"}
+
+        hub.publish("farm_route", {"message": "лес"})
+        hub.publish("threats", {"danger_level": 0.2})
+        assert client.receive()["topic"] == "threats"
+        client.close()
+    finally:
+        hub.stop()
+    logger.info("✓ Запросы из одного пакета")
+
+
+def test_bad_requests_do_not_break_client():
+    """Запрос не-объект игнорируется; бесконечная строка закрывает соединение"""
+    hub = RecommendationHub(port=0)
+    hub.start()
+    try:
+        client = CoachClient(port=hub.port, timeout=2)
+        client.sock.sendall(b'[]\n1\n"x"\n{"subscribe": 5}\n{"subscribe": [1]}\n{"subscribe": ["threats"]}\n')
+        _wait_for_remote(hub, 1, filtered=1)
+        hub.publish("threats", {"danger_level": 0.3})
+        assert client.receive()["topic"] == "threats"   # поток клиента жив
+        client.close()
+
+        flooder = CoachClient(port=hub.port, timeout=2)
+        flooder.sock.sendall(b"x" * (MAX_REQUEST_LINE + 1024))
+        assert flooder.receive()["topic"] == "threats"   # сохранённое сообщение
+        assert flooder.receive() is None                  # затем соединение закрыто
+        flooder.close()
+    finally:
+        hub.stop()
+    logger.info("✓ Неверные запросы не роняют поток клиента")
+
+
+def test_coach_publishes_analysis_once():
+    """Тренер публикует анализ, а помощник получает его как подписчик"""
+    from coach import DotaCoach
+
+    coach = DotaCoach()
+    coach.game_analyzer = GameAnalyzer(detect_process=False)
+    coach.hub.port = 0
+    coach.hub.start()
+    try:
+        client = CoachClient(port=coach.hub.port, timeout=2)
+        _wait_for_remote(coach.hub, 1)
+
+        coach._poll_game_state()
+        state = coach.current_game_state
+        coach._analyze_and_recommend_farming(state)
+        coach._report_analysis(coach.strategist.analyze_situation(state), state)
+        # Советы выпускает арбитр - по одному за проход
+        coach._arbiter_job()
+        coach._arbiter_job()
+
+        topics = [client.receive()["topic"] for _ in range(3)]
+        assert topics[0] == "threats"
+        assert sorted(topics[1:]) == ["farm_route", "recommendation"]
+        assert len(coach.advisor.advice_queue) == 2
+        client.close()
+    finally:
+        coach.hub.stop()
+    logger.info("✓ Анализ публикуется один раз для всех фронтендов")
+
+
+if __name__ == "__main__":
+    test_local_subscribers_filter_topics()
+    test_socket_fanout()
+    test_requests_in_one_packet()
+    test_bad_requests_do_not_break_client()
+    test_coach_publishes_analysis_once()
@@ -0,0 +1,155 @@
+"""
+Тестирование компактной модели GameState
+Проверяет, что стратеги и тренер читают её так же, как прежний словарь
+"""
+
+import logging
+from game_integration import GameAnalyzer
+from game_state import GameState, HeroTable, TeamRoster
+from local_strategist import LocalStrategist
+from qwen_processor import QwenStrategist
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _sample_state() -> GameState:
+    return GameState(
+        game_time=12, hero_name="Anti-Mage", hero_position=(420, 650), level=9,
+        hp=120, max_hp=500, gold=900, items=("Boots",), last_hits=70,
+        nearby_enemy_count=2,
+        allies=HeroTable(("Rubick", "Tidehunter"), ("support", "offlane"), (8, 9), hp_percent=(80, 70)),
+        enemies=HeroTable(("Shadow Fiend", "Lion"), ("midlane", "support"), (14, 7), visible=0b01),
+        events=("Ганк отбит!", lambda s: f"{s.hero_name}: {s.last_hits}"),
+        created_at=1700000000.0
+    )
+
+
+def test_dict_access():
+    """GameState читается как словарь"""
+    state = _sample_state()
+
+    assert state['gold'] == 900
+    assert state.get('hp') == 120
+    assert state.get('recently_shopped') is None
+    assert 'enemies' in state and 'unknown' not in state
+    assert state['recent_events'] == ["Ганк отбит!", "Anti-Mage: 70"]
+    assert state['timestamp'].startswith("2023-11-")
+
+    enemies = list(state['enemies'])
+    assert enemies[0]['name'] == "Shadow Fiend"
+    assert enemies[0].get('visible') is True and enemies[1].get('visible') is False
+    assert state['allies'][1].get('hp_percent') == 70
+    assert state['allies'][1].get('visible', 'нет') == 'нет'
+
+    state['gold'] = 1500
+    state['recently_shopped'] = True
+    assert state.gold == 1500 and state['recently_shopped'] is True
+    assert state['level'] == 9
+    logger.info("✓ Доступ как к словарю работает")
+
+
+def test_roundtrip_dict():
+    """to_dict / from_dict сохраняют данные"""
+    state = _sample_state()
+    data = state.to_dict()
+    restored = GameState.from_dict(dict(data, gpm=480))
+
+    assert restored.to_dict() == dict(data, gpm=480)
+    assert restored['gpm'] == 480
+    logger.info("✓ Преобразование в словарь и обратно")
+
+
+def test_consumers_accept_game_state():
+    """LocalStrategist, QwenStrategist и тренер работают с GameState"""
+    state = _sample_state()
+
+    analysis = LocalStrategist().analyze_situation(state)
+    assert analysis["status"] == "success"
+    assert any(r["title"] == "⚠️  Низкий HP!" for r in analysis["recommendations"])
+
+    prompt = QwenStrategist(api_key="")._build_analysis_prompt(state)
+    assert "Shadow Fiend: уровень 14" in prompt
+    assert "Boots" in prompt
+
+    analyzer = GameAnalyzer()
+    assert analyzer._calculate_threat(state, state['enemies'][0]) == 0.5
+    assert analyzer.analyze_threats(state) == []
+    logger.info("✓ Потребители принимают GameState")
+
+
+def test_simulation_shares_static_data():
+    """Состояния симуляции делят неизменяемые данные"""
+    analyzer = GameAnalyzer()
+    first = analyzer._simulate_game_state()
+    second = analyzer._simulate_game_state()
+
+    assert first.roster is second.roster
+    assert first.hero_position is second.hero_position
+    assert len(first['enemies']) == 5 and len(first['allies']) == 4
+    assert first['enemies'][1]['visible'] is True
+    logger.info("✓ Общие данные не копируются между тиками")
+
+
+def test_team_tables_cached():
+    """Таблицы команд распаковываются один раз; скаляры меняются на месте"""
+    state = _sample_state()
+    assert state.enemies is state.enemies
+    assert state['allies'] is state.allies
+
+    record = state._record
+    state.gold = 1500
+    state['hp'] = 300
+    assert state._record is record
+    assert state.gold == 1500 and state.hp == 300
+    assert state.enemies[0]['name'] == "Shadow Fiend"
+
+    # Замена состава сбрасывает кэш
+    cached = state.enemies
+    state.enemies = HeroTable(("Pudge",), ("support",), (3,))
+    assert state.enemies is not cached
+    assert state.enemies[0]['name'] == "Pudge" and state.gold == 1500
+    logger.info("✓ Таблицы команд кэшируются")
+
+
+def test_out_of_range_values_fit():
+    """Дробные и слишком большие значения не ломают упаковку - прижимаются к формату поля"""
+    state = GameState.from_dict({"level": 31.0, "kills": 70000, "nearby_enemy_count": 300,
+                                 "gold": 2.5, "deaths": -1, "hp": None, "game_time": 12})
+    assert (state.level, state.kills, state.nearby_enemy_count) == (31, 0xFFFF, 0xFF)
+    assert (state.gold, state.deaths, state.hp, state.game_time) == (2, 0, 0, 12)
+
+    state.assists = 1e9
+    state['nearby_enemy_count'] = 2.0
+    assert state.assists == 0xFFFF and state.nearby_enemy_count == 2
+    assert state.scalars(("game_time", "level", "gold")) == [12, 31, 2]
+    logger.info("✓ Значения вне диапазона прижимаются")
+
+
+def test_roster_cache_bounded():
+    """Кэш составов не растёт бесконечно"""
+    first = HeroTable(("Hero 0",), ("carry",), (1,))
+    roster = TeamRoster.for_teams(first, first)
+    for i in range(1, TeamRoster.CACHE_SIZE * 3):
+        table = HeroTable((f"Hero {i}",), ("carry",), (1,))
+        GameState(allies=table, enemies=table)
+        assert len(TeamRoster._cache) <= TeamRoster.CACHE_SIZE
+
+    # Давно не использованный состав вытеснен, новый создаётся заново
+    assert TeamRoster.for_teams(first, first) is not roster
+    recent = TeamRoster.for_teams(table, table)
+    assert TeamRoster.for_teams(table, table) is recent
+    logger.info("✓ Кэш составов ограничен")
+
+
+if __name__ == "__main__":
+    test_dict_access()
+    test_roundtrip_dict()
+    test_consumers_accept_game_state()
+    test_simulation_shares_static_data()
+    test_team_tables_cached()
+    test_out_of_range_values_fit()
+    test_roster_cache_bounded()
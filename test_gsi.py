@@ -0,0 +1,133 @@
+"""
+Тестирование приёма Dota 2 Game State Integration
+Поднимает слушатель на свободном порту и отправляет записанный payload
+"""
+
+import http.client
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from gsi_listener import GSIListener, GSIGameAnalyzer, normalize_gsi_payload
+from gsi_replay import replay
+from local_strategist import LocalStrategist
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+SAMPLE_PAYLOAD = {
+    "provider": {"name": "Dota 2", "appid": 570},
+    "map": {"matchid": "7000000001", "game_time": 725, "clock_time": 630,
+            "game_state": "DOTA_GAMERULES_STATE_GAME_IN_PROGRESS"},
+    "player": {"team_name": "radiant", "gold": 1850, "last_hits": 62, "denies": 7,
+               "kills": 2, "deaths": 1, "assists": 3, "gpm": 480, "xpm": 510},
+    "hero": {"name": "npc_dota_hero_antimage", "level": 9, "xpos": -5000, "ypos": -4800,
+             "alive": True, "health": 320, "max_health": 900},
+    "items": {"slot0": {"name": "item_power_treads"}, "slot1": {"name": "empty"},
+              "slot2": {"name": "item_bfury"}},
+    "minimap": {
+        "o1": {"unitname": "npc_dota_hero_nevermore", "team": 3, "xpos": -4500, "ypos": -4500},
+        "o2": {"unitname": "npc_dota_hero_lion", "team": 3, "xpos": 3000, "ypos": 3000},
+        "o3": {"unitname": "npc_dota_hero_rubick", "team": 2, "xpos": -4900, "ypos": -4800},
+    },
+}
+
+
+def test_normalize_payload():
+    """GSI payload превращается в game_state, понятный стратегу"""
+    state = normalize_gsi_payload(SAMPLE_PAYLOAD)
+
+    assert state["game_time"] == 10
+    assert state["hero_name"] == "Antimage"
+    assert state["items"] == ["Power Treads", "Bfury"]
+    assert state["hp"] == 320 and state["max_hp"] == 900
+    assert len(state["enemies"]) == 2
+    assert state["nearby_enemy_count"] == 1
+    assert 0 <= state["hero_position"][0] <= 1024
+
+    analysis = LocalStrategist().analyze_situation(state)
+    assert analysis["status"] == "success"
+    logger.info(f"✓ Нормализовано: {state['hero_name']} ур.{state['level']}, позиция {state['hero_position']}")
+
+
+def test_not_in_game_payload():
+    """Обновление из меню (без героя) не даёт состояния"""
+    assert normalize_gsi_payload({"provider": {"name": "Dota 2"}}) is None
+
+
+def test_listener_push_and_replay():
+    """Слушатель принимает POST, будит подписчиков и отдаёт состояние анализатору"""
+    listener = GSIListener(port=0, auth_token="secret")
+    analyzer = GSIGameAnalyzer(listener)
+    pushed = threading.Event()
+    listener.on_update(lambda state: pushed.set())
+    listener.start()
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"t": 0.0, "payload": SAMPLE_PAYLOAD}) + "\n")
+
+            sent = replay(path, f"http://127.0.0.1:{listener.port}/", speed=0, token="secret")
+
+        assert sent == 1
+        assert pushed.wait(2.0)
+        assert analyzer.check_game_running()
+
+        state = analyzer.get_current_game_state()
+        assert state["gold"] == 1850
+        assert len(analyzer.game_state_history) == 1
+
+        # Без нового push история не растёт
+        analyzer.get_current_game_state()
+        assert len(analyzer.game_state_history) == 1
+    finally:
+        listener.stop()
+
+    logger.info("✓ GSI слушатель работает")
+
+
+def test_listener_rejects_wrong_token():
+    """Обновления с неверным токеном отклоняются"""
+    listener = GSIListener(port=0, auth_token="secret")
+    assert not listener.handle_payload(dict(SAMPLE_PAYLOAD, auth={"token": "wrong"}))
+    assert listener.rejected_count == 1
+    assert listener.latest_state is None
+
+
+def test_listener_rejects_bad_content_length():
+    """Неверный Content-Length или JSON не-объект - ответ 400, а не оборванное соединение"""
+    listener = GSIListener(port=0)
+    listener.start()
+    try:
+        for length in ("abc", "-1"):
+            connection = http.client.HTTPConnection("127.0.0.1", listener.port, timeout=2)
+            connection.putrequest("POST", "/")
+            connection.putheader("Content-Length", length)
+            connection.endheaders()
+            assert connection.getresponse().status == 400, length
+            connection.close()
+        for body in (b"[]", b'"x"', b"42"):
+            connection = http.client.HTTPConnection("127.0.0.1", listener.port, timeout=2)
+            connection.request("POST", "/", body=body)
+            assert connection.getresponse().status == 400, body
+            connection.close()
+        assert listener.push_count == 0
+    finally:
+        listener.stop()
+    logger.info("✓ Неверный Content-Length и не-объект JSON отклоняются")
+
+
+if __name__ == "__main__":
+    test_normalize_payload()
+    test_not_in_game_payload()
+    test_listener_push_and_replay()
+    test_listener_rejects_wrong_token()
+    test_listener_rejects_bad_content_length()
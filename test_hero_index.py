@@ -0,0 +1,112 @@
+"""
+Тестирование индекса героев и предметов
+"""
+
+import logging
+import config
+from dota2_api import HybridGameAnalyzer
+from game_integration import GameAnalyzer
+from hero_index import BASE_INDEX, CatalogIndex, get_index, install_index
+from local_strategist import LocalStrategist
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Каталоги в формате Dota2WebAPI.heroes/items после загрузки на двух языках
+CATALOG_HEROES = {
+    "antimage": {"id": 1, "name": "npc_dota_hero_antimage", "localized_name": "Anti-Mage",
+                 "localized_name_ru": "Антимаг"},
+    "nevermore": {"id": 11, "name": "npc_dota_hero_nevermore", "localized_name": "Shadow Fiend",
+                  "localized_name_ru": "Сф"},
+    "sand_king": {"id": 16, "name": "npc_dota_hero_sand_king", "localized_name": "Sand King",
+                  "localized_name_ru": "Песчаный король"},
+}
+CATALOG_ITEMS = {
+    "blink": {"id": 1, "name": "item_blink", "localized_name": "Blink Dagger",
+              "localized_name_ru": "Кинжал мерцания"},
+}
+
+
+def test_lookup_by_any_key():
+    """ID, внутреннее имя, английское и русское имя ведут к одной записи"""
+    index = CatalogIndex.from_catalog(CATALOG_HEROES, CATALOG_ITEMS)
+    anti_mage = index.hero(1)
+    for key in ("npc_dota_hero_antimage", "antimage", "Anti-Mage", "Antimage", "антимаг", "1"):
+        assert index.hero(key) is anti_mage, key
+    assert anti_mage.roles == ("carry",)                 # Роль из базовой таблицы
+    assert index.hero("Nevermore").dangerous             # Имя из GSI
+    assert index.hero("Песчаный король").id == 16        # Героя нет в базе - только каталог
+    assert index.hero("Puck").id == 13                   # Герой базы без записи в каталоге
+    assert index.item("Кинжал мерцания") is index.item("item_blink") is index.item(1)
+    assert index.hero("blink") is None and index.hero(None) is None
+    logger.info(f"✓ Поиск по любому ключу: {index}")
+
+
+def test_index_is_immutable():
+    """Записи и таблицы индекса нельзя изменить"""
+    index = CatalogIndex.from_catalog(CATALOG_HEROES, CATALOG_ITEMS)
+    for mutate in (lambda: setattr(index.hero(1), "name_en", "x"),
+                   lambda: index.role_table.__setitem__("carry", ()),
+                   lambda: index._heroes.by_id.__setitem__(99, None)):
+        try:
+            mutate()
+            assert False, "индекс изменился"
+        except (AttributeError, TypeError):
+            pass
+    logger.info("✓ Индекс неизменяемый")
+
+
+def test_consumers_share_index():
+    """Роли, угрозы и имена по ID берутся из общего индекса"""
+    strategist = LocalStrategist()
+    assert strategist.hero_roles is get_index().role_table
+    assert "Anti-Mage" in strategist.hero_roles["carry"]
+    assert config.HERO_ROLES is strategist.hero_roles
+
+    install_index(CatalogIndex.from_catalog(CATALOG_HEROES, CATALOG_ITEMS))
+    try:
+        assert strategist.hero_roles is get_index().role_table  # Роли - из установленного индекса
+        assert config.HERO_ROLES is get_index().role_table
+        analyzer = GameAnalyzer(detect_process=False)
+        state = {"level": 20}
+        assert analyzer._calculate_threat(state, {"name": "Сф", "level": 1}) == 0.2
+        assert analyzer._calculate_threat(state, {"name": "Lion", "level": 1}) == 0.0
+
+        advice = strategist._analyze_positioning({"hero_name": "Антимаг", "game_time": 12,
+                                                  "position": "jungle", "level": 8})
+        assert any(item["title"] == "Вернись на линию" for item in advice)
+
+        hybrid = object.__new__(HybridGameAnalyzer)
+        assert hybrid._get_hero_name(16) == "Sand King"
+        assert hybrid._get_hero_name(44) == "Phantom Assassin"
+        assert hybrid._get_hero_name(9999) == "Hero#9999"
+    finally:
+        install_index(BASE_INDEX)
+    assert get_index() is BASE_INDEX
+    logger.info("✓ Общий индекс для ролей, угроз и имён")
+
+
+def test_roles_follow_catalog_names():
+    """Роль находится, даже если имя героя в каталоге отличается от базового"""
+    renamed = dict(CATALOG_HEROES, antimage=dict(CATALOG_HEROES["antimage"], localized_name="Anti Mage Prime"))
+    install_index(CatalogIndex.from_catalog(renamed, CATALOG_ITEMS))
+    try:
+        assert "Anti-Mage" not in get_index().role_table["carry"]
+        strategist = LocalStrategist()
+        for hero_name in ("Anti Mage Prime", "npc_dota_hero_antimage", "Антимаг"):
+            advice = strategist._analyze_positioning({"hero_name": hero_name, "game_time": 12,
+                                                      "position": "jungle", "level": 8})
+            assert any(item["title"] == "Вернись на линию" for item in advice), hero_name
+    finally:
+        install_index(BASE_INDEX)
+    logger.info("✓ Роли по имени из каталога")
+
+
+if __name__ == "__main__":
+    test_lookup_by_any_key()
+    test_index_is_immutable()
+    test_consumers_share_index()
+    test_roles_follow_catalog_names()
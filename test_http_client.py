@@ -0,0 +1,138 @@
+"""
+Тестирование общего HTTP-клиента на локальном сервере-заглушке
+"""
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from catalog_cache import CatalogCache
+from dota2_api import Dota2WebAPI
+from http_client import ApiClient
+from match_store import MatchStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class _StubSteam(BaseHTTPRequestHandler):
+    """Заглушка Steam WebAPI: первые ответы GetMatchDetails - 503"""
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = set()
+    failures_left = 0
+    gzip_responses = 0
+
+    def do_GET(self):
+        cls = type(self)
+        cls.connections.add(self.client_address)
+        if "GetMatchDetails" in self.path and cls.failures_left > 0:
+            cls.failures_left -= 1
+            return self._send(503, b"{}", {"Retry-After": "0"})
+        if "GetHeroes" in self.path:
+            payload = {"result": {"heroes": [{"id": 1, "name": "npc_dota_hero_antimage"}]}}
+        elif "GetGameItems" in self.path:
+            payload = {"result": {"items": [{"id": 1, "name": "item_blink"}]}}
+        else:
+            payload = {"result": {"match_id": 42, "radiant_win": True}}
+        body = json.dumps(payload).encode()
+        headers = {}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+            cls.gzip_responses += 1
+        self._send(200, body, headers)
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _stub_api(server):
+    """Dota2WebAPI, направленный на сервер-заглушку"""
+    return type("StubDota2WebAPI", (Dota2WebAPI,),
+                {"API_URL": f"http://127.0.0.1:{server.server_address[1]}"})
+
+
+def _serve():
+    _StubSteam.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSteam)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_keep_alive_gzip_and_retries():
+    """Запросы идут по одному соединению, gzip распаковывается, 503 повторяется"""
+    server = _serve()
+    delays = []
+    client = ApiClient(retries=3, backoff_base=0.01, sleep=delays.append)
+    cache = CatalogCache(os.path.join(tempfile.mkdtemp(), "catalog.json"))
+    try:
+        api = _stub_api(server)("key", http=client, catalog_cache=cache, match_store=MatchStore(":memory:"))
+        assert "antimage" in api.heroes and "blink" in api.items
+
+        _StubSteam.failures_left = 2
+        connections_before = len(_StubSteam.connections)
+        for match_id in range(1, 6):  # Заглушка отвечает матчем 42, поэтому хранилище не мешает
+            assert api.get_match_details(match_id)["match_id"] == 42
+        assert len(_StubSteam.connections) == connections_before  # Соединение переиспользуется
+        assert _StubSteam.gzip_responses >= 7
+        assert len(delays) == 2
+
+        stats = client.get_stats()
+        details = stats["GetMatchDetails"]
+        assert details["count"] == 7 and details["errors"] == 2 and details["retries"] == 2
+        assert details["error_rate"] == round(2 / 7, 3)
+        assert stats["GetHeroes"]["errors"] == 0
+        assert client.timeouts["GetHeroes"] == Dota2WebAPI.TIMEOUTS["GetHeroes"]
+        logger.info(f"✓ Keep-alive, gzip и повторы: {details}")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_gives_up_after_retries():
+    """После исчерпания повторов возвращается последний ответ с ошибкой"""
+    server = _serve()
+    client = ApiClient(retries=1, sleep=lambda delay: None)
+    try:
+        api = _stub_api(server)("key", static_data={"heroes": {"a": {}}, "items": {"b": {}}}, http=client,
+                                match_store=MatchStore(":memory:"))
+        _StubSteam.failures_left = 5
+        assert api.get_match_details(42) is None
+        assert client.get_stats()["GetMatchDetails"]["error_rate"] == 1.0
+        logger.info("✓ Ошибка после исчерпания повторов")
+    finally:
+        client.close()
+        server.shutdown()
+        _StubSteam.failures_left = 0
+
+
+def test_backoff_is_bounded_and_jittered():
+    """Задержка повтора случайна и не превышает предела"""
+    client = ApiClient(backoff_base=0.5, backoff_max=2.0)
+    delays = [client._backoff(attempt) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= delay <= 2.0 for delay in delays)
+    assert len(set(delays)) > 1
+    assert ApiClient.endpoint_name("http://x/IDOTA2Match_570/GetMatchDetails/v1") == "GetMatchDetails"
+    client.close()
+    logger.info("✓ Задержки повторов ограничены")
+
+
+if __name__ == "__main__":
+    test_keep_alive_gzip_and_retries()
+    test_gives_up_after_retries()
+    test_backoff_is_bounded_and_jittered()
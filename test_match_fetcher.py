@@ -0,0 +1,129 @@
+"""
+Тестирование параллельной загрузки деталей матчей
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from catalog_cache import CatalogCache
+from dota2_api import Dota2WebAPI
+from http_client import ApiClient
+from match_fetcher import BulkMatchFetcher
+from rate_limit import TokenBucket
+from match_store import MatchStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class _StubMatches(BaseHTTPRequestHandler):
+    """GetMatchDetails: 20мс на ответ, матч 13 не существует, на матче 7 - 500"""
+    protocol_version = "HTTP/1.1"
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(0.02)
+        with cls.lock:
+            cls.in_flight -= 1
+        match_id = int(parse_qs(urlsplit(self.path).query)["match_id"][0])
+        status, payload = 200, {"result": {"match_id": match_id}}
+        if match_id == 13:
+            payload = {"result": {"error": "Match ID not found"}}
+        elif match_id == 7:
+            status, payload = 500, {}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_bulk_fetch_reports_failures_per_id():
+    """Все ID загружаются параллельно, ошибки - в результатах своих матчей"""
+    _StubMatches.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubMatches)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_class = type("StubDota2WebAPI", (Dota2WebAPI,),
+                     {"API_URL": f"http://127.0.0.1:{server.server_address[1]}"})
+    client = ApiClient(retries=0, rate_limit=0)
+    try:
+        api = api_class("key", static_data={"heroes": {"a": {}}, "items": {"b": {}}}, http=client,
+                        catalog_cache=CatalogCache(os.path.join(tempfile.mkdtemp(), "catalog.json")),
+                        match_store=MatchStore(":memory:"))
+        started = time.perf_counter()
+        results = list(api.get_match_details_bulk(list(range(1, 41)) + [5, 5], workers=4, rate_limit=0))
+        elapsed = time.perf_counter() - started
+
+        assert sorted(result.match_id for result in results) == list(range(1, 41))  # Повторы - один раз
+        failed = {result.match_id: result.error for result in results if not result.ok}
+        assert set(failed) == {7, 13}
+        assert "Match ID not found" in failed[13] and "500" in failed[7]
+        assert all(result.details["match_id"] == result.match_id for result in results if result.ok)
+        assert 1 < _StubMatches.max_in_flight <= 4
+        assert elapsed < 40 * 0.02  # Быстрее последовательной загрузки
+        logger.info(f"✓ 40 матчей за {elapsed * 1000:.0f}мс, одновременно до {_StubMatches.max_in_flight}")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_results_stream_from_lazy_input():
+    """Результаты выдаются до того, как прочитан весь вход; закрытие отменяет остальное"""
+    consumed = []
+
+    def ids():
+        for match_id in range(1000):
+            consumed.append(match_id)
+            yield match_id
+
+    fetcher = BulkMatchFetcher(lambda match_id: {"match_id": match_id}, workers=2, rate_limit=0)
+    stream = fetcher.fetch_all(ids())
+    first = next(stream)
+    assert first.ok and len(consumed) <= 5
+    stream.close()
+    assert fetcher.fetched + fetcher.failed < 10
+    logger.info(f"✓ Потоковая выдача: прочитано {len(consumed)} ID до первого результата")
+
+
+def test_rate_limiter_spaces_requests():
+    """Загрузки идут с интервалом 1/rate через общую корзину токенов"""
+    now = [0.0]
+    waits = []
+
+    def sleep(delay):
+        waits.append(delay)
+
+    limiter = TokenBucket(rate=10, burst=1, clock=lambda: now[0], sleep=sleep)
+    fetcher = BulkMatchFetcher(lambda match_id: {"match_id": match_id}, workers=1, limiter=limiter)
+    results = list(fetcher.fetch_all(range(5)))
+    assert all(result.ok for result in results)
+    assert [round(delay, 3) for delay in waits] == [0.1, 0.2, 0.3, 0.4]
+    assert fetcher.get_stats()["rate_wait_s"] == 1.0
+
+    now[0] = 10.0
+    list(fetcher.fetch_all([5]))
+    assert len(waits) == 4  # После паузы ждать не нужно
+    logger.info("✓ Ограничение частоты")
+
+
+if __name__ == "__main__":
+    test_bulk_fetch_reports_failures_per_id()
+    test_results_stream_from_lazy_input()
+    test_rate_limiter_spaces_requests()
@@ -0,0 +1,140 @@
+"""
+Тестирование постраничного обхода истории матчей
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from catalog_cache import CatalogCache
+from dota2_api import Dota2WebAPI
+from http_client import ApiClient
+from match_store import MatchStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+NEWEST_MATCH = 100_000
+NEWEST_START = 1_700_000_000
+
+
+class _StubPagedHistory(BaseHTTPRequestHandler):
+    """GetMatchHistory со start_at_match_id: матчи NEWEST_MATCH, NEWEST_MATCH-1, ... раз в час"""
+    protocol_version = "HTTP/1.1"
+    total = 250
+    requests_log = []
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        count = int(query["matches_requested"][0])
+        start = int(query.get("start_at_match_id", [NEWEST_MATCH])[0])
+        type(self).requests_log.append((start, time.perf_counter()))
+        time.sleep(0.05)
+        oldest = NEWEST_MATCH - type(self).total + 1
+        ids = list(range(min(start, NEWEST_MATCH), max(oldest - 1, min(start, NEWEST_MATCH) - count), -1))
+        rows = [{"match_id": match_id,
+                 "start_time": NEWEST_START - (NEWEST_MATCH - match_id) * 3600,
+                 "players": [{"account_id": 7, "player_slot": 0, "hero_id": 1 + match_id % 5}]}
+                for match_id in ids]
+        remaining = max(0, (ids[-1] - oldest) if ids else 0)
+        body = json.dumps({"result": {"status": 1, "num_results": len(rows),
+                                      "results_remaining": remaining, "matches": rows}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _api(total=250):
+    _StubPagedHistory.total = total
+    _StubPagedHistory.requests_log = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubPagedHistory)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_class = type("StubDota2WebAPI", (Dota2WebAPI,),
+                     {"API_URL": f"http://127.0.0.1:{server.server_address[1]}"})
+    client = ApiClient(retries=0, rate_limit=0)
+    api = api_class("key", static_data={"heroes": {"a": {}}, "items": {"b": {}}}, http=client,
+                    catalog_cache=CatalogCache(os.path.join(tempfile.mkdtemp(), "catalog.json")),
+                    match_store=MatchStore(":memory:"))
+    return api, server, client
+
+
+def test_walks_all_pages_with_prefetch():
+    """Обходит всю историю; следующая страница запрашивается до разбора текущей"""
+    api, server, client = _api()
+    try:
+        history = api.iter_match_history(7, page_size=100)
+        first = next(history)
+        time.sleep(0.1)
+        assert len(_StubPagedHistory.requests_log) == 2  # Вторая страница уже загружается
+        ids = [first["match_id"]] + [row["match_id"] for row in history]
+        assert ids == list(range(NEWEST_MATCH, NEWEST_MATCH - 250, -1))
+        assert [start for start, _ in _StubPagedHistory.requests_log] == [
+            NEWEST_MATCH, NEWEST_MATCH - 100, NEWEST_MATCH - 200]
+        assert len(api.match_store.matches_for_account(7)) == 250
+        logger.info("✓ Обход всех страниц с упреждающей загрузкой")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_stops_on_count_and_date():
+    """Граница по числу матчей и по дате останавливает обход без лишних страниц"""
+    api, server, client = _api()
+    try:
+        rows = list(api.iter_match_history(7, max_matches=150, page_size=100))
+        assert len(rows) == 150 and len(_StubPagedHistory.requests_log) == 2
+
+        _StubPagedHistory.requests_log = []
+        since = datetime.fromtimestamp(NEWEST_START - 30 * 3600)
+        rows = list(api.iter_match_history(7, since=since, page_size=20))
+        assert len(rows) == 31 and all(row["start_time"] >= since.timestamp() for row in rows)
+        assert len(_StubPagedHistory.requests_log) == 2
+
+        _StubPagedHistory.requests_log = []
+        history = api.iter_match_history(7, page_size=10)
+        next(history)
+        history.close()  # Вызывающий остановился сам
+        time.sleep(0.1)
+        assert len(_StubPagedHistory.requests_log) <= 2
+        logger.info("✓ Остановка по числу матчей и по дате")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_memory_does_not_grow_with_history():
+    """Пиковая память обхода не зависит от длины истории"""
+    peaks = []
+    for total in (200, 1000):
+        api, server, client = _api(total)
+        api.match_store = None
+        try:
+            tracemalloc.start()
+            count = sum(1 for _ in api.iter_match_history(7, page_size=50))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            assert count == total
+        finally:
+            client.close()
+            server.shutdown()
+    assert peaks[1] < peaks[0] * 1.5
+    logger.info(f"✓ Пик памяти: {peaks[0] // 1024}КБ на 200 матчей, {peaks[1] // 1024}КБ на 1000")
+
+
+if __name__ == "__main__":
+    test_walks_all_pages_with_prefetch()
+    test_stops_on_count_and_date()
+    test_memory_does_not_grow_with_history()
@@ -0,0 +1,153 @@
+"""
+Тестирование локального хранилища матчей (SQLite)
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from catalog_cache import CatalogCache
+from dota2_api import Dota2WebAPI
+from http_client import ApiClient
+from match_store import MatchStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ACCOUNT = 1001
+
+
+def _history_row(match_id, start_time, hero_id):
+    return {"match_id": match_id, "start_time": start_time, "lobby_type": 7,
+            "players": [{"account_id": ACCOUNT, "player_slot": 0, "hero_id": hero_id},
+                        {"account_id": 2002, "player_slot": 128, "hero_id": 99}]}
+
+
+class _StubHistory(BaseHTTPRequestHandler):
+    """GetMatchHistory и GetMatchDetails со счётчиком запросов"""
+    protocol_version = "HTTP/1.1"
+    hits = {}
+
+    def do_GET(self):
+        endpoint = urlsplit(self.path).path.split("/")[-2]
+        type(self).hits[endpoint] = type(self).hits.get(endpoint, 0) + 1
+        query = parse_qs(urlsplit(self.path).query)
+        if endpoint == "GetMatchHistory":
+            count = int(query["matches_requested"][0])
+            rows = [_history_row(500 - index, 10_000 - index * 100, 1 + index % 3) for index in range(count)]
+            payload = {"result": {"status": 1, "matches": rows}}
+        else:
+            match_id = int(query["match_id"][0])
+            payload = {"result": dict(_history_row(match_id, 9_000, 2), radiant_win=True)}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_store_upserts_and_indexes():
+    """Пакетная запись, обновление существующих записей и индексы"""
+    store = MatchStore(os.path.join(tempfile.mkdtemp(), "matches.sqlite3"))
+    store.upsert_matches([dict(_history_row(match_id, 5_000 + match_id, 3), radiant_win=False)
+                          for match_id in range(1, 101)])
+    store.upsert_matches([dict(_history_row(7, 5_007, 3), radiant_win=True)])
+    assert store.get_match(7)["radiant_win"] is True
+    assert store.get_match(1000) is None
+    assert set(store.get_matches([1, 2, 1000])) == {1, 2}
+    assert store.matches_for_account(ACCOUNT)[:2] == [100, 99]
+    assert len(store.matches_for_account(ACCOUNT, since=5_091)) == 10
+    assert len(store.matches_with_hero(3)) == 100
+
+    indexed = set()
+    for table in ("matches", "match_players", "history_rows"):
+        for index in store.conn.execute(f"PRAGMA index_list({table})").fetchall():
+            indexed.update(column[2] for column in store.conn.execute(f"PRAGMA index_info({index[1]})"))
+    assert {"match_id", "account_id", "hero_id", "start_time"} <= indexed
+    assert store.get_stats()["matches"] == 100
+    store.close()
+    logger.info("✓ Пакетная запись и индексы")
+
+
+def test_history_freshness_and_filters():
+    """История из хранилища - пока свежая и запрошено не больше строк"""
+    clock = _Clock()
+    store = MatchStore(":memory:", history_max_age=60, clock=clock)
+    rows = [_history_row(500 - index, 10_000 - index * 100, 1 + index % 3) for index in range(10)]
+    store.upsert_history(ACCOUNT, rows, matches_requested=10)
+
+    assert [row["match_id"] for row in store.get_history(ACCOUNT, matches_requested=3)] == [500, 499, 498]
+    assert store.get_history(ACCOUNT, matches_requested=20) is None    # Запрашивали только 10
+    assert store.get_history(ACCOUNT, hero_id=2, matches_requested=5) is None  # Другой запрос
+    store.upsert_history(ACCOUNT, [row for row in rows if row["players"][0]["hero_id"] == 2],
+                         hero_id=2, matches_requested=5)
+    assert {row["players"][0]["hero_id"] for row in store.get_history(ACCOUNT, hero_id=2,
+                                                                       matches_requested=5)} == {2}
+    clock.now += 61
+    assert store.get_history(ACCOUNT, matches_requested=3) is None     # Устарела
+    logger.info("✓ Свежесть и фильтры истории")
+
+
+def test_api_reads_store_first():
+    """Повторные запросы истории и деталей не уходят в сеть"""
+    _StubHistory.hits = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHistory)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_class = type("StubDota2WebAPI", (Dota2WebAPI,),
+                     {"API_URL": f"http://127.0.0.1:{server.server_address[1]}"})
+    client = ApiClient(retries=0, rate_limit=0)
+    clock = _Clock()
+    store = MatchStore(":memory:", history_max_age=600, clock=clock)
+    try:
+        api = api_class("key", static_data={"heroes": {"a": {}}, "items": {"b": {}}}, http=client,
+                        catalog_cache=CatalogCache(os.path.join(tempfile.mkdtemp(), "catalog.json")),
+                        match_store=store)
+        first = api.get_match_history(ACCOUNT, matches_requested=20)
+        for _ in range(5):
+            assert api.get_match_history(ACCOUNT, matches_requested=20) == first
+        assert _StubHistory.hits == {"GetMatchHistory": 1}
+        clock.now += 601
+        api.get_match_history(ACCOUNT, matches_requested=20)
+        assert _StubHistory.hits["GetMatchHistory"] == 2
+
+        assert api.get_match_details(42)["radiant_win"] is True
+        assert api.get_match_details(42)["match_id"] == 42
+        results = list(api.get_match_details_bulk([41, 42, 43], workers=2))
+        assert all(result.ok for result in results)
+        assert _StubHistory.hits["GetMatchDetails"] == 3   # 42 - из хранилища
+        assert set(store.get_matches([41, 42, 43])) == {41, 42, 43}
+
+        # Матчи из хранилища не ждут ограничителя частоты
+        started = time.monotonic()
+        results = list(api.get_match_details_bulk([41, 42, 43, 44], workers=1, rate_limit=2))
+        assert time.monotonic() - started < 0.4
+        assert [result.match_id for result in results] == [41, 42, 43, 44]
+        assert _StubHistory.hits["GetMatchDetails"] == 4   # в сеть - только 44
+        logger.info(f"✓ Хранилище перед сетью: {store.get_stats()}")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_store_upserts_and_indexes()
+    test_history_freshness_and_filters()
+    test_api_reads_store_first()
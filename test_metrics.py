@@ -0,0 +1,92 @@
+"""
+Тестирование гистограмм задержек и эндпоинта метрик
+"""
+
+import json
+import logging
+import os
+import random
+import tempfile
+import requests
+from metrics import LatencyHistogram, MetricsRegistry, MetricsServer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_percentiles_within_bucket_precision():
+    """Перцентили гистограммы близки к точным"""
+    histogram = LatencyHistogram()
+    values = [random.randint(1, 500_000) for _ in range(20000)]
+    for value in values:
+        histogram.record(value)
+
+    ordered = sorted(values)
+    for fraction in (0.50, 0.95, 0.99):
+        exact = ordered[int(fraction * len(ordered)) - 1]
+        assert abs(histogram.percentile(fraction) - exact) <= exact * 0.07 + 1, fraction
+
+    assert histogram.count == 20000
+    assert histogram.max_us == max(values)
+    # Маленькие значения хранятся точно
+    small = LatencyHistogram()
+    for value in (3, 3, 7, 20):
+        small.record(value)
+    assert small.percentile(0.5) == 3 and small.percentile(1.0) == 20
+    logger.info(f"✓ Сводка: {histogram.summary()}")
+
+
+def test_registry_dump_and_endpoint():
+    """Снимок метрик доступен файлом и по HTTP"""
+    registry = MetricsRegistry()
+    with registry.time("farm_route"):
+        sum(range(1000))
+    registry.record("analyze_situation", 0.012)
+    registry.increment("ticks", 3)
+
+    path = os.path.join(tempfile.mkdtemp(), "metrics.json")
+    registry.dump(path)
+    with open(path, encoding='utf-8') as f:
+        dumped = json.load(f)
+    assert dumped["stages"]["analyze_situation"]["p50_ms"] == 12.0
+    assert dumped["counters"] == {"ticks": 3}
+
+    server = MetricsServer(registry, port=0)
+    server.start()
+    try:
+        data = requests.get(f"http://127.0.0.1:{server.port}/metrics", timeout=2).json()
+        assert data["stages"]["farm_route"]["count"] == 1
+        assert requests.get(f"http://127.0.0.1:{server.port}/other", timeout=2).status_code == 404
+    finally:
+        server.stop()
+    logger.info("✓ Метрики выгружаются и отдаются по HTTP")
+
+
+def test_coach_records_stages():
+    """Тик тренера заполняет гистограммы этапов"""
+    from coach import DotaCoach
+    from game_integration import GameAnalyzer
+
+    coach = DotaCoach()
+    coach.game_analyzer = GameAnalyzer()
+    coach.game_analyzer.check_game_running = lambda: True
+    coach._poll_game_state()
+    state = coach.current_game_state
+    coach._analyze_and_recommend_farming(state)
+    coach._report_analysis(coach._timed_analysis(state), state)
+    coach._arbiter_job()
+
+    stages = coach.metrics.snapshot()["stages"]
+    for stage in ("state_fetch", "estimate_danger", "farm_route",
+                  "analyze_situation", "voice_report", "advisor_enqueue"):
+        assert stages[stage]["count"] >= 1, stage
+    logger.info(f"✓ Этапы: {sorted(stages)}")
+
+
+if __name__ == "__main__":
+    test_percentiles_within_bucket_precision()
+    test_registry_dump_and_endpoint()
+    test_coach_records_stages()
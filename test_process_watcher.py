@@ -0,0 +1,123 @@
+"""
+Тестирование наблюдателя за процессом игры
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import psutil
+import process_watcher
+from process_watcher import ProcessWatcher
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_backoff_while_absent():
+    """Пока игры нет, поиск идёт с растущей задержкой"""
+    clock = FakeClock()
+    watcher = ProcessWatcher("no-such-game-process", min_backoff=1.0, max_backoff=4.0, clock=clock)
+
+    assert not watcher.is_running()
+    assert watcher.scans == 1
+
+    # Повторные вызовы в пределах задержки не сканируют систему
+    for _ in range(10):
+        assert not watcher.is_running()
+    assert watcher.scans == 1
+
+    scan_times = []
+    for _ in range(60):
+        clock.now += 0.5
+        scans = watcher.scans
+        watcher.is_running()
+        if watcher.scans != scans:
+            scan_times.append(clock.now)
+
+    gaps = [round(b - a, 1) for a, b in zip(scan_times, scan_times[1:])]
+    assert gaps[:3] == [2.0, 4.0, 4.0]
+    logger.info(f"✓ Интервалы поиска: {gaps[:5]}")
+
+
+def test_pinned_process_lifecycle():
+    """Процесс находится один раз, дальше проверяется по PID"""
+    tmpdir = tempfile.mkdtemp()
+    binary = os.path.join(tmpdir, "fakedota2")
+    shutil.copy(shutil.which("sleep"), binary)
+    proc = subprocess.Popen([binary, "30"])
+    events = []
+    try:
+        watcher = ProcessWatcher("fakedota2")
+        watcher.on_started(lambda pid: events.append(("started", pid)))
+        watcher.on_stopped(lambda pid: events.append(("stopped", pid)))
+
+        for _ in range(20):
+            assert watcher.is_running()
+        assert watcher.pid == proc.pid
+        assert watcher.scans == 1
+        assert watcher.liveness_checks == 19
+
+        proc.kill()
+        proc.wait()
+        assert not watcher.is_running()
+        assert events == [("started", proc.pid), ("stopped", proc.pid)]
+        logger.info(f"✓ Жизненный цикл процесса: {watcher.get_stats()}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+class FakeProc:
+    def __init__(self, pid, name, create_time):
+        self.pid = pid
+        self.info = {'name': name, 'create_time': create_time}
+
+
+def test_access_denied_and_unknown_create_time():
+    """Нет прав на процесс или неизвестно время запуска - без ложных started/stopped"""
+    pid = os.getpid()
+    candidates = [FakeProc(pid + 1, "dota2", None), FakeProc(pid, "dota2", 123.0)]
+
+    class DeniedProcess:
+        def __init__(self, pid):
+            raise psutil.AccessDenied(pid)
+
+    original_iter, original_process = psutil.process_iter, psutil.Process
+    process_watcher.psutil.process_iter = lambda attrs: iter(candidates)
+    process_watcher.psutil.Process = DeniedProcess
+    events = []
+    try:
+        watcher = ProcessWatcher("dota2")
+        watcher.on_started(lambda pid: events.append(("started", pid)))
+        watcher.on_stopped(lambda pid: events.append(("stopped", pid)))
+        for _ in range(5):
+            assert watcher.is_running()
+    finally:
+        process_watcher.psutil.process_iter = original_iter
+        process_watcher.psutil.Process = original_process
+
+    assert watcher.pid == pid          # кандидат без create_time пропущен
+    assert watcher.scans == 1
+    assert events == [("started", pid)]
+    logger.info("✓ AccessDenied и неизвестный create_time не дают ложных событий")
+
+
+if __name__ == "__main__":
+    test_backoff_while_absent()
+    test_pinned_process_lifecycle()
+    test_access_denied_and_unknown_create_time()
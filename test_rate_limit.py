@@ -0,0 +1,124 @@
+"""
+Тестирование ограничителя частоты и объединения одинаковых запросов
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http_client import ApiClient
+from rate_limit import SingleFlight, TokenBucket
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class _SlowStub(BaseHTTPRequestHandler):
+    """Отвечает через 100мс и считает запросы по пути"""
+    protocol_version = "HTTP/1.1"
+    hits = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with type(self).lock:
+            type(self).hits[self.path] = type(self).hits.get(self.path, 0) + 1
+        time.sleep(0.1)
+        body = json.dumps({"result": {"path": self.path}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_token_bucket_burst_then_rate():
+    """Пачка до burst проходит сразу, дальше - rate в секунду"""
+    now = [0.0]
+    waits = []
+    bucket = TokenBucket(rate=2, burst=3, clock=lambda: now[0], sleep=waits.append)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == 0.5 and bucket.acquire() == 1.0  # Очередь за токенами
+    now[0] = 10.0
+    assert bucket.acquire() == 0.0  # Корзина снова полна
+    assert waits == [0.5, 1.0]
+    assert TokenBucket(rate=0, burst=1).acquire() == 0.0
+    logger.info("✓ Корзина токенов")
+
+
+def test_single_flight_shares_result_and_error():
+    """Одновременные вызовы с одним ключом выполняются один раз"""
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return {"value": 42}
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(flight.do, "key", slow) for _ in range(5)]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+    assert len(calls) == 1
+    assert all(result is results[0][0] for result, _ in results)
+    assert sum(shared for _, shared in results) == 4
+
+    def failing():
+        raise ValueError("boom")
+    try:
+        flight.do("key", failing)
+        assert False, "ожидалось исключение"
+    except ValueError:
+        pass
+    assert flight.do("key", lambda: 1) == (1, False)  # Ключ освобождается после ошибки
+    logger.info("✓ Объединение вызовов")
+
+
+def test_client_coalesces_and_throttles():
+    """Одинаковые запросы объединяются, разные - ждут корзину хоста"""
+    _SlowStub.hits = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    waits = []
+    client = ApiClient(retries=0, rate_limit=0.5, rate_burst=2, sleep=waits.append)
+    try:
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            same = [executor.submit(client.get, f"{base}/GetHeroes/v1", params={"key": "k"})
+                    for _ in range(6)]
+            bodies = [future.result().json() for future in same]
+        assert _SlowStub.hits == {"/GetHeroes/v1?key=k": 1}
+        assert all(body == bodies[0] for body in bodies)
+
+        for match_id in range(4):
+            client.get(f"{base}/GetMatchDetails/v1", params={"match_id": match_id})
+
+        stats = client.get_stats()
+        assert stats["GetHeroes"]["coalesced"] == 5 and stats["GetHeroes"]["count"] == 1
+        # Корзина на 2 токена: первый запрос и один матч прошли сразу, остальные три ждали
+        assert stats["GetMatchDetails"]["throttled"] == 3 and len(waits) == 3
+        assert stats["throttle_wait"]["count"] == 3
+
+        client.set_rate_limits({f"127.0.0.1:{server.server_address[1]}": (0, 1)}, override=True)
+        client.get(f"{base}/GetMatchDetails/v1", params={"match_id": 99})
+        assert len(waits) == 3  # Лимит хоста снят
+        logger.info(f"✓ Объединено {stats['GetHeroes']['coalesced']}, "
+                    f"ждали ограничителя {stats['GetMatchDetails']['throttled']}")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_token_bucket_burst_then_rate()
+    test_single_flight_shares_result_and_error()
+    test_client_coalesces_and_throttles()
@@ -0,0 +1,85 @@
+"""
+Тестирование планировщика периодических задач
+"""
+
+import logging
+from scheduler import TaskScheduler
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeClock:
+    """Ручные часы для детерминированного теста"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_deadlines_order():
+    """Задачи выполняются по своим интервалам и в порядке дедлайнов"""
+    clock = FakeClock()
+    scheduler = TaskScheduler(clock=clock)
+    calls = []
+
+    scheduler.add_job("fast", lambda: calls.append("fast"), interval=1.0)
+    scheduler.add_job("slow", lambda: calls.append("slow"), interval=5.0, initial_delay=5.0)
+
+    assert scheduler.run_pending() == 1
+    assert calls == ["fast"]
+    assert scheduler.time_until_next() == 1.0
+
+    for _ in range(5):
+        clock.now += 1.0
+        scheduler.run_pending()
+
+    assert calls.count("fast") == 6
+    assert calls.count("slow") == 1
+    logger.info(f"✓ Порядок выполнения: {calls}")
+
+
+def test_reschedule_and_remove():
+    """Перенос и удаление задачи"""
+    clock = FakeClock()
+    scheduler = TaskScheduler(clock=clock)
+    calls = []
+
+    scheduler.add_job("job", lambda: calls.append(clock.now), interval=10.0, initial_delay=10.0)
+    scheduler.reschedule("job", 2.0)
+    assert scheduler.time_until_next() == 2.0
+
+    clock.now = 2.0
+    scheduler.run_pending()
+    assert calls == [2.0]
+
+    scheduler.remove_job("job")
+    assert scheduler.time_until_next() is None
+    logger.info("✓ Перенос и удаление работают")
+
+
+def test_missed_deadlines_do_not_burst():
+    """После долгой паузы задача выполняется один раз, а не пачкой"""
+    clock = FakeClock()
+    scheduler = TaskScheduler(clock=clock)
+    calls = []
+
+    scheduler.add_job("job", lambda: calls.append(clock.now), interval=1.0)
+    scheduler.run_pending()
+    clock.now = 10.5
+    scheduler.run_pending()
+
+    assert calls == [0.0, 10.5]
+    assert scheduler.time_until_next() == 1.0
+    logger.info("✓ Пропущенные дедлайны не накапливаются")
+
+
+if __name__ == "__main__":
+    test_deadlines_order()
+    test_reschedule_and_remove()
+    test_missed_deadlines_do_not_burst()
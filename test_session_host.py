@@ -0,0 +1,114 @@
+"""
+Тестирование хоста нескольких сессий
+"""
+
+import gc
+import logging
+import time
+import tracemalloc
+from clock import VirtualClock
+from hero_index import get_index
+from session_host import SessionHost
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_sessions_share_immutable_data():
+    """Карта фарма и роли героев - одни объекты на все сессии"""
+    host = SessionHost(clock=VirtualClock())
+    first = host.add_session("a")
+    second = host.add_session("b")
+
+    assert first.farming_optimizer.farm_spots is second.farming_optimizer.farm_spots
+    assert first.strategist.hero_roles is second.strategist.hero_roles
+    assert first.game_analyzer is not second.game_analyzer
+    assert first.analysis_stage.inline
+    try:
+        host.add_session("a")
+        assert False, "повторный идентификатор должен отклоняться"
+    except ValueError:
+        pass
+    host.stop()
+    logger.info("✓ Неизменяемые данные общие")
+
+
+def test_sessions_run_independently():
+    """Каждая сессия получает свои советы и метрики"""
+    clock = VirtualClock()
+    host = SessionHost(clock=clock)
+    received = {}
+    for session_id in ("a", "b", "c"):
+        coach = host.add_session(session_id)
+        coach.hub.subscribe(("farm_route",), lambda topic, data, sid=session_id: received.setdefault(sid, data))
+
+    started = clock.monotonic()
+    host.run_forever(lambda: clock.monotonic() - started < 60)
+
+    assert set(received) == {"a", "b", "c"}
+    stats = host.get_stats()
+    assert stats["sessions"] == 3
+    for session in stats["per_session"].values():
+        assert session["ticks"] > 50 and session["errors"] == 0
+        assert session["history"] >= 55
+    assert set(host.snapshot()["sessions"]["a"]["stages"]) >= {"state_fetch", "tick"}
+    host.remove_session("c")
+    assert host.get_stats()["sessions"] == 2
+    host.stop()
+    logger.info(f"✓ Сессии независимы: {stats['per_session']['a']['ticks']} тиков у каждой")
+
+
+def test_worker_pool_and_memory_per_session():
+    """Сессии обслуживает общий пул; лишний игрок - малая доля полного тренера"""
+    from coach import DotaCoach
+    host = SessionHost(workers=2)
+    host.add_session("warmup")
+    DotaCoach()
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    full = DotaCoach()
+    gc.collect()
+    full_size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, 'filename'))
+    full_history = full.game_analyzer.game_state_history.nbytes
+    del full
+    gc.collect()
+
+    before = tracemalloc.take_snapshot()
+    for index in range(5):
+        host.add_session(f"player-{index}")
+    gc.collect()
+    sessions_size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, 'filename'))
+    tracemalloc.stop()
+    per_session = sessions_size / 5
+    sessions = [host.sessions[f"player-{index}"].coach for index in range(5)]
+    session_history = sessions[0].game_analyzer.game_state_history.nbytes
+
+    # Почти вся память тренера - история состояний; доля достигается её ёмкостью
+    # (SESSION_HISTORY_CAPACITY против HISTORY_CAPACITY), а не общими данными
+    assert per_session < 0.35 * full_size, (per_session, full_size)
+    assert full_history > 0.8 * full_size
+    # Всё остальное у сессии не тяжелее, чем у полного тренера
+    assert per_session - session_history <= full_size - full_history, (per_session, full_size)
+
+    # Неизменяемые данные у всех сессий - одни и те же объекты
+    for coach in sessions:
+        assert coach.farming_optimizer.farm_spots is host.shared.farm_spots
+        assert coach.strategist.hero_roles is get_index().role_table
+
+    host.start()
+    time.sleep(0.5)
+    host.stop()
+    assert host.executor._shutdown
+    logger.info(f"✓ Сессия {per_session / 1024:.0f} КБ (история {session_history / 1024:.0f} КБ) "
+                f"против {full_size / 1024:.0f} КБ (история {full_history / 1024:.0f} КБ) у полного тренера")
+
+
+if __name__ == "__main__":
+    test_sessions_share_immutable_data()
+    test_sessions_run_independently()
+    test_worker_pool_and_memory_per_session()
@@ -0,0 +1,60 @@
+"""
+Тестирование записи и воспроизведения сессий
+"""
+
+import logging
+import os
+import tempfile
+from coach import DotaCoach
+from game_integration import GameAnalyzer
+from session_replay import SessionRecorder, read_session, replay_session
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _record_simulation(path: str, ticks: int):
+    clock = iter(float(i) for i in range(ticks + 1))
+    recorder = SessionRecorder(path, clock=lambda: next(clock))
+    analyzer = GameAnalyzer()
+    for _ in range(ticks):
+        recorder.record(analyzer._simulate_game_state())
+    recorder.close()
+    return recorder
+
+
+def test_record_and_read():
+    """Записанные состояния читаются обратно как GameState"""
+    path = os.path.join(tempfile.mkdtemp(), "session.jsonl")
+    recorder = _record_simulation(path, 5)
+    assert recorder.recorded == 5
+
+    entries = list(read_session(path))
+    assert [offset for offset, _ in entries] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert entries[0][1]['hero_name'] == "Anti-Mage"
+    assert len(entries[0][1]['enemies']) == 5
+    logger.info("✓ Запись читается")
+
+
+def test_replay_through_pipeline():
+    """Воспроизведение без пауз проходит весь конвейер тренера"""
+    path = os.path.join(tempfile.mkdtemp(), "session.jsonl")
+    _record_simulation(path, 20)
+
+    coach = DotaCoach()
+    report = replay_session(path, speed=0, coach=coach)
+
+    assert report["ticks"] == 20
+    assert report["throughput_tps"] > 0
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["max"]
+    assert report["advice_queued"] > 0
+    assert coach.state_bus.get_stats()["published"] == 20
+    logger.info(f"✓ Отчёт воспроизведения: {report}")
+
+
+if __name__ == "__main__":
+    test_record_and_read()
+    test_replay_through_pipeline()
@@ -0,0 +1,85 @@
+"""
+Тестирование параллельного холодного старта
+"""
+
+import logging
+import threading
+import time
+from startup import ParallelInit
+from metrics import MetricsRegistry
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _slow(value, delay=0.2):
+    def task():
+        time.sleep(delay)
+        return value
+    return task
+
+
+def test_tasks_run_concurrently():
+    """Время старта - самая долгая задача, а не сумма"""
+    metrics = MetricsRegistry()
+    startup = ParallelInit(max_workers=4, metrics=metrics)
+    for name in ("static_data", "farm_map", "tts"):
+        startup.add(name, _slow(name))
+    results = startup.run()
+
+    assert results == {"static_data": "static_data", "farm_map": "farm_map", "tts": "tts"}
+    assert startup.elapsed < 0.45
+    assert sum(startup.durations.values()) >= 0.6
+    assert metrics.histogram("init.tts").count == 1
+    logger.info(f"✓ Три задачи по 200мс за {startup.elapsed * 1000:.0f}мс")
+
+
+def test_sequential_and_failures():
+    """max_workers=1 - последовательно; ошибка пробрасывается после остальных"""
+    startup = ParallelInit(max_workers=1)
+    startup.add("a", lambda: threading.current_thread())
+    assert startup.run()["a"] is threading.current_thread()
+
+    finished = []
+
+    def broken():
+        raise RuntimeError("нет данных")
+
+    startup = ParallelInit(max_workers=2)
+    startup.add("broken", broken)
+    startup.add("slow", lambda: finished.append(_slow(True, 0.1)()))
+    try:
+        startup.run()
+        assert False, "ошибка должна пробрасываться"
+    except RuntimeError:
+        pass
+    assert finished == [True]
+    logger.info("✓ Последовательный режим и ошибки")
+
+
+def test_coach_warm_up_and_first_advice():
+    """Тренер собирается параллельно и замеряет время до первого совета"""
+    from coach import DotaCoach
+    coach = DotaCoach()
+    assert coach.startup_time is not None
+    assert {"init.game_analyzer", "init.strategist", "init.farm_map"} <= set(coach.metrics.snapshot()["stages"])
+    assert coach.advisor.status_text.startswith("🔄")
+    assert coach.time_to_first_advice is None
+
+    coach.hub.publish("recommendation", {"message": "Фарми", "advice_type": "farming",
+                                         "priority": 5, "duration": 1.0})
+    first = coach.time_to_first_advice
+    assert first is not None and first > 0
+    coach.hub.publish("farm_route", {"message": "Лес", "advice_type": "farming",
+                                     "priority": 5, "duration": 1.0})
+    assert coach.time_to_first_advice == first
+    logger.info(f"✓ Первый совет через {first:.3f}с")
+
+
+if __name__ == "__main__":
+    test_tasks_run_concurrently()
+    test_sequential_and_failures()
+    test_coach_warm_up_and_first_advice()
@@ -0,0 +1,110 @@
+"""
+Тестирование сравнения состояний и выборочного пересчёта правил
+"""
+
+import logging
+import threading
+from game_state import GameState, HeroTable
+from local_strategist import LocalStrategist
+from state_diff import ChangeKind, StateDiffBus, StateDiffer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _state(**overrides) -> GameState:
+    values = dict(
+        game_time=10, hero_name="Anti-Mage", hero_position=(400, 400), level=8,
+        hp=400, max_hp=500, gold=900, items=("Boots",), nearby_enemy_count=0,
+        enemies=HeroTable(("Lion", "Shadow Fiend"), ("support", "midlane"), (7, 9), visible=0b10),
+        created_at=1.0
+    )
+    values.update(overrides)
+    return GameState(**values)
+
+
+def test_typed_changes():
+    """Изменения распознаются по типам"""
+    differ = StateDiffer()
+    old = _state()
+    new = _state(hero_position=(403, 404), hp=250, gold=1100, level=9, created_at=2.0,
+                 enemies=HeroTable(("Lion", "Shadow Fiend"), ("support", "midlane"), (7, 9), visible=0b01))
+
+    changes = differ.diff(old, new)
+    kinds = {change.kind for change in changes.changes}
+
+    assert changes.of_kind(ChangeKind.MOVED)[0].detail == 5.0
+    assert changes.of_kind(ChangeKind.HP_DROPPED)[0].detail == 150
+    assert changes.of_kind(ChangeKind.GOLD_THRESHOLD)[0].detail == 1000
+    assert ChangeKind.LEVEL_UP in kinds
+    assert [c.detail for c in changes.of_kind(ChangeKind.ENEMY_VISIBLE)] == ["Lion"]
+    assert [c.detail for c in changes.of_kind(ChangeKind.ENEMY_HIDDEN)] == ["Shadow Fiend"]
+    # timestamp меняется всегда и не считается изменением
+    assert not differ.diff(_state(), _state(created_at=99.0))
+    logger.info(f"✓ {changes}")
+
+
+def test_bus_delivers_only_to_touched_subscribers():
+    """Подписчик вызывается только при изменении его полей"""
+    bus = StateDiffBus()
+    calls = {"farm": 0, "safety": 0}
+    bus.subscribe(("hero_position", "enemies", "level"), lambda c, s: calls.__setitem__("farm", calls["farm"] + 1))
+    bus.subscribe(("hp",), lambda c, s: calls.__setitem__("safety", calls["safety"] + 1))
+
+    bus.publish(None, _state())              # первое состояние - всем
+    bus.publish(_state(), _state(gold=950))  # никому
+    bus.publish(_state(), _state(hp=100))    # только safety
+
+    assert calls == {"farm": 1, "safety": 2}
+    assert bus.get_stats()["skipped"] == 3
+    logger.info(f"✓ Рассылка: {bus.get_stats()}")
+
+
+def test_strategist_skips_untouched_rules():
+    """LocalStrategist не пересчитывает правила, чьи поля не менялись"""
+    strategist = LocalStrategist()
+    first = strategist.analyze_situation(_state())
+    assert strategist.rules_evaluated == len(LocalStrategist.RULE_INPUTS)
+
+    # Изменилось только HP - пересчитывается только правило безопасности
+    second = strategist.analyze_situation(_state(hp=100))
+    assert strategist.rules_evaluated == len(LocalStrategist.RULE_INPUTS) + 1
+    assert strategist.rules_skipped == len(LocalStrategist.RULE_INPUTS) - 1
+    assert second["recommendations"][0]["title"] == "⚠️  Низкий HP!"
+
+    # Результат совпадает с полным пересчётом
+    assert second["recommendations"] == LocalStrategist().analyze_situation(_state(hp=100))["recommendations"]
+    assert first["status"] == "success"
+    logger.info("✓ Правила пересчитываются выборочно")
+
+
+def test_strategist_concurrent_calls():
+    """Воркер анализа и ask_for_help зовут один стратег из разных потоков"""
+    strategist = LocalStrategist()
+    calls_per_thread = 200
+
+    def worker(hp):
+        for i in range(calls_per_thread):
+            result = strategist.analyze_situation(_state(hp=hp + i % 2))
+            assert result["status"] == "success"
+
+    threads = [threading.Thread(target=worker, args=(100 + k * 10,)) for k in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Каждый вызов учитывает каждое правило ровно один раз
+    total = strategist.rules_evaluated + strategist.rules_skipped + strategist.rules_over_budget
+    assert total == 4 * calls_per_thread * len(LocalStrategist.RULE_ORDER)
+    logger.info("✓ Параллельные вызовы стратега согласованы")
+
+
+if __name__ == "__main__":
+    test_typed_changes()
+    test_bus_delivers_only_to_touched_subscribers()
+    test_strategist_skips_untouched_rules()
+    test_strategist_concurrent_calls()
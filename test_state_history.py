@@ -0,0 +1,78 @@
+"""
+Тестирование кольцевого буфера истории состояний
+"""
+
+import logging
+from clock import VirtualClock
+from game_integration import GameAnalyzer, SIM_SECONDS_PER_GAME_MINUTE
+from state_history import StateHistory
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_windows_after_wraparound():
+    """Окна остаются хронологическими после переполнения"""
+    history = StateHistory(capacity=4)
+    for gold in range(10):
+        history.append({"gold": gold * 100, "level": gold}, timestamp=float(gold))
+
+    assert len(history) == 4
+    assert history.total == 10
+    assert history.window("gold").tolist() == [600, 700, 800, 900]
+    assert history.window("level", 2).tolist() == [8, 9]
+    assert history.times(3).tolist() == [7.0, 8.0, 9.0]
+    assert history.latest("gold") == 900
+    logger.info("✓ Окна после переполнения корректны")
+
+
+def test_window_is_zero_copy_view():
+    """window() не копирует данные и не даёт их изменить"""
+    history = StateHistory(capacity=8)
+    for gold in range(5):
+        history.append({"gold": gold})
+
+    view = history.window("gold", 3)
+    assert view.base is not None
+    assert not view.flags.writeable
+
+    history.append({"gold": 42})
+    assert history.window("gold", 1).tolist() == [42]
+    logger.info("✓ Окно - представление без копии")
+
+
+def test_memory_is_bounded():
+    """Память буфера не растёт с числом тиков"""
+    clock = VirtualClock()
+    analyzer = GameAnalyzer(clock=clock)
+    analyzer.game_state_history = StateHistory(capacity=100)
+    size_before = analyzer.game_state_history.nbytes
+
+    for _ in range(1000):
+        analyzer._simulate_game_state()
+        clock.advance(1.0)
+
+    assert len(analyzer.game_state_history) == 100
+    assert analyzer.game_state_history.total == 1000
+    assert analyzer.game_state_history.nbytes == size_before
+    # game_time идёт по часам, а не по длине истории
+    assert analyzer.last_update.game_time == analyzer.game_time_offset + int(999 // SIM_SECONDS_PER_GAME_MINUTE)
+    logger.info("✓ Память истории постоянна")
+
+
+def test_clear():
+    history = StateHistory(capacity=3)
+    history.append({"gold": 1})
+    history.clear()
+    assert len(history) == 0 and history.latest("gold") is None
+    assert history.window("gold").tolist() == []
+
+
+if __name__ == "__main__":
+    test_windows_after_wraparound()
+    test_window_is_zero_copy_view()
+    test_memory_is_bounded()
+    test_clear()
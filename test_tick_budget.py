@@ -0,0 +1,131 @@
+"""
+Тестирование бюджета тика и отбрасывания необязательной работы
+"""
+
+import logging
+from game_integration import GameAnalyzer
+from local_strategist import LocalStrategist
+from metrics import MetricsRegistry
+from tick_budget import TickBudget
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_shed_order():
+    """Под нагрузкой задачи отбрасываются по порядку"""
+    clock = FakeClock()
+    metrics = MetricsRegistry()
+    budget = TickBudget(0.040, metrics=metrics, clock=clock)
+
+    budget.begin()
+    clock.now = 0.015
+    assert budget.allows("farm_route") and budget.allows("strategist_rules") and budget.allows("overlay")
+
+    clock.now = 0.025   # > 1/2 бюджета
+    assert not budget.allows("farm_route")
+    assert budget.allows("strategist_rules") and budget.allows("overlay")
+
+    clock.now = 0.035   # > 3/4 бюджета
+    assert not budget.allows("strategist_rules")
+    assert budget.allows("overlay")
+
+    clock.now = 0.045
+    assert not budget.allows("overlay")
+    budget.end()
+
+    assert budget.overruns == 1
+    assert metrics.snapshot()["counters"] == {
+        "skipped.farm_route": 1, "skipped.strategist_rules": 1,
+        "skipped.overlay": 1, "tick_over_budget": 1,
+    }
+    logger.info(f"✓ Порядок отбрасывания: {budget.get_stats()}")
+
+
+def test_estimate_blocks_slow_task():
+    """Задача, которая по оценке не успеет, не запускается"""
+    clock = FakeClock()
+    budget = TickBudget(0.040, clock=clock)
+    with budget.measure("farm_route"):
+        clock.now += 0.015
+    budget.begin()
+    clock.now += 0.010   # до предела маршрута осталось 10мс, а оценка 15мс
+    assert not budget.allows("farm_route")
+
+
+def test_task_recovers_after_overrun():
+    """Один медленный запуск не отключает задачу навсегда"""
+    clock = FakeClock()
+    budget = TickBudget(0.050, clock=clock)
+    with budget.measure("farm_route"):
+        clock.now += 0.030   # больше предела маршрута (25мс)
+
+    allowed = []
+    for _ in range(20):
+        budget.begin()
+        if budget.allows("farm_route"):
+            allowed.append(budget.ticks)
+            with budget.measure("farm_route"):
+                clock.now += 0.002
+        budget.end()
+    assert allowed and allowed[0] <= 2
+    assert len(allowed) >= 18   # после быстрого замера задача идёт каждый тик
+    assert budget.skipped["farm_route"] == allowed[0]
+    logger.info(f"✓ Задача вернулась на тике {allowed[0]}: {budget.get_stats()}")
+
+
+def test_strategist_keeps_safety_rule():
+    """Без времени стратег пересчитывает только правило безопасности"""
+    state = GameAnalyzer()._simulate_game_state()
+    strategist = LocalStrategist()
+
+    strategist.analyze_situation(state, time_budget=0.0)
+    assert strategist.rules_evaluated == 1
+    assert strategist.rules_over_budget == len(LocalStrategist.RULE_ORDER) - 1
+
+    # Пропущенные правила досчитываются, когда время есть
+    analysis = strategist.analyze_situation(state)
+    assert strategist.rules_evaluated == len(LocalStrategist.RULE_ORDER)
+    assert analysis["recommendations"] == LocalStrategist().analyze_situation(state)["recommendations"]
+    logger.info("✓ Безопасность считается всегда")
+
+
+def test_coach_degrades_under_load():
+    """Тренер пропускает маршрут фарма, но продолжает оценивать опасность"""
+    from coach import DotaCoach
+
+    coach = DotaCoach()
+    coach.game_analyzer = GameAnalyzer(detect_process=False)
+    coach.tick_budget = TickBudget(1e-9, metrics=coach.metrics)
+
+    coach.tick_budget.begin()
+    coach._poll_game_state()
+    coach._analyze_and_recommend_farming(coach.current_game_state)
+    coach._ui_heartbeat()
+    coach.tick_budget.end()
+
+    assert coach.current_danger is not None
+    assert coach.current_farm_route is None and coach._farm_route_dirty
+    counters = coach.metrics.snapshot()["counters"]
+    assert counters["skipped.farm_route"] == 1 and counters["skipped.overlay"] == 1
+    assert counters["tick_over_budget"] == 1
+    logger.info(f"✓ Деградация под нагрузкой: {counters}")
+
+
+if __name__ == "__main__":
+    test_shed_order()
+    test_estimate_blocks_slow_task()
+    test_task_recovers_after_overrun()
+    test_strategist_keeps_safety_rule()
+    test_coach_degrades_under_load()
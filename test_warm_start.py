@@ -0,0 +1,110 @@
+"""
+Тестирование снимка тёплого старта
+"""
+
+import json
+import logging
+import os
+import tempfile
+import coach as coach_module
+from clock import VirtualClock
+from game_integration import GameAnalyzer
+from state_history import StateHistory
+from warm_start import WarmStartSnapshot, SNAPSHOT_VERSION
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_history_restore_keeps_order():
+    """Сохранённая история встаёт перед текущей, лишнее отбрасывается"""
+    saved = StateHistory(capacity=4)
+    for gold in range(3):
+        saved.append({"gold": gold}, timestamp=float(gold))
+
+    history = StateHistory(capacity=4)
+    history.append({"gold": 10}, timestamp=10.0)
+    history.append({"gold": 11}, timestamp=11.0)
+    history.restore(json.loads(json.dumps(saved.export())))
+
+    assert history.window("gold").tolist() == [1, 2, 10, 11]
+    assert history.times().tolist() == [1.0, 2.0, 10.0, 11.0]
+    assert history.total == 5
+    history.append({"gold": 12})
+    assert history.window("gold").tolist() == [2, 10, 11, 12]
+    logger.info("✓ История восстановлена в хронологическом порядке")
+
+
+def _coach(path, clock, offset):
+    coach_module.SNAPSHOT_PATH = path
+    try:
+        coach = coach_module.DotaCoach(clock=clock)
+    finally:
+        coach_module.SNAPSHOT_PATH = None
+    coach.game_analyzer = GameAnalyzer(clock=clock, detect_process=False)
+    coach.game_analyzer.game_time_offset = offset
+    # Число врагов в симуляции случайно - опасность фиксирована, чтобы маршрут был воспроизводим
+    coach._estimate_danger_level = lambda game_state: 0.3
+    return coach
+
+
+def test_restart_resumes_same_match():
+    """После перезапуска история и маршрут продолжаются без пересчёта"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "snapshot.json")
+        clock = VirtualClock()
+        first = _coach(path, clock, offset=15)
+        for _ in range(5):
+            first._poll_game_state()
+            clock.advance(1.0)
+        assert first._analyze_and_recommend_farming(first.current_game_state)
+        first._save_snapshot()
+        route = [spot.name for spot in first.current_farm_route]
+
+        second = _coach(path, clock, offset=15)
+        assert second._pending_snapshot is not None
+        second._poll_game_state()
+        assert second.warm_started
+        assert len(second.game_analyzer.game_state_history) == 6
+        assert [spot.name for spot in second.current_farm_route] == route
+
+        second._analyze_and_recommend_farming(second.current_game_state)
+        assert second.metrics.histogram("farm_route").count == 0  # маршрут не пересчитывался
+        logger.info("✓ Тёплый старт в том же матче")
+
+
+def test_snapshot_rejected_for_other_match_or_version():
+    """Снимок другого матча, версии или слишком старый не применяется"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "snapshot.json")
+        clock = VirtualClock()
+        first = _coach(path, clock, offset=15)
+        first._poll_game_state()
+        first._save_snapshot()
+
+        other = _coach(path, clock, offset=25)  # Игровое время ушло на 10 минут
+        other._poll_game_state()
+        assert not other.warm_started
+        assert len(other.game_analyzer.game_state_history) == 1
+
+        snapshot = WarmStartSnapshot(path, max_age=60, clock=clock.time)
+        assert snapshot.load() is not None
+        clock.advance(61)
+        assert snapshot.load() is None
+
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        data["version"] = SNAPSHOT_VERSION + 1
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        assert WarmStartSnapshot(path, clock=clock.time).load() is None
+        logger.info("✓ Чужой, устаревший и несовместимый снимки отклонены")
+
+
+if __name__ == "__main__":
+    test_history_restore_keeps_order()
+    test_restart_resumes_same_match()
+    test_snapshot_rejected_for_other_match_or_version()
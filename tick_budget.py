@@ -0,0 +1,133 @@
+"""
+Бюджет времени на тик тренера
+Необязательная работа отбрасывается по порядку, когда тик рискует
+не уложиться в бюджет; обязательная (обнаружение опасности) выполняется всегда
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Sequence
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Необязательная работа в порядке отбрасывания: первая требует больше всего запаса
+SHED_ORDER = ("farm_route", "strategist_rules", "overlay")
+
+
+class TickBudget:
+    """
+    Бюджет одного тика
+
+    Задача из shed_order с индексом i должна закончиться не позже
+    (i + 2) / (n + 1) бюджета: при трёх задачах пересчёт маршрута фарма
+    укладывается в первую половину, правила стратега - в 3/4,
+    обновление оверлея - в весь бюджет. Поэтому при нагрузке они
+    отбрасываются именно в таком порядке. Длительность задачи оценивается
+    экспоненциальным средним прошлых запусков; каждый пропуск уменьшает
+    оценку, чтобы один медленный запуск не отключил задачу навсегда.
+    """
+
+    def __init__(self, budget: float = 0.05, shed_order: Sequence[str] = SHED_ORDER,
+                 metrics=None, clock: Callable[[], float] = time.perf_counter,
+                 smoothing: float = 0.2):
+        """
+        Args:
+            budget: Бюджет тика в секундах
+            shed_order: Необязательные задачи в порядке отбрасывания
+            metrics: MetricsRegistry для счётчиков пропусков и длительностей
+            clock: Часы для замеров (реальное время)
+            smoothing: Вес нового замера в оценке длительности
+        """
+        self.budget = budget
+        self.metrics = metrics
+        self.clock = clock
+        self.smoothing = smoothing
+        count = len(shed_order)
+        self._limits = {task: budget * (i + 2) / (count + 1) for i, task in enumerate(shed_order)}
+        self._estimates: Dict[str, float] = {}
+        self._started: Optional[float] = None
+
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped: Dict[str, int] = {}
+
+    def begin(self):
+        """Начало тика"""
+        self._started = self.clock()
+
+    def end(self):
+        """Конец тика: учесть длительность и перерасход"""
+        if self._started is None:
+            return
+        elapsed = self.elapsed()
+        self._started = None
+        self.ticks += 1
+        if self.metrics:
+            self.metrics.record("tick", elapsed)
+        if elapsed > self.budget:
+            self.overruns += 1
+            if self.metrics:
+                self.metrics.increment("tick_over_budget")
+            logger.debug(f"Тик превысил бюджет: {elapsed * 1000:.1f}мс")
+
+    def elapsed(self) -> float:
+        if self._started is None:
+            return 0.0
+        return self.clock() - self._started
+
+    def limit(self, task: Optional[str] = None) -> float:
+        """Предел задачи от начала тика (весь бюджет для прочих задач)"""
+        return self._limits.get(task, self.budget)
+
+    def remaining(self, task: Optional[str] = None) -> float:
+        """Сколько времени осталось (до предела задачи, если указана)"""
+        return self.limit(task) - self.elapsed()
+
+    def allows(self, task: str) -> bool:
+        """
+        Успеет ли необязательная задача уложиться в свой предел
+
+        Отказ учитывается как пропуск (skipped.<task> в метриках) и
+        уменьшает оценку длительности: задача снова получит шанс и будет
+        замерена заново.
+        """
+        estimate = self._estimates.get(task, 0.0)
+        if self.remaining(task) >= estimate:
+            return True
+        if estimate:
+            self._estimates[task] = estimate * (1 - self.smoothing)
+        self.record_skip(task)
+        return False
+
+    def record_skip(self, task: str, count: int = 1):
+        """Учесть пропущенную работу"""
+        if count <= 0:
+            return
+        self.skipped[task] = self.skipped.get(task, 0) + count
+        if self.metrics:
+            self.metrics.increment(f"skipped.{task}", count)
+
+    @contextmanager
+    def measure(self, task: str):
+        """Замерить задачу и обновить оценку её длительности"""
+        started = self.clock()
+        try:
+            yield
+        finally:
+            duration = self.clock() - started
+            previous = self._estimates.get(task)
+            self._estimates[task] = (duration if previous is None
+                                     else previous + self.smoothing * (duration - previous))
+            if self.metrics:
+                self.metrics.record(task, duration)
+
+    def get_stats(self) -> Dict:
+        return {
+            "budget_ms": round(self.budget * 1000, 1),
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": dict(self.skipped),
+            "estimates_ms": {task: round(value * 1000, 3) for task, value in self._estimates.items()},
+        }
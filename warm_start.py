@@ -0,0 +1,105 @@
+"""
+Снимок для тёплого старта
+Периодически и при остановке тренер сохраняет историю состояний, последний
+маршрут фарма и кэши статических данных API. После перезапуска посреди
+матча снимок загружается за миллисекунды и, если он относится к тому же
+матчу, советы продолжаются без холодного периода.
+
+Формат - JSON с номером версии; снимок другой версии игнорируется.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+def match_key(game_state) -> Dict:
+    """Признаки матча для проверки снимка"""
+    return {
+        "match_id": game_state.get("match_id"),
+        "hero_name": game_state.get("hero_name"),
+        "game_time": game_state.get("game_time", 0),
+    }
+
+
+class WarmStartSnapshot:
+    """Файл снимка: запись, загрузка и проверка на принадлежность матчу"""
+
+    def __init__(self, path: str, max_age: float = 900.0, max_gap_minutes: int = 5, clock=time.time):
+        """
+        Args:
+            path: Путь к файлу снимка
+            max_age: Снимок старше (сек, по настенным часам) не загружается
+            max_gap_minutes: Допустимый разрыв игрового времени до текущего состояния
+            clock: Настенные часы (time.time)
+        """
+        self.path = path
+        self.max_age = max_age
+        self.max_gap_minutes = max_gap_minutes
+        self.clock = clock
+        self.saved = 0
+        self.last_save_ms: Optional[float] = None
+
+    def save(self, data: Dict):
+        """Записать снимок (атомарно, через временный файл)"""
+        started = time.perf_counter()
+        snapshot = dict(data, version=SNAPSHOT_VERSION, saved_at=self.clock())
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.saved += 1
+        self.last_save_ms = (time.perf_counter() - started) * 1000
+
+    def load(self) -> Optional[Dict]:
+        """
+        Прочитать снимок
+
+        Returns:
+            Снимок или None (нет файла, повреждён, другая версия, устарел)
+        """
+        if not os.path.exists(self.path):
+            return None
+        started = time.perf_counter()
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Снимок тёплого старта не прочитан: {e}")
+            return None
+
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            logger.info(f"Снимок версии {snapshot.get('version')} не поддерживается, холодный старт")
+            return None
+        age = self.clock() - snapshot.get("saved_at", 0)
+        if age > self.max_age:
+            logger.info(f"Снимок устарел ({age:.0f}с), холодный старт")
+            return None
+
+        logger.info(f"♨️ Снимок тёплого старта загружен за {(time.perf_counter() - started) * 1000:.1f}мс "
+                    f"(возраст {age:.0f}с)")
+        return snapshot
+
+    def matches(self, snapshot: Dict, game_state) -> bool:
+        """
+        Относится ли снимок к текущему матчу
+
+        Совпадает match_id (если он известен с обеих сторон), иначе герой,
+        и игровое время не ушло назад и не убежало дальше max_gap_minutes.
+        """
+        saved = snapshot.get("match") or {}
+        current = match_key(game_state)
+        if saved.get("match_id") and current["match_id"]:
+            if saved["match_id"] != current["match_id"]:
+                return False
+        elif saved.get("hero_name") != current["hero_name"]:
+            return False
+        gap = current["game_time"] - saved.get("game_time", 0)
+        return 0 <= gap <= self.max_gap_minutes